@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import functools
+import logging
+import pathlib
+import sys
+import timeit
+from typing import Callable, Optional
+
+import fgo
+
+
+def main() -> None:
+    # logger
+    logger = create_logger()
+    # option
+    option = Option(**vars(argument_parser().parse_args()))
+    if option.verbose:
+        logger.setLevel(logging.DEBUG)
+    logger.debug("option: %s", option)
+    # merged data saved by merge.py
+    data = fgo.load_json(option.path)
+    if data is None:
+        logger.error('"%s" is not found, run merge.py first', option.path)
+        sys.exit(1)
+    for encoding in fgo.encoding_names():
+        for compression in [None, *fgo.compression_names()]:
+            name = encoding if compression is None else f"{encoding}+{compression}"
+            missing = missing_module(encoding, compression)
+            if missing is not None:
+                logger.warning('%s: skipped, "%s" is not installed', name, missing)
+                continue
+            encode = functools.partial(
+                fgo.encode,
+                data,
+                encoding=encoding,
+                compression=compression,
+            )
+            value = encode()
+            decode = functools.partial(
+                fgo.decode,
+                value,
+                encoding=encoding,
+                compression=compression,
+            )
+            if decode() != data:
+                logger.error("%s: decoded data differs", name)
+            logger.info(
+                "%s: encode %.1f ms, decode %.1f ms, size %d bytes",
+                name,
+                measure(encode, option.repeat),
+                measure(decode, option.repeat),
+                len(value),
+            )
+
+
+def missing_module(encoding: str, compression: Optional[str]) -> Optional[str]:
+    return fgo.missing_encoding_module(encoding) or (
+        fgo.missing_compression_module(compression) if compression is not None else None
+    )
+
+
+def measure(function: Callable[[], object], repeat: int) -> float:
+    # milliseconds of the fastest run
+    return min(timeit.repeat(function, number=1, repeat=repeat)) * 1000
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("benchmark_codec")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    path: pathlib.Path
+    repeat: int
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure encode/decode time and size of merged data",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    parser.add_argument(
+        "path",
+        nargs="?",
+        type=pathlib.Path,
+        default=pathlib.Path("data/merged_data.json"),
+        help="merged data in JSON (default: %(default)s)",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        dest="repeat",
+        type=int,
+        default=3,
+        help="number of measurements (default: %(default)s)",
+        metavar="N",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    main()
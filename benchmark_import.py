@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import logging
+import pathlib
+import statistics
+import subprocess
+import sys
+from typing import Optional
+
+# modules that "import fgo" must not import
+HEAVY_MODULES = [
+    "fake_useragent",
+    "jsonschema",
+    "lxml",
+    "numpy",
+    "requests",
+    "yaml",
+]
+
+
+def main() -> None:
+    # logger
+    logger = create_logger()
+    # option
+    option = Option(**vars(argument_parser().parse_args()))
+    if option.verbose:
+        logger.setLevel(logging.DEBUG)
+    logger.debug("option: %s", option)
+    is_passed = True
+    # heavy modules
+    imported = [module for module in imported_modules("fgo") if module in HEAVY_MODULES]
+    if imported:
+        logger.error("import fgo imports %s", ", ".join(imported))
+        is_passed = False
+    # import time
+    for module in option.modules:
+        times = [import_time(module) for _ in range(option.repeat)]
+        logger.info(
+            "%s: min %.1f ms, median %.1f ms",
+            module,
+            min(times),
+            statistics.median(times),
+        )
+        if module == "fgo" and option.limit is not None and min(times) > option.limit:
+            logger.error("import fgo exceeds %.1f ms", option.limit)
+            is_passed = False
+    if not is_passed:
+        sys.exit(1)
+
+
+def import_time(module: str) -> float:
+    # cumulative microseconds of the top-level module from -X importtime
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        cwd=pathlib.Path(__file__).resolve().parent,
+        text=True,
+    )
+    for line in reversed(result.stderr.splitlines()):
+        _, cumulative, name = line.split("|")
+        if name.strip() == module and not name[1:].startswith(" "):
+            return int(cumulative) / 1000
+    raise ValueError(f"import time of {module} is not found")
+
+
+def imported_modules(module: str) -> list[str]:
+    # top-level names of all modules in sys.modules after the import
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import json, sys, {module}; print(json.dumps(list(sys.modules)))",
+        ],
+        capture_output=True,
+        check=True,
+        cwd=pathlib.Path(__file__).resolve().parent,
+        text=True,
+    )
+    return sorted({name.split(".")[0] for name in json.loads(result.stdout)})
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("benchmark_import")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    modules: list[str]
+    repeat: int
+    limit: Optional[float]
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure import time of fgo and the scripts",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        default=["fgo", "merge", "english_compare", "validate"],
+        help="modules to import (default: %(default)s)",
+        metavar="MODULE",
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        dest="repeat",
+        type=int,
+        default=5,
+        help="number of runs per module (default: %(default)s)",
+        metavar="N",
+    )
+    parser.add_argument(
+        "--limit",
+        dest="limit",
+        type=float,
+        help="fail if the fastest import of fgo takes longer",
+        metavar="MILLISECONDS",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import functools
+import logging
+import pathlib
+import timeit
+from typing import Any
+
+import lxml.html
+
+import fgo
+import servant as servant_script
+
+
+class NullServantLogger:
+    # lower bound: logging calls that do nothing at all
+    def debug(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def info(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def warning(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def error(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+def main() -> None:
+    # logger
+    logger = create_logger()
+    # option
+    option = Option(**vars(argument_parser().parse_args()))
+    if option.verbose:
+        logger.setLevel(logging.DEBUG)
+    logger.debug("option: %s", option)
+    # resource tables rebuilt from the saved servants
+    tables = [
+        resource_table(servant)
+        for servant in fgo.iterate_servants(
+            pathlib.Path("data/servant"),
+            logger=logger,
+        )
+    ]
+    logger.info(
+        "servants: %d, cells: %d",
+        len(tables),
+        sum(len(cells) for cells in tables),
+    )
+    # the parsers log to a separate logger to keep the output quiet
+    target = logging.getLogger("benchmark_logging.parser")
+    target.propagate = False
+    target.addHandler(logging.NullHandler())
+    servant_logger = fgo.ServantLogger(target, 1, "benchmark")
+    cases: list[tuple[str, Any, int]] = [
+        ("no logging", NullServantLogger(), logging.INFO),
+        ("INFO", servant_logger, logging.INFO),
+        ("DEBUG", servant_logger, logging.DEBUG),
+    ]
+    # cases are interleaved so that drift affects them equally
+    seconds = [float("inf")] * len(cases)
+    for _ in range(option.repeat):
+        for i, (_, parser_logger, level) in enumerate(cases):
+            target.setLevel(level)
+            seconds[i] = min(
+                seconds[i],
+                timeit.timeit(
+                    functools.partial(parse_tables, tables, parser_logger),
+                    number=option.number,
+                ),
+            )
+    for (name, _, _), value in zip(cases, seconds):
+        logger.info(
+            "%s: %.1f ms (%+.1f%%)",
+            name,
+            value / option.number * 1000,
+            (value / seconds[0] - 1) * 100,
+        )
+
+
+def resource_table(servant: fgo.Servant) -> list[lxml.html.HtmlElement]:
+    # cells of the ascension and skill resource tables in the wiki layout
+    cells: list[lxml.html.HtmlElement] = []
+    for level, resource in enumerate(servant["ascension_resources"], start=1):
+        cells.append(lxml.html.fromstring(f"<td>{level}段階</td>"))
+        for items in resource["items"]:
+            cells.append(
+                lxml.html.fromstring(f"<td>{items['name']},x{items['piece']}</td>")
+            )
+        if resource["qp"]:
+            cells.append(lxml.html.fromstring(f"<td>QP,{resource['qp']}</td>"))
+    return cells
+
+
+def parse_tables(
+    tables: list[list[lxml.html.HtmlElement]],
+    logger: Any,
+) -> None:
+    for cells in tables:
+        parser = servant_script.ResourceParser("ascension", logger)
+        for cell in cells:
+            parser.push(cell)
+        parser.result()
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("benchmark_logging")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    number: int
+    repeat: int
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure the logging overhead of the servant parsers",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    parser.add_argument(
+        "-n",
+        "--number",
+        dest="number",
+        type=int,
+        default=5,
+        help="number of parses per measurement (default: %(default)s)",
+        metavar="N",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        dest="repeat",
+        type=int,
+        default=5,
+        help="number of measurements (default: %(default)s)",
+        metavar="N",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import logging
+import shlex
+import sys
+from typing import Any, Protocol
+
+import english_compare
+import fgo
+import merge
+import validate
+
+
+class Command(Protocol):
+    # a script module with Option, argument_parser and run
+    Option: Any
+
+    def argument_parser(self) -> argparse.ArgumentParser: ...
+
+    def run(
+        self,
+        option: Any,
+        store: fgo.DataStore,
+        logger: logging.Logger,
+    ) -> bool: ...
+
+
+COMMANDS: dict[str, Command] = {
+    "validate": validate,
+    "compare": english_compare,
+    "merge": merge,
+}
+
+
+def main() -> None:
+    # logger
+    logger = create_logger()
+    # option
+    option = parse_arguments(sys.argv[1:])
+    if option.verbose:
+        logger.setLevel(logging.DEBUG)
+    logger.debug("option: %s", option)
+    # every command shares the store, so each file is loaded only once
+    store = fgo.DataStore(logger=logger)
+    for name in option.commands:
+        command = COMMANDS[name]
+        command_option = command.Option(
+            **vars(command.argument_parser().parse_args(option.arguments(name)))
+        )
+        logger.info("run %s", name)
+        if not command.run(command_option, store, logger):
+            logger.error("%s failed", name)
+            sys.exit(1)
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("fgo")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    commands: list[str]
+    validate_options: str
+    compare_options: str
+    merge_options: str
+
+    def arguments(self, command: str) -> list[str]:
+        # shell-like splitting, quoted values may contain spaces
+        options: str = getattr(self, f"{command}_options")
+        return shlex.split(options)
+
+
+def parse_arguments(arguments: list[str]) -> Option:
+    # argparse takes "--merge-options --no-cache" as two options,
+    # so a separated value is joined like "--merge-options=--no-cache"
+    names = {f"--{name}-options" for name in COMMANDS}
+    joined: list[str] = []
+    values = iter(arguments)
+    for argument in values:
+        if argument == "--":
+            joined.append(argument)
+            joined.extend(values)
+            break
+        if argument in names:
+            value = next(values, None)
+            if value is not None:
+                argument = f"{argument}={value}"
+        joined.append(argument)
+    return Option(**vars(argument_parser().parse_args(joined)))
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="fgo",
+        description="Run validate, compare and merge on one shared data store",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    for name in COMMANDS:
+        parser.add_argument(
+            f"--{name}-options",
+            dest=f"{name}_options",
+            default="",
+            help=f'options passed to {name} as one string (e.g. "--{name}-options -h")',
+            metavar="OPTIONS",
+        )
+    parser.add_argument(
+        dest="commands",
+        nargs="+",
+        choices=list(COMMANDS),
+        help="commands to run in order",
+        metavar="COMMAND",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    main()
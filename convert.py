@@ -3,35 +3,34 @@
 from __future__ import annotations
 
 import argparse
+import collections
+import concurrent.futures
+import dataclasses
 import logging
 import pathlib
+from typing import Iterable, Iterator, Literal, Optional
 
-import yaml
+import fgo
 
-import lib
+# converted: destination is written
+# unchanged: destination already has the same content
+# failed: source cannot be loaded
+type ConvertStatus = Literal["converted", "unchanged", "failed"]
+
+
+@dataclasses.dataclass(frozen=True)
+class Task:
+    source: pathlib.Path
+    destination: pathlib.Path
+    source_encoding: str
+    destination_encoding: str
 
 
 def main() -> None:
     # logger
-    logger = logging.getLogger("to_yaml")
-    logger.setLevel(logging.INFO)
-    logger.addHandler(logging.StreamHandler())
+    logger = create_logger()
     # option
-    argument_parser = argparse.ArgumentParser()
-    argument_parser.add_argument(
-        "--to",
-        dest="to",
-        choices=["json", "yaml"],
-        help="output format",
-    )
-    argument_parser.add_argument(
-        "-v",
-        "--verbose",
-        dest="verbose",
-        action="store_true",
-        help="set log level to debug",
-    )
-    option = argument_parser.parse_args()
+    option = Option(**vars(argument_parser().parse_args()))
     if option.verbose:
         logger.setLevel(logging.DEBUG)
     logger.debug("option: %s", option)
@@ -44,53 +43,159 @@ def main() -> None:
     logger.info("yaml directory: %s", yaml_directory)
     # convert
     if option.to == "json":
-        to_json(yaml_directory, json_directory, logger)
+        logger.info("to JSON")
+        convert(yaml_directory, json_directory, "yaml", "json", option, logger)
     if option.to == "yaml":
-        to_yaml(json_directory, yaml_directory, logger)
+        logger.info("to YAML")
+        convert(json_directory, yaml_directory, "json", "yaml", option, logger)
 
 
-def to_yaml(
+def convert(
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
     source_directory: pathlib.Path,
     destination_directory: pathlib.Path,
+    source_encoding: str,
+    destination_encoding: str,
+    option: Option,
     logger: logging.Logger,
 ) -> None:
-    logger.info("to YAML")
-    for source in source_directory.glob("**/*.json"):
-        # path
-        logger.info("source: %s", source)
-        destination = destination_directory.joinpath(
-            source.relative_to(source_directory)
-        ).with_suffix(".yaml")
-        logger.info("destination: %s", destination)
-        # load
-        data = lib.io.load_json(source)
-        logger.debug("data: %s", data)
-        if data is None:
-            continue
-        # save
-        lib.io.save_yaml(destination, data)
+    tasks = list(
+        create_tasks(
+            source_directory,
+            destination_directory,
+            source_encoding,
+            destination_encoding,
+            force=option.force,
+            logger=logger,
+        )
+    )
+    if not tasks:
+        logger.info("all files are up to date")
+        return
+    counter: collections.Counter[str] = collections.Counter()
+    for task, status in zip(tasks, run_tasks(tasks, option.processes)):
+        counter[status] += 1
+        match status:
+            case "converted":
+                logger.info("destination: %s", task.destination)
+            case "unchanged":
+                logger.debug("unchanged: %s", task.destination)
+            case "failed":
+                logger.error('failed to load "%s"', task.source)
+    logger.info(
+        "%s",
+        ", ".join(f"{status}: {count}" for status, count in sorted(counter.items())),
+    )
 
 
-def to_json(
+def create_tasks(
+    # pylint: disable=too-many-arguments
     source_directory: pathlib.Path,
     destination_directory: pathlib.Path,
+    source_encoding: str,
+    destination_encoding: str,
+    *,
+    force: bool,
     logger: logging.Logger,
-) -> None:
-    logger.info("to JSON")
-    for source in source_directory.glob("**/*.yaml"):
-        # path
-        logger.info("source: %s", source)
-        destination = destination_directory.joinpath(
-            source.relative_to(source_directory)
-        ).with_suffix(".json")
-        logger.info("destination: %s", destination)
-        # load
-        data = lib.io.load_yaml(source)
-        logger.debug("data: %s", data)
-        if data is None:
+) -> Iterator[Task]:
+    pattern = fgo.encoded_path(pathlib.Path("**/*"), encoding=source_encoding)
+    for source in sorted(source_directory.glob(str(pattern))):
+        relative_path = source.relative_to(source_directory)
+        # caches are not converted
+        if relative_path.parts[0] == "cache":
             continue
-        # save
-        lib.io.save_json(destination, data)
+        destination = fgo.encoded_path(
+            destination_directory.joinpath(relative_path),
+            encoding=destination_encoding,
+        )
+        # destination that is newer than source is up to date
+        if (
+            not force
+            and destination.exists()
+            and destination.stat().st_mtime >= source.stat().st_mtime
+        ):
+            logger.debug("skip: %s", source)
+            continue
+        yield Task(source, destination, source_encoding, destination_encoding)
+
+
+def run_tasks(
+    tasks: Iterable[Task],
+    processes: Optional[int],
+) -> Iterator[ConvertStatus]:
+    if processes == 1:
+        yield from map(convert_file, tasks)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        yield from executor.map(convert_file, tasks, chunksize=16)
+
+
+def convert_file(task: Task) -> ConvertStatus:
+    data = fgo.load_encoded(task.source, encoding=task.source_encoding)
+    if data is None:
+        return "failed"
+    value = fgo.encode(data, encoding=task.destination_encoding)
+    # identical content is not written again, only its mtime is updated
+    # so that the next run skips it
+    if task.destination.exists() and task.destination.read_bytes() == value:
+        task.destination.touch()
+        return "unchanged"
+    fgo.save_encoded(task.destination, data, encoding=task.destination_encoding)
+    return "converted"
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("convert")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    to: str
+    force: bool
+    processes: Optional[int]
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Convert data between JSON and YAML",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    parser.add_argument(
+        "--to",
+        dest="to",
+        choices=["json", "yaml"],
+        required=True,
+        help="output format",
+    )
+    parser.add_argument(
+        "--force",
+        dest="force",
+        action="store_true",
+        help="convert files even if the destination is newer",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="processes",
+        type=int,
+        help="number of worker processes (default: number of CPUs)",
+        metavar="N",
+    )
+    return parser
 
 
 if __name__ == "__main__":
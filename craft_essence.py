@@ -2,20 +2,19 @@
 
 from __future__ import annotations
 
+import argparse
+import concurrent.futures
+import dataclasses
+import functools
 import logging
+import pathlib
 import re
-import time
-from typing import NamedTuple, Optional, TypedDict
+from typing import Callable, Optional, TypedDict
 
 import lxml.html
 import requests
 
-
-class CraftEssence(NamedTuple):
-    id: int
-    rarity: int
-    name: str
-    series: str
+import fgo
 
 
 class Subpage(TypedDict):
@@ -24,10 +23,195 @@ class Subpage(TypedDict):
     rarity: int
 
 
+BOND_URL = "https://w.atwiki.jp/f_go/pages/1106.html"
+LIST_URL = "https://w.atwiki.jp/f_go/pages/32.html"
+# category: exclude 英霊肖像, 霊子肖像, 英霊祭装 due to format differences
+SUBPAGES: list[Subpage] = [
+    {
+        "series": "英霊肖像",
+        "url": "https://w.atwiki.jp/f_go/pages/658.html",
+        "rarity": 4,
+    },
+    {
+        "series": "チョコレート",
+        "url": "https://w.atwiki.jp/f_go/pages/696.html",
+        "rarity": 4,
+    },
+    {
+        "series": "英霊正装",
+        "url": "https://w.atwiki.jp/f_go/pages/2194.html",
+        "rarity": 4,
+    },
+    {
+        "series": "英霊旅装",
+        "url": "https://w.atwiki.jp/f_go/pages/3399.html",
+        "rarity": 4,
+    },
+    {
+        "series": "英霊紀行",
+        "url": "https://w.atwiki.jp/f_go/pages/4708.html",
+        "rarity": 4,
+    },
+    {
+        "series": "英霊巡遊",
+        "url": "https://w.atwiki.jp/f_go/pages/5146.html",
+        "rarity": 4,
+    },
+    {
+        "series": "英霊夢装",
+        "url": "https://w.atwiki.jp/f_go/pages/5637.html",
+        "rarity": 4,
+    },
+]
+
+
+def main() -> None:
+    # logger
+    logger = create_logger()
+    # option
+    option = Option(**vars(argument_parser().parse_args()))
+    if option.verbose:
+        logger.setLevel(logging.DEBUG)
+    logger.debug("option: %s", option)
+    path = pathlib.Path("data/craft_essences.csv")
+    # stored craft essences
+    max_id = 0
+    if option.incremental:
+        catalog = fgo.load_craft_essences(path, logger=logger) or {}
+        max_id = max(catalog.keys(), default=0)
+        logger.info("stored max ID: %d", max_id)
+    # request all pages at once
+    session = fgo.create_session(pool_maxsize=option.workers, logger=logger)
+    craft_essences = request_craft_essences(session, logger, option)
+    if craft_essences is None:
+        return
+    # save
+    if option.incremental:
+        new_craft_essences = [x for x in craft_essences if x.id > max_id]
+        logger.info("new craft essences: %d", len(new_craft_essences))
+        if new_craft_essences:
+            fgo.save_craft_essences(path, new_craft_essences, append=True)
+    else:
+        logger.info("craft essences: %d", len(craft_essences))
+        fgo.save_craft_essences(path, craft_essences)
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("craft_essence")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    incremental: bool
+    workers: int
+    request_timeout: float
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Update Craft Essence Data",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    parser.add_argument(
+        "-i",
+        "--incremental",
+        dest="incremental",
+        action="store_true",
+        help="append only craft essences newer than the stored max ID",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="workers",
+        type=int,
+        default=4,
+        help="number of concurrent requests (default: %(default)s)",
+        metavar="N",
+    )
+    parser.add_argument(
+        "--request-timeout",
+        dest="request_timeout",
+        type=float,
+        default=10.0,
+        help="request timeout seconds (default: %(default)s)",
+        metavar="SECONDS",
+    )
+    return parser
+
+
+def request_craft_essences(
+    session: requests.Session,
+    logger: logging.Logger,
+    option: Option,
+) -> Optional[list[fgo.CraftEssence]]:
+    # bond craft essences, series subpages, normal craft essences
+    parsers: list[tuple[str, Callable[[str], list[fgo.CraftEssence]]]] = [
+        (BOND_URL, functools.partial(parse_bond_craft_essences, logger=logger)),
+        *[
+            (
+                subpage["url"],
+                functools.partial(
+                    parse_subpage,
+                    series=subpage["series"],
+                    rarity=subpage["rarity"],
+                    logger=logger,
+                ),
+            )
+            for subpage in SUBPAGES
+        ],
+        (LIST_URL, functools.partial(parse_list, logger=logger)),
+    ]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=option.workers) as executor:
+        futures = [
+            executor.submit(request_page, session, url, option.request_timeout)
+            for url, _ in parsers
+        ]
+        texts: list[str] = []
+        for (url, _), future in zip(parsers, futures):
+            try:
+                texts.append(future.result())
+            except requests.RequestException as error:
+                logger.error('failed to request "%s": %s', url, error)
+                return None
+    # dedupe by ID, earlier pages take precedence over the normal list
+    craft_essences: dict[fgo.CraftEssenceID, fgo.CraftEssence] = {}
+    for (_, parse), text in zip(parsers, texts):
+        for craft_essence in parse(text):
+            if craft_essence.id in craft_essences:
+                logger.debug("duplicated: %s", craft_essence)
+                continue
+            craft_essences[craft_essence.id] = craft_essence
+    return sorted(craft_essences.values(), key=lambda x: x.id)
+
+
+def request_page(
+    session: requests.Session,
+    url: str,
+    request_timeout: float,
+) -> str:
+    response = session.get(url, timeout=request_timeout)
+    response.raise_for_status()
+    return response.text
+
+
 def parse_row(
     row: lxml.html.HtmlElement,
     logger: Optional[logging.Logger] = None,
-) -> Optional[CraftEssence]:
+) -> Optional[fgo.CraftEssence]:
     logger = logger or logging.getLogger(__name__)
     cells = row.xpath("td")
     # id, rarity
@@ -45,7 +229,7 @@ def parse_row(
     elif id_cell.isdigit():
         logger.debug("id: %d", int(id_cell))
         name = cells[2].text_content().strip()
-        result = CraftEssence(
+        result = fgo.CraftEssence(
             id=int(id_cell),
             rarity=int(rarity_cell),
             name=name,
@@ -57,14 +241,28 @@ def parse_row(
     return None
 
 
+def parse_list(
+    text: str,
+    logger: Optional[logging.Logger] = None,
+) -> list[fgo.CraftEssence]:
+    logger = logger or logging.getLogger(__name__)
+    result: list[fgo.CraftEssence] = []
+    root = lxml.html.fromstring(text)
+    xpath = '//*[@id="wikibody"]/div[3]/div/div/table/tbody/tr[td]'
+    for row in root.xpath(xpath):
+        craft_essence = parse_row(row, logger)
+        if craft_essence is not None:
+            result.append(craft_essence)
+    return result
+
+
 def parse_bond_craft_essences(
-    logger: Optional[logging.Logger],
-) -> list[CraftEssence]:
+    text: str,
+    logger: Optional[logging.Logger] = None,
+) -> list[fgo.CraftEssence]:
     logger = logger or logging.getLogger(__name__)
-    result: list[CraftEssence] = []
-    url = "https://w.atwiki.jp/f_go/pages/1106.html"
-    response = requests.get(url)
-    root = lxml.html.fromstring(response.text)
+    result: list[fgo.CraftEssence] = []
+    root = lxml.html.fromstring(text)
     xpath = '//*[@id="wikibody"]/div[3]/div/div/table/tbody/tr[td]'
     for row in root.xpath(xpath):
         cells = row.xpath("td")
@@ -75,37 +273,27 @@ def parse_bond_craft_essences(
         servant_name = cells[2].xpath("a")[0].text
         logger.debug("servant: No.%03d %s", servant_id, servant_name)
         # craft essence
-        craft_essence_id = int(cells[4].text)
-        craft_essence_rarity = 4
-        craft_essence_name = cells[5].xpath("a")[0].text
-        logger.info(
-            'id=%d, rarity=%d, name="%s"',
-            craft_essence_id,
-            craft_essence_rarity,
-            craft_essence_name,
-        )
         result.append(
-            CraftEssence(
-                id=craft_essence_id,
-                rarity=craft_essence_rarity,
-                name=craft_essence_name,
+            fgo.CraftEssence(
+                id=int(cells[4].text),
+                rarity=4,
+                name=cells[5].xpath("a")[0].text,
                 series="絆礼装",
             )
         )
-        logger.info("bond: %s", result[-1])
+        logger.debug("bond: %s", result[-1])
     return result
 
 
 def parse_subpage(
-    url: str,
+    text: str,
     series: str,
     rarity: int,
     logger: Optional[logging.Logger] = None,
-) -> list[CraftEssence]:
+) -> list[fgo.CraftEssence]:
     logger = logger or logging.getLogger(__name__)
-    result: list[CraftEssence] = []
-    response = requests.get(url)
-    root = lxml.html.fromstring(response.text)
+    result: list[fgo.CraftEssence] = []
+    root = lxml.html.fromstring(text)
     xpath = '//*[@id="wikibody"]//table/tbody/tr[td]'
     for row in root.xpath(xpath):
         cells = row.xpath("td")
@@ -115,101 +303,16 @@ def parse_subpage(
         if not id_match:
             continue
         result.append(
-            CraftEssence(
+            fgo.CraftEssence(
                 id=int(id_match.group("id")),
                 rarity=rarity,
                 name=cells[1].text.strip(),
                 series=series,
             )
         )
-        logger.info("%s: %s", series, result[-1])
+        logger.debug("%s: %s", series, result[-1])
     return result
 
 
-def main(
-    logger: Optional[logging.Logger] = None,
-) -> None:
-    logger = logger or logging.getLogger(__name__)
-    sleep = 1.0
-    craft_essences: list[CraftEssence] = []
-    # bond craft essences
-    craft_essences.extend(parse_bond_craft_essences(logger=logger))
-    time.sleep(sleep)
-    # category: exclude 英霊肖像, 霊子肖像, 英霊祭装 due to format differences
-    subpages: list[Subpage] = [
-        {
-            "series": "英霊肖像",
-            "url": "https://w.atwiki.jp/f_go/pages/658.html",
-            "rarity": 4,
-        },
-        {
-            "series": "チョコレート",
-            "url": "https://w.atwiki.jp/f_go/pages/696.html",
-            "rarity": 4,
-        },
-        {
-            "series": "英霊正装",
-            "url": "https://w.atwiki.jp/f_go/pages/2194.html",
-            "rarity": 4,
-        },
-        {
-            "series": "英霊旅装",
-            "url": "https://w.atwiki.jp/f_go/pages/3399.html",
-            "rarity": 4,
-        },
-        {
-            "series": "英霊紀行",
-            "url": "https://w.atwiki.jp/f_go/pages/4708.html",
-            "rarity": 4,
-        },
-        {
-            "series": "英霊巡遊",
-            "url": "https://w.atwiki.jp/f_go/pages/5146.html",
-            "rarity": 4,
-        },
-        {
-            "series": "英霊夢装",
-            "url": "https://w.atwiki.jp/f_go/pages/5637.html",
-            "rarity": 4,
-        },
-    ]
-    for subpage in subpages:
-        craft_essences.extend(
-            parse_subpage(
-                subpage["url"],
-                subpage["series"],
-                subpage["rarity"],
-                logger=logger,
-            )
-        )
-        time.sleep(sleep)
-    # normal craft essence
-    url = "https://w.atwiki.jp/f_go/pages/32.html"
-    response = requests.get(url)
-    root = lxml.html.fromstring(response.text)
-    xpath = '//*[@id="wikibody"]/div[3]/div/div/table/tbody/tr[td]'
-    for row in root.xpath(xpath):
-        craft_essence = parse_row(row, logger)
-        if craft_essence is not None:
-            if not any(x.id == craft_essence.id for x in craft_essences):
-                craft_essences.append(craft_essence)
-                logger.info("normal: %s", craft_essence)
-            else:
-                logger.debug("duplicated: %s", craft_essence)
-    # sort by id
-    craft_essences.sort(key=lambda x: x.id)
-    # write as csv
-    with open("data/craft_essences.csv", mode="w", encoding="utf-8") as csv:
-        for craft_essence in craft_essences:
-            csv.write(
-                '{0.id},{0.rarity},"{0.series}","{0.name}"\n'.format(craft_essence)
-            )
-
-
 if __name__ == "__main__":
-    logger = logging.getLogger("craft_essence")
-    logger.setLevel(logging.DEBUG)
-    handler = logging.StreamHandler()
-    handler.formatter = logging.Formatter(fmt="%(name)s::%(levelname)s::%(message)s")
-    logger.addHandler(handler)
-    main(logger=logger)
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import logging
+import pathlib
+from typing import Any, Optional
+
+import fgo
+
+
+def main() -> None:
+    # logger
+    logger = create_logger()
+    # option
+    parser = argument_parser()
+    option = Option(**vars(parser.parse_args()))
+    if option.verbose:
+        logger.setLevel(logging.DEBUG)
+    logger.debug("option: %s", option)
+    # diff
+    changelog: Any
+    if option.before.is_dir() and option.after.is_dir():
+        changelog = fgo.diff_servant_directories(
+            option.before,
+            option.after,
+            logger=logger,
+        )
+    elif option.before.is_file() and option.after.is_file():
+        before = fgo.load_merged_data(option.before, logger=logger)
+        after = fgo.load_merged_data(option.after, logger=logger)
+        if before is None or after is None:
+            return
+        changelog = fgo.diff_merged_data(before, after)
+    else:
+        parser.error("BEFORE and AFTER must be both directories or both files")
+    # output
+    if option.destination is not None:
+        logger.info('save changelog to "%s"', option.destination)
+        fgo.save_json(option.destination, changelog)
+    else:
+        print(json.dumps(changelog, indent=2, ensure_ascii=False))
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("diff")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    before: pathlib.Path
+    after: pathlib.Path
+    destination: Optional[pathlib.Path]
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Show changes between two merged data or servant directories",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="destination",
+        type=pathlib.Path,
+        help="save the changelog instead of printing it",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        dest="before",
+        type=pathlib.Path,
+        metavar="BEFORE",
+    )
+    parser.add_argument(
+        dest="after",
+        type=pathlib.Path,
+        metavar="AFTER",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    main()
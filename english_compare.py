@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import dataclasses
 import logging
 import pathlib
+import sys
+from typing import Any, Iterator, Optional, TypedDict
 
 import fgo
 import fgo.english
@@ -20,46 +23,60 @@ def main() -> None:
     if option.verbose:
         logger.setLevel(logging.DEBUG)
     logger.debug("option: %s", option)
-    # load english items
-    en_items = fgo.load_item_dictionary(
-        pathlib.Path("data/english/item.json"),
-        logger=logger,
-    )
-    if en_items is None:
-        return
-    # load english servants
-    en_servants: dict[fgo.ServantID, fgo.english.Servant] = {
-        servant["id"]: servant
-        for servant in fgo.english.load_servants(
-            pathlib.Path("data/english/servant"),
-            logger=logger,
-        )
-    }
-    # load japanese items
-    jp_items = fgo.load_items(
-        pathlib.Path("data/items.json"),
-        logger=logger,
-    )
-    if jp_items is None:
-        return
-    # load japanese servants
-    jp_servants: dict[fgo.ServantID, fgo.Servant] = {
-        servant["id"]: servant
-        for servant in fgo.load_servants(
-            pathlib.Path("data/servant"),
-            logger=logger,
-        )
-    }
+    # compare
+    if not run(option, fgo.DataStore(logger=logger), logger):
+        sys.exit(1)
+
+
+def run(
+    option: Option,
+    store: fgo.DataStore,
+    logger: logging.Logger,
+) -> bool:
+    # failed if the data is not loaded,
+    # mismatches are reported and fail only with --strict
+    with fgo.collect_records(logger, level=logging.ERROR) as load_errors:
+        # load english items
+        en_items = store.item_dictionary
+        if en_items is None:
+            return False
+        # load english servants
+        en_servants: dict[fgo.ServantID, fgo.english.Servant] = {
+            servant["id"]: servant for servant in store.english_servants
+        }
+        # load japanese items
+        jp_items = store.items
+        if jp_items is None:
+            return False
+        # load japanese servants
+        jp_servants: dict[fgo.ServantID, fgo.Servant] = {
+            servant["id"]: servant for servant in store.servants
+        }
     # compare items
-    compare_items(en_items, jp_items, logger)
+    en_only_item_ids, jp_only_item_ids = compare_items(en_items, jp_items, logger)
     # compare servants
-    compare_servants(
+    mismatches = compare_servants(
         en_servants,
         {value: key for key, value in en_items.items()},
         jp_servants,
         {item["name"]: item["id"] for item in jp_items},
         logger,
+        processes=option.processes,
     )
+    # report
+    if option.report is not None:
+        logger.info('save report to "%s"', option.report)
+        fgo.save_json(
+            option.report,
+            Report(
+                en_only_item_ids=en_only_item_ids,
+                jp_only_item_ids=jp_only_item_ids,
+                servants=mismatches,
+            ),
+        )
+    if load_errors.records:
+        return False
+    return not (option.strict and (en_only_item_ids or jp_only_item_ids or mismatches))
 
 
 def create_logger() -> logging.Logger:
@@ -76,6 +93,9 @@ def create_logger() -> logging.Logger:
 @dataclasses.dataclass(frozen=True)
 class Option:
     verbose: bool
+    report: Optional[pathlib.Path]
+    processes: int
+    strict: bool
 
 
 def argument_parser() -> argparse.ArgumentParser:
@@ -89,14 +109,54 @@ def argument_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="set log level to debug",
     )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="report",
+        type=pathlib.Path,
+        help="save mismatches as JSON",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="processes",
+        type=int,
+        default=1,
+        help="number of worker processes (default: %(default)s)",
+        metavar="N",
+    )
+    parser.add_argument(
+        "--strict",
+        dest="strict",
+        action="store_true",
+        help="fail if any item or servant does not match",
+    )
     return parser
 
 
+class Message(TypedDict):
+    level: str
+    message: str
+
+
+class Mismatch(TypedDict):
+    id: fgo.ServantID
+    name: str
+    messages: list[Message]
+
+
+class Report(TypedDict):
+    en_only_item_ids: list[fgo.ItemID]
+    jp_only_item_ids: list[fgo.ItemID]
+    servants: list[Mismatch]
+
+
 def compare_items(
     en_items: fgo.ItemDictionary,
     jp_items: list[fgo.Item],
     logger: logging.Logger,
-) -> None:
+) -> tuple[list[fgo.ItemID], list[fgo.ItemID]]:
     en_item_ids = set(en_items.keys())
     jp_item_ids = set(jp_item["id"] for jp_item in jp_items)
     en_only_item_ids = en_item_ids - jp_item_ids
@@ -111,35 +171,173 @@ def compare_items(
             "item IDs (%s) are only in Japanse",
             ", ".join(str(item_id) for item_id in jp_only_item_ids),
         )
+    return sorted(en_only_item_ids), sorted(jp_only_item_ids)
 
 
 def compare_servants(
+    # pylint: disable=too-many-arguments
     en_servants: dict[fgo.ServantID, fgo.english.Servant],
     en_items: dict[str, fgo.ItemID],
     jp_servants: dict[fgo.ServantID, fgo.Servant],
     jp_items: dict[str, fgo.ItemID],
     logger: logging.Logger,
+    *,
+    processes: int = 1,
+) -> list[Mismatch]:
+    mismatches: list[Mismatch] = []
+    pairs = [
+        (en_servants.get(servant_id, None), jp_servant)
+        for servant_id, jp_servant in jp_servants.items()
+    ]
+    for (_, jp_servant), records in zip(
+        pairs,
+        compare_pairs(pairs, en_items, jp_items, processes),
+    ):
+        fgo.replay_records(records, logger)
+        # without the servant prefix, the mismatch has the ID and the name
+        messages = [
+            Message(
+                level=logging.getLevelName(record["level"]),
+                message=record["message"],
+            )
+            for record in fgo.cache_records(records)
+        ]
+        if messages:
+            mismatches.append(
+                Mismatch(
+                    id=jp_servant["id"],
+                    name=jp_servant["name"],
+                    messages=messages,
+                )
+            )
+    return mismatches
+
+
+type ServantPair = tuple[Optional[fgo.english.Servant], fgo.Servant]
+
+# item name -> item ID of each worker
+_ITEMS: tuple[dict[str, fgo.ItemID], dict[str, fgo.ItemID]] = ({}, {})
+
+
+def compare_pairs(
+    pairs: list[ServantPair],
+    en_items: dict[str, fgo.ItemID],
+    jp_items: dict[str, fgo.ItemID],
+    processes: int,
+) -> Iterator[list[logging.LogRecord]]:
+    if processes == 1:
+        set_items(en_items, jp_items)
+        yield from map(compare_pair, pairs)
+        return
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=set_items,
+        initargs=(en_items, jp_items),
+    ) as executor:
+        yield from executor.map(compare_pair, pairs, chunksize=32)
+
+
+def set_items(
+    en_items: dict[str, fgo.ItemID],
+    jp_items: dict[str, fgo.ItemID],
 ) -> None:
-    for servant_id, jp_servant in jp_servants.items():
-        servant_logger = fgo.ServantLogger(logger, servant_id, jp_servant["name"])
-        servant_logger.debug("start comparing")
-        en_servant = en_servants.get(servant_id, None)
-        if en_servant is not None:
-            compare_servant(
-                en_servant,
-                fgo.ItemNameConverter(
-                    en_items,
-                    logger=servant_logger,
-                ),
-                jp_servant,
-                fgo.ItemNameConverter(
-                    jp_items,
-                    logger=servant_logger,
-                ),
-                servant_logger,
+    global _ITEMS  # pylint: disable=global-statement
+    _ITEMS = (en_items, jp_items)
+
+
+def compare_pair(pair: ServantPair) -> list[logging.LogRecord]:
+    en_servant, jp_servant = pair
+    en_items, jp_items = _ITEMS
+    handler = fgo.RecordCollector()
+    servant_logger = fgo.ServantLogger(
+        fgo.collecting_logger("english_compare.worker", handler),
+        jp_servant["id"],
+        jp_servant["name"],
+    )
+    servant_logger.debug("start comparing")
+    if en_servant is None:
+        servant_logger.error("does not exits in English")
+        return handler.records
+    # logged for every pair, matching fingerprints included
+    servant_logger.info("start comparing")
+    # compare field by field only if the fingerprints are different
+    en_fingerprint = en_servant_fingerprint(en_servant, en_items)
+    if en_fingerprint is not None and en_fingerprint == jp_servant_fingerprint(
+        jp_servant, jp_items
+    ):
+        servant_logger.debug("fingerprints match")
+        return handler.records
+    compare_servant(
+        en_servant,
+        fgo.ItemNameConverter(en_items, logger=servant_logger),
+        jp_servant,
+        fgo.ItemNameConverter(jp_items, logger=servant_logger),
+        servant_logger,
+    )
+    return handler.records
+
+
+def en_servant_fingerprint(
+    servant: fgo.english.Servant,
+    items: dict[str, fgo.ItemID],
+) -> Optional[tuple[Any, ...]]:
+    return servant_fingerprint(
+        servant,
+        servant["active_skills"],
+        servant["active_skill_resources"],
+        items,
+    )
+
+
+def jp_servant_fingerprint(
+    servant: fgo.Servant,
+    items: dict[str, fgo.ItemID],
+) -> Optional[tuple[Any, ...]]:
+    return servant_fingerprint(
+        servant,
+        servant["skills"],
+        servant["skill_resources"],
+        items,
+    )
+
+
+def servant_fingerprint(
+    servant: fgo.english.Servant | fgo.Servant,
+    skills: list[list[fgo.english.Skill]] | list[list[fgo.Skill]],
+    skill_resources: list[fgo.Resource],
+    items: dict[str, fgo.ItemID],
+) -> Optional[tuple[Any, ...]]:
+    # equal fingerprints mean compare_servant reports nothing,
+    # None if an item name is unknown
+    try:
+        resources = tuple(
+            tuple(
+                (
+                    resource["qp"],
+                    tuple((items[x["name"]], x["piece"]) for x in resource["items"]),
+                )
+                for resource in resource_list
             )
-        else:
-            servant_logger.error("does not exits in English")
+            for resource_list in [
+                servant["ascension_resources"],
+                skill_resources,
+                servant["append_skill_resources"],
+            ]
+        )
+    except KeyError:
+        return None
+    return (
+        servant["id"],
+        servant["false_name"] is None,
+        servant["klass"],
+        servant["rarity"],
+        tuple(tuple(skill["rank"] for skill in skill_n) for skill_n in skills),
+        tuple(
+            tuple(skill["rank"] for skill in skill_n)
+            for skill_n in servant["append_skills"]
+        ),
+        resources,
+    )
 
 
 def compare_servant(
@@ -149,7 +347,6 @@ def compare_servant(
     jp_items: fgo.ItemNameConverter,
     logger: fgo.ServantLogger,
 ) -> None:
-    logger.info("start comparing")
     # id
     if en_servant["id"] != jp_servant["id"]:
         logger.error("servant IDs do not match")
@@ -11,7 +11,6 @@ import time
 import urllib.parse
 from typing import Literal, Optional, TypedDict
 
-import fake_useragent
 import lxml.html
 import requests
 
@@ -27,9 +26,11 @@ def main() -> None:
     option = Option(**vars(argument_parser().parse_args()))
     if option.verbose:
         logger.setLevel(logging.DEBUG)
+    if option.log_json is not None:
+        logger.addHandler(fgo.json_lines_handler(option.log_json))
     logger.debug("option: %s", option)
     # session
-    session = create_session(logger=logger)
+    session = fgo.create_session(logger=logger)
     # directiory
     directory = pathlib.Path("data/english/servant")
     # servant links
@@ -86,7 +87,7 @@ def create_logger() -> logging.Logger:
 
 
 @dataclasses.dataclass(frozen=True)
-class Option:
+class Option:  # pylint: disable=too-many-instance-attributes
     verbose: bool
     force_update: bool
     no_save: bool
@@ -94,6 +95,7 @@ class Option:
     targets: list[int]
     request_interval: float
     request_timeout: float
+    log_json: Optional[pathlib.Path]
 
 
 def argument_parser() -> argparse.ArgumentParser:
@@ -152,26 +154,16 @@ def argument_parser() -> argparse.ArgumentParser:
         help="request timeout seconds (default: %(default)s)",
         metavar="SECONDS",
     )
+    parser.add_argument(
+        "--log-json",
+        dest="log_json",
+        type=pathlib.Path,
+        help="append log records as JSON lines with the servant fields",
+        metavar="PATH",
+    )
     return parser
 
 
-def create_session(
-    *,
-    logger: Optional[logging.Logger] = None,
-) -> requests.Session:
-    logger = logger or logging.getLogger(__name__)
-    session = requests.Session()
-    # user-agent
-    user_agent = fake_useragent.UserAgent(
-        os="Windows",
-        browsers="Firefox",
-        platforms="desktop",
-    ).random
-    logger.debug('fake user-agent: "%s"', user_agent)
-    session.headers["User-Agent"] = user_agent
-    return session
-
-
 def get_servant_links(
     path: pathlib.Path,
     session: requests.Session,
@@ -480,13 +472,11 @@ def group_costumes_by_servant(
 def load_patch(
     path: pathlib.Path,
     logger: logging.Logger,
-) -> dict[fgo.ServantID, list[fgo.Patch]]:
-    logger.info('load patch from "%s"', path)
-    data = fgo.load_json(path)
-    if data is None:
-        logger.error('failed to load patch from "%s"', path)
-        return {}
-    return {int(servant_id): patch for servant_id, patch in data.items()}
+) -> dict[fgo.ServantID, fgo.CompiledPatches]:
+    return fgo.compile_patch_set(
+        fgo.load_patches(path, logger=logger) or {},
+        logger=logger,
+    )
 
 
 def get_servants(
@@ -495,7 +485,7 @@ def get_servants(
     session: requests.Session,
     links: list[fgo.english.ServantLink],
     costumes: dict[fgo.ServantID, list[fgo.english.CostumeData]],
-    patches: dict[fgo.ServantID, list[fgo.Patch]],
+    patches: dict[fgo.ServantID, fgo.CompiledPatches],
     logger: logging.Logger,
     option: Option,
 ) -> dict[fgo.ServantID, fgo.english.Servant]:
@@ -531,13 +521,15 @@ def get_servants(
                 costumes.get(servant_id, []),
                 servant_logger,
             )
-            # patch
-            if not option.no_patch and servant_id in patches:
-                fgo.apply_patches(
+            # unpatched snapshot for patch.py --analyze
+            if not option.no_save:
+                fgo.save_json(
+                    fgo.unpatched_directory(directory).joinpath(path.name),
                     servant,
-                    patches[servant_id],
-                    logger=servant_logger,
                 )
+            # patch
+            if not option.no_patch and servant_id in patches:
+                patches[servant_id].apply(servant, logger=servant_logger)
             # save
             if not option.no_save:
                 servant_logger.info('save servant to "%s"', path)
@@ -785,7 +777,7 @@ def parse_skill(
         match = re.match(r"\{\{:(?P<skill>.+)\}\}\n", source)
         if match:
             skill.append(parse_skill_rank(match.group("skill")))
-    logger.debug("[%s] %s", target, repr(skill))
+    logger.debug("[%s] %r", target, skill)
     return skill
 
 
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import argparse
+import csv
+import dataclasses
+import importlib
+import importlib.util
+import logging
+import pathlib
+from typing import Any, Literal, NamedTuple, Optional
+
+import fgo
+
+
+def main() -> None:
+    # logger
+    logger = create_logger()
+    # option
+    option = Option(**vars(argument_parser().parse_args()))
+    if option.verbose:
+        logger.setLevel(logging.DEBUG)
+    logger.debug("option: %s", option)
+    # format
+    output_format = option.output_format
+    if output_format == "auto":
+        output_format = "parquet" if has_pyarrow() else "csv"
+    elif output_format == "parquet" and not has_pyarrow():
+        logger.error(
+            "pyarrow is required to save as Parquet"
+            " (poetry install --extras parquet)"
+        )
+        return
+    # merged data
+    merged_data = fgo.load_merged_data(option.source, logger=logger)
+    if merged_data is None:
+        return
+    # rows
+    rows = material_rows(merged_data["servants"])
+    logger.info("%d rows", len(rows))
+    # save
+    path = option.destination or pathlib.Path(f"data/materials.{output_format}")
+    logger.info('save materials to "%s"', path)
+    if output_format == "parquet":
+        save_parquet(path, rows)
+    else:
+        save_csv(path, rows)
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("export_materials")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+type OutputFormat = Literal["auto", "parquet", "csv"]
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    source: pathlib.Path
+    destination: Optional[pathlib.Path]
+    output_format: OutputFormat
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Export per-level materials as a long-format table",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        dest="source",
+        type=pathlib.Path,
+        default=pathlib.Path("data/merged_data.json"),
+        help="merged data (default: %(default)s)",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="destination",
+        type=pathlib.Path,
+        help="output file (default: data/materials.{parquet,csv})",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=["auto", "parquet", "csv"],
+        default="auto",
+        help="Parquet if pyarrow is available with auto (default: %(default)s)",
+    )
+    return parser
+
+
+def has_pyarrow() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+class MaterialRow(NamedTuple):
+    servant_id: int
+    kind: str
+    level: int
+    item_id: Optional[int]
+    piece: int
+    qp: int
+
+
+def material_rows(servants: list[dict[str, Any]]) -> list[MaterialRow]:
+    # one row per item, QP is a separate row with a null item_id
+    # so that piece and qp can be summed without double counting
+    rows: list[MaterialRow] = []
+    for servant in servants:
+        for kind, level, resource in fgo.servant_resources(servant):
+            if resource["qp"]:
+                rows.append(
+                    MaterialRow(servant["id"], kind, level, None, 0, resource["qp"])
+                )
+            rows.extend(
+                MaterialRow(servant["id"], kind, level, items["id"], items["piece"], 0)
+                for items in resource["items"]
+            )
+    return rows
+
+
+def save_parquet(path: pathlib.Path, rows: list[MaterialRow]) -> None:
+    pa = importlib.import_module("pyarrow")
+    parquet = importlib.import_module("pyarrow.parquet")
+    columns = dict(zip(MaterialRow._fields, zip(*rows))) if rows else {}
+    types = {
+        "servant_id": pa.int32(),
+        "kind": pa.string(),
+        "level": pa.int32(),
+        "item_id": pa.int32(),
+        "piece": pa.int32(),
+        "qp": pa.int64(),
+    }
+    arrays = {
+        key: pa.array(columns.get(key, []), value) for key, value in types.items()
+    }
+    arrays["kind"] = arrays["kind"].dictionary_encode()
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True)
+    parquet.write_table(pa.table(arrays), path, use_dictionary=True)
+
+
+def save_csv(path: pathlib.Path, rows: list[MaterialRow]) -> None:
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True)
+    with path.open(mode="w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(MaterialRow._fields)
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import logging
+import pathlib
+import sqlite3
+from typing import Any, Iterator
+
+import fgo
+
+SCHEMA = """
+CREATE TABLE items (
+  id INTEGER PRIMARY KEY,
+  rarity TEXT NOT NULL,
+  name_jp TEXT NOT NULL,
+  name_en TEXT NOT NULL
+);
+CREATE TABLE servants (
+  id INTEGER PRIMARY KEY,
+  name_jp TEXT NOT NULL,
+  name_en TEXT NOT NULL,
+  false_name_jp TEXT,
+  false_name_en TEXT,
+  class TEXT NOT NULL,
+  rarity INTEGER NOT NULL
+);
+CREATE TABLE skills (
+  servant_id INTEGER NOT NULL REFERENCES servants (id),
+  kind TEXT NOT NULL,
+  slot INTEGER NOT NULL,
+  level INTEGER NOT NULL,
+  name_jp TEXT NOT NULL,
+  name_en TEXT NOT NULL,
+  rank TEXT NOT NULL,
+  icon INTEGER NOT NULL,
+  PRIMARY KEY (servant_id, kind, slot, level)
+);
+CREATE TABLE costumes (
+  id INTEGER PRIMARY KEY,
+  servant_id INTEGER NOT NULL REFERENCES servants (id),
+  name_jp TEXT NOT NULL,
+  name_en TEXT NOT NULL
+);
+CREATE TABLE resources (
+  servant_id INTEGER NOT NULL REFERENCES servants (id),
+  kind TEXT NOT NULL,
+  level INTEGER NOT NULL,
+  qp INTEGER NOT NULL,
+  PRIMARY KEY (servant_id, kind, level)
+);
+CREATE TABLE resource_items (
+  servant_id INTEGER NOT NULL,
+  kind TEXT NOT NULL,
+  level INTEGER NOT NULL,
+  item_id INTEGER NOT NULL REFERENCES items (id),
+  piece INTEGER NOT NULL,
+  FOREIGN KEY (servant_id, kind, level)
+    REFERENCES resources (servant_id, kind, level)
+);
+CREATE VIRTUAL TABLE names USING fts5 (
+  target UNINDEXED,
+  target_id UNINDEXED,
+  jp,
+  en,
+  tokenize = 'trigram'
+);
+"""
+
+INDEXES = """
+CREATE INDEX servants_class ON servants (class);
+CREATE INDEX servants_rarity ON servants (rarity);
+CREATE INDEX costumes_servant_id ON costumes (servant_id);
+CREATE INDEX resource_items_item_id ON resource_items (item_id);
+CREATE INDEX resource_items_servant ON resource_items (servant_id, kind, level);
+"""
+
+
+def main() -> None:
+    # logger
+    logger = create_logger()
+    # option
+    option = Option(**vars(argument_parser().parse_args()))
+    if option.verbose:
+        logger.setLevel(logging.DEBUG)
+    logger.debug("option: %s", option)
+    # merged data
+    merged_data = fgo.load_merged_data(option.source, logger=logger)
+    if merged_data is None:
+        return
+    # export
+    logger.info('export merged data to "%s"', option.destination)
+    export(option.destination, merged_data, logger)
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("export_sqlite")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    source: pathlib.Path
+    destination: pathlib.Path
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Export merged data to SQLite",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        dest="source",
+        type=pathlib.Path,
+        default=pathlib.Path("data/merged_data.json"),
+        help="merged data (default: %(default)s)",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="destination",
+        type=pathlib.Path,
+        default=pathlib.Path("data/merged_data.sqlite3"),
+        help="SQLite database (default: %(default)s)",
+        metavar="PATH",
+    )
+    return parser
+
+
+def export(
+    path: pathlib.Path,
+    merged_data: dict[str, Any],
+    logger: logging.Logger,
+) -> None:
+    # build in a temporary file and replace the database at the end
+    temporary = path.with_name(f"{path.name}.tmp")
+    temporary.unlink(missing_ok=True)
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True)
+    connection = sqlite3.connect(temporary)
+    try:
+        connection.executescript(SCHEMA)
+        with connection:
+            insert_items(connection, merged_data["items"], logger)
+            insert_servants(connection, merged_data["servants"], logger)
+        # create indexes after bulk insert
+        logger.info("create indexes")
+        connection.executescript(INDEXES)
+        connection.execute("INSERT INTO names (names) VALUES ('optimize')")
+        connection.commit()
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+    temporary.replace(path)
+
+
+def insert_items(
+    connection: sqlite3.Connection,
+    items: list[dict[str, Any]],
+    logger: logging.Logger,
+) -> None:
+    logger.info("insert %d items", len(items))
+    connection.executemany(
+        "INSERT INTO items VALUES (?, ?, ?, ?)",
+        (
+            (item["id"], item["rarity"], item["name"]["jp"], item["name"]["en"])
+            for item in items
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO names VALUES ('item', ?, ?, ?)",
+        ((item["id"], item["name"]["jp"], item["name"]["en"]) for item in items),
+    )
+
+
+def insert_servants(
+    connection: sqlite3.Connection,
+    servants: list[dict[str, Any]],
+    logger: logging.Logger,
+) -> None:
+    logger.info("insert %d servants", len(servants))
+    connection.executemany(
+        "INSERT INTO servants VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                servant["id"],
+                servant["name"]["jp"],
+                servant["name"]["en"],
+                (servant["false_name"] or {}).get("jp", None),
+                (servant["false_name"] or {}).get("en", None),
+                servant["klass"],
+                servant["rarity"],
+            )
+            for servant in servants
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO skills VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        skill_rows(servants),
+    )
+    connection.executemany(
+        "INSERT INTO costumes VALUES (?, ?, ?, ?)",
+        (
+            (
+                costume["id"],
+                servant["id"],
+                costume["name"]["jp"],
+                costume["name"]["en"],
+            )
+            for servant in servants
+            for costume in servant["costumes"]
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO resources VALUES (?, ?, ?, ?)",
+        (
+            (servant_id, kind, level, resource["qp"])
+            for servant_id, kind, level, resource in resource_rows(servants)
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO resource_items VALUES (?, ?, ?, ?, ?)",
+        (
+            (servant_id, kind, level, items["id"], items["piece"])
+            for servant_id, kind, level, resource in resource_rows(servants)
+            for items in resource["items"]
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO names VALUES (?, ?, ?, ?)",
+        name_rows(servants),
+    )
+
+
+def skill_rows(
+    servants: list[dict[str, Any]],
+) -> Iterator[tuple[int, str, int, int, str, str, str, int]]:
+    for servant in servants:
+        for kind in ["skills", "append_skills"]:
+            for skills in servant[kind].values():
+                for skill in skills:
+                    yield (
+                        servant["id"],
+                        kind.removesuffix("s"),
+                        skill["slot"],
+                        skill["level"],
+                        skill["name"]["jp"],
+                        skill["name"]["en"],
+                        skill["rank"],
+                        skill["icon"],
+                    )
+
+
+def resource_rows(
+    servants: list[dict[str, Any]],
+) -> Iterator[tuple[int, str, int, fgo.ResourceByID]]:
+    for servant in servants:
+        for kind, level, resource in fgo.servant_resources(servant):
+            yield servant["id"], kind, level, resource
+
+
+def name_rows(
+    servants: list[dict[str, Any]],
+) -> Iterator[tuple[str, int, str, str]]:
+    for servant in servants:
+        yield "servant", servant["id"], servant["name"]["jp"], servant["name"]["en"]
+        if servant["false_name"] is not None:
+            yield (
+                "servant",
+                servant["id"],
+                servant["false_name"]["jp"],
+                servant["false_name"]["en"],
+            )
+        # skill names are shared by levels, register them once per servant
+        skill_names: set[tuple[str, str]] = set()
+        for kind in ["skills", "append_skills"]:
+            for skills in servant[kind].values():
+                for skill in skills:
+                    name = (skill["name"]["jp"], skill["name"]["en"])
+                    if name not in skill_names:
+                        skill_names.add(name)
+                        yield "skill", servant["id"], *name
+        for costume in servant["costumes"]:
+            name = (costume["name"]["jp"], costume["name"]["en"])
+            yield "costume", costume["id"], *name
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,160 @@
 from __future__ import annotations
 
-from .io import load_json, save_json
-from .item import ItemNameConverter, load_items
-from .patch import Patch, apply_patch, apply_patches
-from .servant import (
-    ServantLogger,
-    load_costumes,
-    load_servant_links,
-    load_servant_names,
-    load_servants,
-    unplayable_servant_ids,
-)
-from .sound import Sound, sound_list
-from .text import load_item_dictionary, load_servant_dictionary
-from .types import (
-    AppendSkills,
-    Costume,
-    CostumeData,
-    CostumeID,
-    Dictionary,
-    Item,
-    ItemDictionary,
-    ItemID,
-    Items,
-    ItemsByID,
-    Resource,
-    ResourceByID,
-    Servant,
-    ServantDictionary,
-    ServantDictionaryValue,
-    ServantID,
-    ServantLink,
-    ServantName,
-    Skill,
-    Skills,
-    Text,
-)
-from .validate import (
-    validate_append_skills,
-    validate_servant,
-    validate_servants,
-    validate_skills,
-)
+import importlib
+from typing import Any
+
+# public names are imported from their submodules on first access (PEP 562),
+# so that "import fgo" does not import requests, lxml, jsonschema or PyYAML
+# until a script uses them, type checkers read __init__.pyi instead
+_EXPORTS: dict[str, list[str]] = {
+    "craft_essence": ["CraftEssence", "load_craft_essences", "save_craft_essences"],
+    "diff": [
+        "Changelog",
+        "diff",
+        "diff_merged_data",
+        "diff_records",
+        "diff_servant_directories",
+    ],
+    "digest": ["file_digest", "json_digest"],
+    "http": [
+        "USER_AGENT_CACHE_PATH",
+        "PageCacheEntry",
+        "UserAgentCache",
+        "cached_get",
+        "create_session",
+        "user_agent",
+    ],
+    "index": ["ItemIndex", "ItemUsage", "build_item_index"],
+    "io": [
+        "Codec",
+        "compress",
+        "compression_names",
+        "decode",
+        "encode",
+        "encoded_path",
+        "encoding_names",
+        "load_encoded",
+        "load_json",
+        "missing_compression_module",
+        "missing_encoding_module",
+        "register_compression",
+        "register_encoding",
+        "save_encoded",
+        "save_json",
+        "save_json_stream",
+    ],
+    "item": ["ItemNameConverter", "load_items"],
+    "merged": [
+        "MERGED_DATA_VERSION",
+        "ResourceTable",
+        "expand_merged_data",
+        "load_merged_data",
+        "normalize_merged_data",
+        "normalize_servant",
+        "normalize_sound",
+        "servant_resources",
+    ],
+    "patch": [
+        "CompiledPatches",
+        "Patch",
+        "PatchAnalysis",
+        "PatchResult",
+        "PatchState",
+        "PatchStatus",
+        "analyze_patch_set",
+        "analyze_patches",
+        "apply_patch",
+        "apply_patch_set",
+        "apply_patches",
+        "compile_patch_set",
+        "load_patches",
+        "prune_patch_set",
+        "unpatched_directory",
+    ],
+    "record": [
+        "CachedRecord",
+        "JsonLinesFormatter",
+        "RecordCollector",
+        "cache_records",
+        "collect_records",
+        "collecting_logger",
+        "json_lines_handler",
+        "replay_cached_records",
+        "replay_records",
+    ],
+    "servant": [
+        "ServantLogger",
+        "ServantMessage",
+        "iterate_servants",
+        "load_costumes",
+        "load_servant_links",
+        "load_servant_names",
+        "load_servants",
+        "servant_files",
+        "unplayable_servant_ids",
+    ],
+    "sound": ["Sound", "load_sounds"],
+    "sound_page": ["SOUND_URL", "parse_sounds", "sound_list"],
+    "store": ["DataStore"],
+    "text": ["load_item_dictionary", "load_servant_dictionary"],
+    "types": [
+        "AppendSkills",
+        "Costume",
+        "CostumeData",
+        "CostumeID",
+        "CraftEssenceID",
+        "Dictionary",
+        "Item",
+        "ItemDictionary",
+        "ItemID",
+        "Items",
+        "ItemsByID",
+        "Resource",
+        "ResourceByID",
+        "Servant",
+        "ServantDictionary",
+        "ServantDictionaryValue",
+        "ServantID",
+        "ServantLink",
+        "ServantName",
+        "Skill",
+        "Skills",
+        "Text",
+    ],
+    "validate": [
+        "compiled_servant_validator",
+        "servant_validator",
+        "validate_append_skills",
+        "validate_dataset",
+        "validate_servant",
+        "validate_servant_files",
+        "validate_servants",
+        "validate_skills",
+    ],
+}
+_SUBMODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+# subpackages that are not re-exported
+_SUBPACKAGES = {*_EXPORTS.keys(), "english", "planner", "schema"}
+
+__all__ = sorted(_SUBMODULES)
+
+
+def __getattr__(name: str) -> Any:
+    module = _SUBMODULES.get(name, None)
+    if module is not None:
+        submodule = importlib.import_module(f".{module}", __name__)
+        value = getattr(submodule, name)
+        # importing a submodule sets it as the package attribute,
+        # so a public name equal to the submodule name (fgo.diff) is set back
+        if _SUBMODULES.get(module, None) == module:
+            globals()[module] = getattr(submodule, module)
+    elif name in _SUBPACKAGES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(globals().keys() | _SUBMODULES.keys())
@@ -0,0 +1,123 @@
+# type information of the lazily imported names in __init__.py,
+# keep in sync with _EXPORTS (tests/test_exports.py checks it)
+
+from .craft_essence import CraftEssence as CraftEssence
+from .craft_essence import load_craft_essences as load_craft_essences
+from .craft_essence import save_craft_essences as save_craft_essences
+from .diff import Changelog as Changelog
+from .diff import diff as diff
+from .diff import diff_merged_data as diff_merged_data
+from .diff import diff_records as diff_records
+from .diff import diff_servant_directories as diff_servant_directories
+from .digest import file_digest as file_digest
+from .digest import json_digest as json_digest
+from .http import USER_AGENT_CACHE_PATH as USER_AGENT_CACHE_PATH
+from .http import PageCacheEntry as PageCacheEntry
+from .http import UserAgentCache as UserAgentCache
+from .http import cached_get as cached_get
+from .http import create_session as create_session
+from .http import user_agent as user_agent
+from .index import ItemIndex as ItemIndex
+from .index import ItemUsage as ItemUsage
+from .index import build_item_index as build_item_index
+from .io import Codec as Codec
+from .io import compress as compress
+from .io import compression_names as compression_names
+from .io import decode as decode
+from .io import encode as encode
+from .io import encoded_path as encoded_path
+from .io import encoding_names as encoding_names
+from .io import load_encoded as load_encoded
+from .io import load_json as load_json
+from .io import missing_compression_module as missing_compression_module
+from .io import missing_encoding_module as missing_encoding_module
+from .io import register_compression as register_compression
+from .io import register_encoding as register_encoding
+from .io import save_encoded as save_encoded
+from .io import save_json as save_json
+from .io import save_json_stream as save_json_stream
+from .item import ItemNameConverter as ItemNameConverter
+from .item import load_items as load_items
+from .merged import MERGED_DATA_VERSION as MERGED_DATA_VERSION
+from .merged import ResourceTable as ResourceTable
+from .merged import expand_merged_data as expand_merged_data
+from .merged import load_merged_data as load_merged_data
+from .merged import normalize_merged_data as normalize_merged_data
+from .merged import normalize_servant as normalize_servant
+from .merged import normalize_sound as normalize_sound
+from .merged import servant_resources as servant_resources
+from .patch import CompiledPatches as CompiledPatches
+from .patch import Patch as Patch
+from .patch import PatchAnalysis as PatchAnalysis
+from .patch import PatchResult as PatchResult
+from .patch import PatchState as PatchState
+from .patch import PatchStatus as PatchStatus
+from .patch import analyze_patch_set as analyze_patch_set
+from .patch import analyze_patches as analyze_patches
+from .patch import apply_patch as apply_patch
+from .patch import apply_patch_set as apply_patch_set
+from .patch import apply_patches as apply_patches
+from .patch import compile_patch_set as compile_patch_set
+from .patch import load_patches as load_patches
+from .patch import prune_patch_set as prune_patch_set
+from .patch import unpatched_directory as unpatched_directory
+from .record import CachedRecord as CachedRecord
+from .record import JsonLinesFormatter as JsonLinesFormatter
+from .record import RecordCollector as RecordCollector
+from .record import cache_records as cache_records
+from .record import collect_records as collect_records
+from .record import collecting_logger as collecting_logger
+from .record import json_lines_handler as json_lines_handler
+from .record import replay_cached_records as replay_cached_records
+from .record import replay_records as replay_records
+from .servant import ServantLogger as ServantLogger
+from .servant import ServantMessage as ServantMessage
+from .servant import iterate_servants as iterate_servants
+from .servant import load_costumes as load_costumes
+from .servant import load_servant_links as load_servant_links
+from .servant import load_servant_names as load_servant_names
+from .servant import load_servants as load_servants
+from .servant import servant_files as servant_files
+from .servant import unplayable_servant_ids as unplayable_servant_ids
+from .sound import Sound as Sound
+from .sound import load_sounds as load_sounds
+from .sound_page import SOUND_URL as SOUND_URL
+from .sound_page import parse_sounds as parse_sounds
+from .sound_page import sound_list as sound_list
+from .store import DataStore as DataStore
+from .text import load_item_dictionary as load_item_dictionary
+from .text import load_servant_dictionary as load_servant_dictionary
+from .types import AppendSkills as AppendSkills
+from .types import Costume as Costume
+from .types import CostumeData as CostumeData
+from .types import CostumeID as CostumeID
+from .types import CraftEssenceID as CraftEssenceID
+from .types import Dictionary as Dictionary
+from .types import Item as Item
+from .types import ItemDictionary as ItemDictionary
+from .types import ItemID as ItemID
+from .types import Items as Items
+from .types import ItemsByID as ItemsByID
+from .types import Resource as Resource
+from .types import ResourceByID as ResourceByID
+from .types import Servant as Servant
+from .types import ServantDictionary as ServantDictionary
+from .types import ServantDictionaryValue as ServantDictionaryValue
+from .types import ServantID as ServantID
+from .types import ServantLink as ServantLink
+from .types import ServantName as ServantName
+from .types import Skill as Skill
+from .types import Skills as Skills
+from .types import Text as Text
+from .validate import compiled_servant_validator as compiled_servant_validator
+from .validate import servant_validator as servant_validator
+from .validate import validate_append_skills as validate_append_skills
+from .validate import validate_dataset as validate_dataset
+from .validate import validate_servant as validate_servant
+from .validate import validate_servant_files as validate_servant_files
+from .validate import validate_servants as validate_servants
+from .validate import validate_skills as validate_skills
+
+__all__: list[str]
+_EXPORTS: dict[str, list[str]]
+_SUBMODULES: dict[str, str]
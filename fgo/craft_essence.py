@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import csv
+import logging
+import pathlib
+from typing import Iterable, NamedTuple, Optional
+
+from .types import CraftEssenceID
+
+
+class CraftEssence(NamedTuple):
+    id: CraftEssenceID
+    rarity: int
+    name: str
+    series: str
+
+
+def load_craft_essences(
+    path: pathlib.Path,
+    *,
+    logger: Optional[logging.Logger] = None,
+) -> Optional[dict[CraftEssenceID, CraftEssence]]:
+    # catalog indexed by ID, rows are "id,rarity,series,name"
+    logger = logger or logging.getLogger(__name__)
+    logger.info('load craft essences from "%s"', path)
+    if not path.exists():
+        logger.error('failed to load craft essences from "%s"', path)
+        return None
+    catalog: dict[CraftEssenceID, CraftEssence] = {}
+    with path.open(encoding="utf-8", newline="") as file:
+        for line_number, row in enumerate(csv.reader(file), start=1):
+            if len(row) != 4 or not row[0].isdigit() or not row[1].isdigit():
+                logger.warning("invalid craft essence at line %d: %s", line_number, row)
+                continue
+            craft_essence = CraftEssence(
+                id=int(row[0]),
+                rarity=int(row[1]),
+                name=row[3],
+                series=row[2],
+            )
+            if craft_essence.id in catalog:
+                logger.warning("duplicated craft essence: %s", craft_essence)
+                continue
+            catalog[craft_essence.id] = craft_essence
+    return catalog
+
+
+def save_craft_essences(
+    path: pathlib.Path,
+    craft_essences: Iterable[CraftEssence],
+    *,
+    append: bool = False,
+) -> None:
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True)
+    with path.open(mode="a" if append else "w", encoding="utf-8") as file:
+        file.writelines(
+            _craft_essence_line(craft_essence) for craft_essence in craft_essences
+        )
+
+
+def _craft_essence_line(craft_essence: CraftEssence) -> str:
+    return (
+        f"{craft_essence.id},{craft_essence.rarity},"
+        f'"{craft_essence.series}","{craft_essence.name}"\n'
+    )
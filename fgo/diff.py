@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import pathlib
+from typing import Any, Callable, Iterable, Optional, TypedDict
+
+from .digest import file_digest
+from .io import load_json
+from .patch import Patch
+from .servant import servant_files
+
+
+class Changelog(TypedDict):
+    # record key -> patches relative to the record,
+    # the same layout as data/servant/patch.json
+    changed: dict[str, list[Patch[Any]]]
+    # record key -> the whole record,
+    # a record cannot be added or removed with fgo.apply_patch
+    added: dict[str, Any]
+    removed: dict[str, Any]
+
+
+def diff(
+    before: Any,
+    after: Any,
+    path: Optional[list[Any]] = None,
+) -> list[Patch[Any]]:
+    # descends only into subtrees that differ,
+    # dicts with the same keys and lists with the same length are compared
+    # per element, otherwise the whole value is replaced so that every patch
+    # can be applied by fgo.apply_patch (except a replaced root, path [])
+    path = path or []
+    if before == after:
+        return []
+    if isinstance(before, dict) and isinstance(after, dict):
+        if before.keys() == after.keys():
+            return [
+                patch
+                for key, value in before.items()
+                for patch in diff(value, after[key], [*path, key])
+            ]
+    elif isinstance(before, list) and isinstance(after, list):
+        if len(before) == len(after):
+            return [
+                patch
+                for i, (x, y) in enumerate(zip(before, after))
+                for patch in diff(x, y, [*path, i])
+            ]
+    return [Patch(path=path, before=before, after=after)]
+
+
+def diff_records(
+    before: Iterable[Any],
+    after: Iterable[Any],
+    key: Callable[[Any], str],
+) -> Changelog:
+    before_records = {key(record): record for record in before}
+    after_records = {key(record): record for record in after}
+    changelog = Changelog(changed={}, added={}, removed={})
+    for record_key in sorted(before_records.keys() | after_records.keys()):
+        _add_record(
+            changelog,
+            record_key,
+            before_records.get(record_key, None),
+            after_records.get(record_key, None),
+        )
+    return changelog
+
+
+def _add_record(
+    changelog: Changelog,
+    record_key: str,
+    before: Optional[Any],
+    after: Optional[Any],
+) -> None:
+    if before is None:
+        changelog["added"][record_key] = after
+    elif after is None:
+        changelog["removed"][record_key] = before
+    else:
+        patches = diff(before, after)
+        if any(not patch["path"] for patch in patches):
+            # the record is replaced as a whole, e.g. its keys are changed
+            changelog["removed"][record_key] = before
+            changelog["added"][record_key] = after
+        elif patches:
+            changelog["changed"][record_key] = patches
+
+
+def diff_merged_data(
+    before: dict[str, Any],
+    after: dict[str, Any],
+) -> dict[str, Changelog]:
+    # expanded (v1) merged data
+    return {
+        "items": diff_records(
+            before["items"],
+            after["items"],
+            lambda item: str(item["id"]),
+        ),
+        "servants": diff_records(
+            before["servants"],
+            after["servants"],
+            lambda servant: f"{servant['id']:03d}",
+        ),
+        "sounds": diff_records(
+            before["sounds"],
+            after["sounds"],
+            lambda sound: f"{sound['source']}/{sound['index']}",
+        ),
+    }
+
+
+def diff_servant_directories(
+    before: pathlib.Path,
+    after: pathlib.Path,
+    *,
+    logger: Optional[logging.Logger] = None,
+) -> Changelog:
+    # only files whose digests differ are loaded
+    logger = logger or logging.getLogger(__name__)
+    before_files = {f"{key:03d}": path for key, path in servant_files(before)}
+    after_files = {f"{key:03d}": path for key, path in servant_files(after)}
+    changelog = Changelog(changed={}, added={}, removed={})
+    for key in sorted(before_files.keys() | after_files.keys()):
+        before_file = before_files.get(key, None)
+        after_file = after_files.get(key, None)
+        if (
+            before_file is not None
+            and after_file is not None
+            and file_digest(before_file) == file_digest(after_file)
+        ):
+            continue
+        logger.debug("servant %s is changed", key)
+        _add_record(
+            changelog,
+            key,
+            load_json(before_file) if before_file is not None else None,
+            load_json(after_file) if after_file is not None else None,
+        )
+    return changelog
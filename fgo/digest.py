@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import pathlib
+from typing import Any
+
+
+def json_digest(data: Any) -> str:
+    text = json.dumps(
+        data,
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: pathlib.Path) -> str:
+    with path.open(mode="rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
@@ -1,4 +1,9 @@
 from __future__ import annotations
 
-from .servant import load_servant, load_servant_links, load_servants
+from .servant import (
+    load_costumes,
+    load_servant,
+    load_servant_links,
+    load_servants,
+)
 from .types import Costume, CostumeData, CostumeType, Servant, ServantLink, Skill
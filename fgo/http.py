@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import pathlib
+import random
+import time
+from typing import Optional, TypedDict
+
+import requests
+import requests.adapters
+import urllib3.util
+
+from .io import load_json, save_json
+
+# bump when the user-agent filter or the cache format change
+USER_AGENT_CACHE_VERSION = 1
+USER_AGENT_CACHE_PATH = pathlib.Path("data/cache/user_agent.json")
+# a week
+USER_AGENT_CACHE_TTL = 7 * 24 * 60 * 60.0
+_USER_AGENT_POOL_SIZE = 16
+
+
+class PageCacheEntry(TypedDict):
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class UserAgentCache(TypedDict):
+    version: int
+    # UNIX time
+    created: float
+    user_agents: list[str]
+
+
+def create_session(
+    *,
+    retries: int = 3,
+    pool_maxsize: int = 1,
+    user_agent_cache: Optional[pathlib.Path] = USER_AGENT_CACHE_PATH,
+    logger: Optional[logging.Logger] = None,
+) -> requests.Session:
+    # shared by all scrapers:
+    #   a fake user-agent picked from the cached pool,
+    #   idempotent requests are retried with backoff on connection errors
+    #   and 429/5xx responses
+    logger = logger or logging.getLogger(__name__)
+    session = requests.Session()
+    agent = user_agent(cache_path=user_agent_cache, logger=logger)
+    logger.debug('fake user-agent: "%s"', agent)
+    session.headers["User-Agent"] = agent
+    retry = urllib3.util.Retry(
+        total=retries,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    )
+    adapter = requests.adapters.HTTPAdapter(
+        max_retries=retry, pool_maxsize=pool_maxsize
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def user_agent(
+    *,
+    cache_path: Optional[pathlib.Path] = USER_AGENT_CACHE_PATH,
+    ttl: float = USER_AGENT_CACHE_TTL,
+    logger: Optional[logging.Logger] = None,
+) -> str:
+    # fake_useragent loads and filters its whole browser data,
+    # so a small pool of Windows desktop Firefox user-agents is cached
+    logger = logger or logging.getLogger(__name__)
+    cache: Optional[UserAgentCache] = (
+        load_json(cache_path) if cache_path is not None else None
+    )
+    if (
+        cache is None
+        or cache.get("version", None) != USER_AGENT_CACHE_VERSION
+        or not cache["user_agents"]
+        or time.time() - cache["created"] > ttl
+    ):
+        cache = UserAgentCache(
+            version=USER_AGENT_CACHE_VERSION,
+            created=time.time(),
+            user_agents=_fake_user_agents(_USER_AGENT_POOL_SIZE),
+        )
+        if cache_path is not None:
+            logger.info('save user-agent cache to "%s"', cache_path)
+            save_json(cache_path, cache)
+    return random.choice(cache["user_agents"])
+
+
+def _fake_user_agents(size: int) -> list[str]:
+    # fake_useragent is imported only when the cache is refreshed
+    import fake_useragent  # pylint: disable=import-outside-toplevel
+
+    generator = fake_useragent.UserAgent(
+        os="Windows",
+        browsers="Firefox",
+        platforms="desktop",
+    )
+    return sorted({generator.random for _ in range(size)})
+
+
+def cached_get(
+    # pylint: disable=too-many-arguments
+    session: requests.Session,
+    url: str,
+    cache_directory: pathlib.Path,
+    *,
+    timeout: float = 10.0,
+    force: bool = False,
+    logger: Optional[logging.Logger] = None,
+) -> Optional[bytes]:
+    # the body is cached with its validators, ETag and Last-Modified,
+    # and is returned as is for 304 Not Modified
+    logger = logger or logging.getLogger(__name__)
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    body_path = cache_directory.joinpath(f"{key}.body")
+    entry_path = cache_directory.joinpath(f"{key}.json")
+    entry: Optional[PageCacheEntry] = load_json(entry_path)
+    if entry is not None and (entry["url"] != url or not body_path.exists()):
+        entry = None
+    headers: dict[str, str] = {}
+    if entry is not None and not force:
+        if entry["etag"] is not None:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"] is not None:
+            headers["If-Modified-Since"] = entry["last_modified"]
+    logger.info('request "%s"', url)
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as error:
+        if entry is None:
+            logger.error('failed to request "%s": %s', url, error)
+            return None
+        logger.warning('failed to request "%s", use the cache: %s', url, error)
+        return body_path.read_bytes()
+    if response.status_code == 304 and entry is not None:
+        logger.info('"%s" is not modified', url)
+        return body_path.read_bytes()
+    # save cache
+    if not cache_directory.exists():
+        cache_directory.mkdir(parents=True)
+    body_path.write_bytes(response.content)
+    save_json(
+        entry_path,
+        PageCacheEntry(
+            url=url,
+            etag=response.headers.get("ETag", None),
+            last_modified=response.headers.get("Last-Modified", None),
+        ),
+    )
+    return response.content
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import logging
+import pathlib
+from typing import Iterable, Optional, TypedDict
+
+from .digest import file_digest
+from .io import load_json, save_json
+from .item import ItemNameConverter, load_items
+from .merged import servant_resources
+from .servant import load_servant, servant_files
+from .sound import Sound, load_sounds
+from .types import Item, ItemID, Resource, Servant, ServantID
+
+# bump when the usages or the cache format change
+INDEX_CACHE_VERSION = 1
+
+
+class ItemUsage(TypedDict):
+    item_id: ItemID
+    # "ascension", "skill", "append_skill", "costume" or "sound"
+    kind: str
+    servant_id: Optional[ServantID]
+    source: Optional[str]
+    # 1-based level, costume ID, or sound index
+    level: int
+    piece: int
+
+
+class UsageCacheEntry(TypedDict):
+    digest: str
+    usages: list[ItemUsage]
+
+
+class ItemIndexCache(TypedDict):
+    version: int
+    items: str
+    sounds: Optional[UsageCacheEntry]
+    servants: dict[str, UsageCacheEntry]
+
+
+class ItemIndex:
+    def __init__(
+        self,
+        items: list[Item],
+        usages: Iterable[ItemUsage],
+    ) -> None:
+        self._items = {item["id"]: item for item in items}
+        self._item_ids = {item["name"]: item["id"] for item in items}
+        self._usages: dict[ItemID, list[ItemUsage]] = {}
+        for usage in usages:
+            self._usages.setdefault(usage["item_id"], []).append(usage)
+
+    def item(self, item: ItemID | str) -> Optional[Item]:
+        item_id = self.item_id(item)
+        return self._items.get(item_id, None) if item_id is not None else None
+
+    def item_id(self, item: ItemID | str) -> Optional[ItemID]:
+        if isinstance(item, int):
+            return item if item in self._items else None
+        if item.isdigit():
+            return self.item_id(int(item))
+        return self._item_ids.get(item, None)
+
+    def usages(self, item: ItemID | str) -> list[ItemUsage]:
+        item_id = self.item_id(item)
+        if item_id is None:
+            return []
+        return self._usages.get(item_id, [])
+
+    def total(self, item: ItemID | str) -> int:
+        return sum(usage["piece"] for usage in self.usages(item))
+
+
+def build_item_index(
+    # pylint: disable=too-many-locals
+    items_path: pathlib.Path,
+    servant_directory: pathlib.Path,
+    sounds_path: pathlib.Path,
+    *,
+    cache_path: Optional[pathlib.Path] = None,
+    logger: Optional[logging.Logger] = None,
+) -> Optional[ItemIndex]:
+    logger = logger or logging.getLogger(__name__)
+    items = load_items(items_path, logger=logger)
+    if items is None:
+        return None
+    converter = ItemNameConverter(
+        {item["name"]: item["id"] for item in items},
+        logger=logger,
+    )
+    # cache is valid only for the same items.json
+    items_digest = file_digest(items_path)
+    cache = _load_cache(cache_path, items_digest, logger)
+    updated = ItemIndexCache(
+        version=INDEX_CACHE_VERSION,
+        items=items_digest,
+        sounds=None,
+        servants={},
+    )
+    files = servant_files(servant_directory)
+    # removed servants
+    is_changed = cache["servants"].keys() != {
+        f"{servant_id:03d}" for servant_id, _ in files
+    }
+    # servants
+    for servant_id, path in files:
+        key = f"{servant_id:03d}"
+        digest = file_digest(path)
+        entry = cache["servants"].get(key, None)
+        if entry is None or entry["digest"] != digest:
+            servant = load_servant(path, logger=logger)
+            if servant is None:
+                continue
+            entry = UsageCacheEntry(
+                digest=digest,
+                usages=servant_usages(servant, converter),
+            )
+            is_changed = True
+        updated["servants"][key] = entry
+    # sounds
+    if sounds_path.exists():
+        digest = file_digest(sounds_path)
+        entry = cache["sounds"]
+        if entry is None or entry["digest"] != digest:
+            sounds = load_sounds(sounds_path, logger=logger) or []
+            entry = UsageCacheEntry(
+                digest=digest,
+                usages=sound_usages(sounds, converter),
+            )
+            is_changed = True
+        updated["sounds"] = entry
+    # save cache
+    if cache_path is not None and is_changed:
+        logger.info('save item index cache to "%s"', cache_path)
+        save_json(cache_path, updated)
+    usages = [
+        usage for entry in updated["servants"].values() for usage in entry["usages"]
+    ]
+    if updated["sounds"] is not None:
+        usages.extend(updated["sounds"]["usages"])
+    return ItemIndex(items, usages)
+
+
+def servant_usages(
+    servant: Servant,
+    converter: ItemNameConverter,
+) -> list[ItemUsage]:
+    return [
+        usage
+        for kind, level, resource in servant_resources(servant)
+        for usage in _resource_usages(
+            resource,
+            converter,
+            kind=kind,
+            servant_id=servant["id"],
+            source=None,
+            level=level,
+        )
+    ]
+
+
+def sound_usages(
+    sounds: list[Sound],
+    converter: ItemNameConverter,
+) -> list[ItemUsage]:
+    return [
+        usage
+        for sound in sounds
+        for usage in _resource_usages(
+            sound["resource"],
+            converter,
+            kind="sound",
+            servant_id=None,
+            source=sound["source"],
+            level=sound["index"],
+        )
+    ]
+
+
+def _resource_usages(
+    # pylint: disable=too-many-arguments
+    resource: Resource,
+    converter: ItemNameConverter,
+    *,
+    kind: str,
+    servant_id: Optional[ServantID],
+    source: Optional[str],
+    level: int,
+) -> list[ItemUsage]:
+    result: list[ItemUsage] = []
+    for items in resource["items"]:
+        value = converter.items(items)
+        if value is None:
+            continue
+        result.append(
+            ItemUsage(
+                item_id=value["id"],
+                kind=kind,
+                servant_id=servant_id,
+                source=source,
+                level=level,
+                piece=value["piece"],
+            )
+        )
+    return result
+
+
+def _load_cache(
+    path: Optional[pathlib.Path],
+    items_digest: str,
+    logger: logging.Logger,
+) -> ItemIndexCache:
+    empty = ItemIndexCache(
+        version=INDEX_CACHE_VERSION,
+        items=items_digest,
+        sounds=None,
+        servants={},
+    )
+    if path is None:
+        return empty
+    logger.info('load item index cache from "%s"', path)
+    cache: Optional[ItemIndexCache] = load_json(path)
+    if cache is None:
+        return empty
+    if cache.get("version", None) != INDEX_CACHE_VERSION:
+        logger.info("item index cache version is changed")
+        return empty
+    if cache["items"] != items_digest:
+        logger.info("items are changed")
+        return empty
+    return cache
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import dataclasses
+import gzip
+import importlib
+import importlib.util
 import json
 import pathlib
-from typing import Any, Optional
-
-import yaml
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO
 
 
 def load_json(path: pathlib.Path) -> Optional[Any]:
@@ -27,21 +29,234 @@ def save_json(path: pathlib.Path, data: Any) -> None:
         file.write("\n")
 
 
+def save_json_stream(
+    path: pathlib.Path,
+    data: Iterable[tuple[str, Any]],
+) -> None:
+    # same output as save_json({key: value, ...}),
+    # but the elements of an iterator value are serialized as soon as
+    # they are produced
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True)
+    with path.open(mode="w", encoding="utf-8") as file:
+        file.write("{")
+        is_empty_object = True
+        for key, value in data:
+            file.write("\n  " if is_empty_object else ",\n  ")
+            is_empty_object = False
+            file.write(json.dumps(key, ensure_ascii=False))
+            file.write(": ")
+            if isinstance(value, Iterator):
+                _write_json_array(file, value)
+            else:
+                text = json.dumps(value, ensure_ascii=False, indent=2)
+                file.write(text.replace("\n", "\n  "))
+        file.write("}\n" if is_empty_object else "\n}\n")
+
+
+def _write_json_array(file: TextIO, values: Iterator[Any]) -> None:
+    file.write("[")
+    is_empty = True
+    for value in values:
+        file.write("\n    " if is_empty else ",\n    ")
+        is_empty = False
+        text = json.dumps(value, ensure_ascii=False, indent=2)
+        file.write(text.replace("\n", "\n    "))
+    file.write("]" if is_empty else "\n  ]")
+
+
 def load_yaml(path: pathlib.Path) -> Optional[Any]:
     if not path.exists():
         return None
     with path.open(encoding="utf-8") as file:
-        return yaml.safe_load(file)
+        return _load_yaml(file)
 
 
 def save_yaml(path: pathlib.Path, data: Any) -> None:
     if not path.parent.exists():
         path.parent.mkdir(parents=True)
     with path.open(mode="w", encoding="utf-8") as file:
-        yaml.dump(
-            data,
-            file,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-        )
+        _dump_yaml(data, file)
+
+
+# PyYAML is imported on first use,
+# LibYAML bindings are used when available, the pure Python ones otherwise
+def _load_yaml(stream: bytes | TextIO) -> Any:
+    yaml = importlib.import_module("yaml")
+    return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def _dump_yaml(data: Any, stream: Optional[TextIO] = None) -> Any:
+    yaml = importlib.import_module("yaml")
+    return yaml.dump(
+        data,
+        stream,
+        Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+        default_flow_style=False,
+        allow_unicode=True,
+        sort_keys=False,
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class Codec:
+    suffix: str
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+    # module imported on first use, None for the standard library
+    module: Optional[str] = None
+
+
+_encodings: dict[str, Codec] = {}
+_compressions: dict[str, Codec] = {}
+
+
+def register_encoding(name: str, codec: Codec) -> None:
+    _encodings[name] = codec
+
+
+def register_compression(name: str, codec: Codec) -> None:
+    _compressions[name] = codec
+
+
+def encoding_names() -> list[str]:
+    return list(_encodings.keys())
+
+
+def compression_names() -> list[str]:
+    return list(_compressions.keys())
+
+
+def missing_encoding_module(name: str) -> Optional[str]:
+    # the module required by the encoding if it is not installed
+    return _missing_module(_encodings[name])
+
+
+def missing_compression_module(name: str) -> Optional[str]:
+    # the module required by the compression if it is not installed
+    return _missing_module(_compressions[name])
+
+
+def _missing_module(codec: Codec) -> Optional[str]:
+    if codec.module is None or importlib.util.find_spec(codec.module) is not None:
+        return None
+    return codec.module
+
+
+def encode(
+    data: Any,
+    *,
+    encoding: str = "json",
+    compression: Optional[str] = None,
+) -> bytes:
+    value = _encodings[encoding].encode(data)
+    if compression is not None:
+        value = _compressions[compression].encode(value)
+    return value
+
+
+def decode(
+    data: bytes,
+    *,
+    encoding: str = "json",
+    compression: Optional[str] = None,
+) -> Any:
+    if compression is not None:
+        data = _compressions[compression].decode(data)
+    return _encodings[encoding].decode(data)
+
+
+def compress(data: bytes, compression: str) -> bytes:
+    return _compressions[compression].encode(data)
+
+
+def encoded_path(
+    path: pathlib.Path,
+    *,
+    encoding: str = "json",
+    compression: Optional[str] = None,
+) -> pathlib.Path:
+    suffix = _encodings[encoding].suffix
+    if compression is not None:
+        suffix += _compressions[compression].suffix
+    return path.with_suffix(suffix)
+
+
+def load_encoded(
+    path: pathlib.Path,
+    *,
+    encoding: str = "json",
+    compression: Optional[str] = None,
+) -> Optional[Any]:
+    if not path.exists():
+        return None
+    return decode(path.read_bytes(), encoding=encoding, compression=compression)
+
+
+def save_encoded(
+    path: pathlib.Path,
+    data: Any,
+    *,
+    encoding: str = "json",
+    compression: Optional[str] = None,
+) -> None:
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True)
+    path.write_bytes(encode(data, encoding=encoding, compression=compression))
+
+
+def _encode_json(data: Any) -> bytes:
+    # same as save_json
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    return f"{text}\n".encode("utf-8")
+
+
+def _encode_yaml(data: Any) -> bytes:
+    # same as save_yaml
+    text: str = _dump_yaml(data)
+    return text.encode("utf-8")
+
+
+def _encode_msgpack(data: Any) -> bytes:
+    return importlib.import_module("msgpack").packb(data)
+
+
+def _decode_msgpack(data: bytes) -> Any:
+    return importlib.import_module("msgpack").unpackb(data)
+
+
+def _encode_cbor(data: Any) -> bytes:
+    return importlib.import_module("cbor2").dumps(data)
+
+
+def _decode_cbor(data: bytes) -> Any:
+    return importlib.import_module("cbor2").loads(data)
+
+
+def _compress_gzip(data: bytes) -> bytes:
+    # fixed mtime for reproducible output
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _compress_brotli(data: bytes) -> bytes:
+    return importlib.import_module("brotli").compress(data)
+
+
+def _decompress_brotli(data: bytes) -> bytes:
+    return importlib.import_module("brotli").decompress(data)
+
+
+# msgpack, cbor2 and brotli are optional (the "formats" extra)
+# and imported on first use
+register_encoding("json", Codec(".json", _encode_json, json.loads))
+register_encoding("yaml", Codec(".yaml", _encode_yaml, _load_yaml, "yaml"))
+register_encoding(
+    "msgpack",
+    Codec(".msgpack", _encode_msgpack, _decode_msgpack, "msgpack"),
+)
+register_encoding("cbor", Codec(".cbor", _encode_cbor, _decode_cbor, "cbor2"))
+register_compression("gzip", Codec(".gz", _compress_gzip, gzip.decompress))
+register_compression(
+    "brotli",
+    Codec(".br", _compress_brotli, _decompress_brotli, "brotli"),
+)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import logging
+import pathlib
+from typing import Any, Iterator, Mapping, Optional
+
+from .io import load_json
+from .types import ResourceByID
+
+# merged data v2:
+#   the same document as v1 except that every ResourceByID is replaced by
+#   an index into the top-level "resources" table
+MERGED_DATA_VERSION = 2
+
+_SERVANT_RESOURCE_LISTS = [
+    "ascension_resources",
+    "skill_resources",
+    "append_skill_resources",
+]
+
+type ResourceKey = tuple[int, tuple[tuple[int, int], ...]]
+
+
+class ResourceTable:
+    def __init__(self) -> None:
+        self._indices: dict[ResourceKey, int] = {}
+        self._resources: list[ResourceByID] = []
+
+    def index(self, resource: ResourceByID) -> int:
+        key = (
+            resource["qp"],
+            tuple((items["id"], items["piece"]) for items in resource["items"]),
+        )
+        index = self._indices.get(key, None)
+        if index is None:
+            index = len(self._resources)
+            self._indices[key] = index
+            self._resources.append(resource)
+        return index
+
+    def resources(self) -> list[ResourceByID]:
+        return self._resources
+
+
+def normalize_servant(
+    servant: dict[str, Any],
+    table: ResourceTable,
+) -> dict[str, Any]:
+    result = dict(servant)
+    result["costumes"] = [
+        {**costume, "resource": table.index(costume["resource"])}
+        for costume in servant["costumes"]
+    ]
+    for key in _SERVANT_RESOURCE_LISTS:
+        result[key] = [table.index(resource) for resource in servant[key]]
+    return result
+
+
+def normalize_sound(
+    sound: dict[str, Any],
+    table: ResourceTable,
+) -> dict[str, Any]:
+    return {**sound, "resource": table.index(sound["resource"])}
+
+
+def normalize_merged_data(data: dict[str, Any]) -> dict[str, Any]:
+    table = ResourceTable()
+    servants = [normalize_servant(servant, table) for servant in data["servants"]]
+    sounds = [normalize_sound(sound, table) for sound in data["sounds"]]
+    return {
+        "version": MERGED_DATA_VERSION,
+        "items": data["items"],
+        "servants": servants,
+        "sounds": sounds,
+        "resources": table.resources(),
+    }
+
+
+def expand_merged_data(data: dict[str, Any]) -> dict[str, Any]:
+    # identical resources are expanded to the same object,
+    # v1 has no version
+    version = data.get("version", 1)
+    if version == 1:
+        return data
+    if version != MERGED_DATA_VERSION:
+        raise ValueError(f"unknown merged data version: {version}")
+    resources: list[ResourceByID] = data["resources"]
+    return {
+        "items": data["items"],
+        "servants": [
+            _expand_servant(servant, resources) for servant in data["servants"]
+        ],
+        "sounds": [
+            {**sound, "resource": resources[sound["resource"]]}
+            for sound in data["sounds"]
+        ],
+    }
+
+
+def _expand_servant(
+    servant: dict[str, Any],
+    resources: list[ResourceByID],
+) -> dict[str, Any]:
+    result = dict(servant)
+    result["costumes"] = [
+        {**costume, "resource": resources[costume["resource"]]}
+        for costume in servant["costumes"]
+    ]
+    for key in _SERVANT_RESOURCE_LISTS:
+        result[key] = [resources[index] for index in servant[key]]
+    return result
+
+
+def servant_resources(
+    servant: Mapping[str, Any],
+) -> Iterator[tuple[str, int, Any]]:
+    # (kind, level, resource) of fgo.Servant or an expanded merged servant:
+    #   kind is "ascension", "skill", "append_skill" or "costume",
+    #   level is 1-based, or the costume ID for costumes
+    for key in _SERVANT_RESOURCE_LISTS:
+        kind = key.removesuffix("_resources")
+        for i, resource in enumerate(servant[key]):
+            yield kind, i + 1, resource
+    for costume in servant["costumes"]:
+        yield "costume", costume["id"], costume["resource"]
+
+
+def load_merged_data(
+    path: pathlib.Path,
+    *,
+    logger: Optional[logging.Logger] = None,
+) -> Optional[dict[str, Any]]:
+    logger = logger or logging.getLogger(__name__)
+    logger.info('load merged data from "%s"', path)
+    data = load_json(path)
+    if data is None:
+        logger.error('failed to load merged data from "%s"', path)
+        return None
+    return expand_merged_data(data)
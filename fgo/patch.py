@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import copy
 import functools
 import logging
 import operator
-from typing import Any, Optional, TypedDict
+import pathlib
+from typing import Any, Iterable, Literal, Optional, TypedDict
+
+from .io import load_json
+from .servant import ServantLogger
+from .types import ServantID
 
 
 class Patch[T](TypedDict):
@@ -51,7 +57,318 @@ def apply_patches(
     patches: list[Patch[Any]],
     *,
     logger: Optional[logging.Logger | logging.LoggerAdapter] = None,
+) -> list[PatchResult]:
+    logger = logger or logging.getLogger(__name__)
+    compiled = CompiledPatches(patches)
+    _log_rejected(compiled, logger)
+    return compiled.apply(data, logger=logger)
+
+
+# applied: before matched and after was set
+# mismatch: the current value is not before
+# not_found: the path does not exist
+# conflict: another patch on the same path has the same before
+#   and a different after
+# shadowed: the same patch exists
+type PatchStatus = Literal["applied", "mismatch", "not_found", "conflict", "shadowed"]
+
+
+class PatchResult(TypedDict):
+    path: list[Any]
+    status: PatchStatus
+
+
+class _PatchNode:
+    # pylint: disable=too-few-public-methods
+    __slots__ = ("children", "patches")
+
+    def __init__(self) -> None:
+        self.children: dict[Any, _PatchNode] = {}
+        # (index in the given patches, patch) on this path
+        self.patches: list[tuple[int, Patch[Any]]] = []
+
+
+class CompiledPatches:
+    # patches of one document grouped by path,
+    # conflicts are detected when compiled and applied in one traversal
+    def __init__(self, patches: Iterable[Patch[Any]]) -> None:
+        self._root = _PatchNode()
+        self.rejected: list[PatchResult] = []
+        for order, patch in enumerate(patches):
+            self._insert(patch, order)
+
+    def apply(
+        self,
+        data: Any,
+        *,
+        logger: Optional[logging.Logger | logging.LoggerAdapter] = None,
+    ) -> list[PatchResult]:
+        # rejected patches are not applied but included in the results
+        logger = logger or logging.getLogger(__name__)
+        results = list(self.rejected)
+        self._apply(self._root, data, results, logger)
+        return results
+
+    def patches(self) -> list[Patch[Any]]:
+        # patches to apply, without rejected ones
+        return list(_node_patches([self._root]))
+
+    def _insert(self, patch: Patch[Any], order: int) -> None:
+        if not patch["path"]:
+            self.rejected.append(PatchResult(path=[], status="not_found"))
+            return
+        node = self._root
+        for key in patch["path"]:
+            node = node.children.setdefault(key, _PatchNode())
+        # patches on the same path are chained like a -> b, b -> c
+        for _, other in node.patches:
+            if other == patch:
+                self.rejected.append(PatchResult(path=patch["path"], status="shadowed"))
+                return
+            if other["before"] == patch["before"]:
+                self.rejected.append(PatchResult(path=patch["path"], status="conflict"))
+                return
+        node.patches.append((order, patch))
+
+    def _apply(
+        self,
+        node: _PatchNode,
+        data: Any,
+        results: list[PatchResult],
+        logger: logging.Logger | logging.LoggerAdapter,
+    ) -> None:
+        for key, child in node.children.items():
+            try:
+                value = data[key]
+            except (IndexError, KeyError, TypeError) as error:
+                for missing in _node_patches([child]):
+                    logger.error(
+                        "failed to apply patch %s with %s(%s)",
+                        ".".join(str(x) for x in missing["path"]),
+                        type(error).__name__,
+                        error,
+                    )
+                    results.append(
+                        PatchResult(path=missing["path"], status="not_found")
+                    )
+                continue
+            if not child.patches:
+                self._apply(child, value, results, logger)
+            elif child.children or len(child.patches) > 1:
+                self._apply_in_order(child, data, results, logger)
+            else:
+                _set_value(data, key, value, child.patches[0][1], results, logger)
+
+    @staticmethod
+    def _apply_in_order(
+        node: _PatchNode,
+        data: Any,
+        results: list[PatchResult],
+        logger: logging.Logger | logging.LoggerAdapter,
+    ) -> None:
+        # chained patches on the same path and patches under a replaced value
+        # are applied one by one in the given order like apply_patch
+        depth = len(node.patches[0][1]["path"]) - 1
+        for _, patch in sorted(_patch_nodes([node]), key=lambda x: x[0]):
+            path = patch["path"][depth:]
+            try:
+                parent = functools.reduce(operator.getitem, path[:-1], data)
+                value = parent[path[-1]]
+            except (IndexError, KeyError, TypeError) as error:
+                logger.error(
+                    "failed to apply patch %s with %s(%s)",
+                    ".".join(str(x) for x in patch["path"]),
+                    type(error).__name__,
+                    error,
+                )
+                results.append(PatchResult(path=patch["path"], status="not_found"))
+                continue
+            _set_value(parent, path[-1], value, patch, results, logger)
+
+
+def _set_value(
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    data: Any,
+    key: Any,
+    value: Any,
+    patch: Patch[Any],
+    results: list[PatchResult],
+    logger: logging.Logger | logging.LoggerAdapter,
+) -> None:
+    if value != patch["before"]:
+        logger.error(
+            'patch %s: before is different. actual="%s", expected="%s"',
+            ".".join(str(x) for x in patch["path"]),
+            value,
+            patch["before"],
+        )
+        results.append(PatchResult(path=patch["path"], status="mismatch"))
+        return
+    logger.debug(
+        'patch %s: apply "%s" -> "%s"',
+        ".".join(str(x) for x in patch["path"]),
+        value,
+        patch["after"],
+    )
+    data[key] = patch["after"]
+    results.append(PatchResult(path=patch["path"], status="applied"))
+
+
+def _patch_nodes(nodes: Iterable[_PatchNode]) -> Iterable[tuple[int, Patch[Any]]]:
+    # (order, patch)
+    for node in nodes:
+        yield from node.patches
+        yield from _patch_nodes(node.children.values())
+
+
+def _node_patches(nodes: Iterable[_PatchNode]) -> Iterable[Patch[Any]]:
+    for _, patch in _patch_nodes(nodes):
+        yield patch
+
+
+def compile_patch_set(
+    patches: dict[ServantID, list[Patch[Any]]],
+    *,
+    logger: Optional[logging.Logger] = None,
+) -> dict[ServantID, CompiledPatches]:
+    # conflicts are reported here, before any servant is patched
+    logger = logger or logging.getLogger(__name__)
+    compiled_patches: dict[ServantID, CompiledPatches] = {}
+    for servant_id, servant_patches in patches.items():
+        compiled = CompiledPatches(servant_patches)
+        _log_rejected(compiled, logger, prefix=f"{servant_id:03d} ")
+        compiled_patches[servant_id] = compiled
+    return compiled_patches
+
+
+def _log_rejected(
+    compiled: CompiledPatches,
+    logger: logging.Logger | logging.LoggerAdapter,
+    *,
+    prefix: str = "",
 ) -> None:
+    for result in compiled.rejected:
+        logger.error(
+            "patch %s%s: %s",
+            prefix,
+            ".".join(str(x) for x in result["path"]),
+            result["status"],
+        )
+
+
+def apply_patch_set(
+    servants: Iterable[Any],
+    patches: dict[ServantID, CompiledPatches],
+    *,
+    logger: Optional[logging.Logger] = None,
+) -> dict[ServantID, list[PatchResult]]:
+    # patches of servants that are not given are reported as not_found
+    logger = logger or logging.getLogger(__name__)
+    report: dict[ServantID, list[PatchResult]] = {}
+    for servant in servants:
+        compiled = patches.get(servant["id"], None)
+        if compiled is not None:
+            report[servant["id"]] = compiled.apply(
+                servant,
+                logger=ServantLogger(logger, servant["id"], servant["name"]),
+            )
+    for servant_id, compiled in patches.items():
+        if servant_id not in report:
+            logger.error("servant %03d to patch is not found", servant_id)
+            report[servant_id] = [
+                PatchResult(path=patch["path"], status="not_found")
+                for patch in compiled.patches()
+            ] + compiled.rejected
+    return report
+
+
+def unpatched_directory(directory: pathlib.Path) -> pathlib.Path:
+    # servants are also saved here before the patches are applied,
+    # data/servant -> data/cache/unpatched/servant
+    root, *parts = directory.parts
+    return pathlib.Path(root, "cache", "unpatched", *parts)
+
+
+# state of a patch against unpatched data and the patches before it:
+# applied: the value is before, the patch is still needed
+# already_fixed: the value is already after
+# stale: the path is missing or the value is neither before nor after
+type PatchState = Literal["applied", "already_fixed", "stale"]
+
+
+class PatchAnalysis(TypedDict):
+    path: list[Any]
+    state: PatchState
+
+
+def analyze_patches(
+    data: Any,
+    patches: list[Patch[Any]],
+) -> list[PatchAnalysis]:
+    # patches are classified in the given order like apply_patch,
+    # so chained and nested patches see the values set by the earlier ones
+    data = copy.deepcopy(data)
+    return [
+        PatchAnalysis(path=patch["path"], state=_patch_state(data, patch))
+        for patch in patches
+    ]
+
+
+def analyze_patch_set(
+    servants: Iterable[Any],
+    patches: dict[ServantID, list[Patch[Any]]],
+) -> dict[ServantID, list[PatchAnalysis]]:
+    # patches of servants that are not given are stale
+    index = {servant["id"]: servant for servant in servants}
+    return {
+        servant_id: analyze_patches(index.get(servant_id, None), servant_patches)
+        for servant_id, servant_patches in patches.items()
+    }
+
+
+def prune_patch_set(
+    patches: dict[ServantID, list[Patch[Any]]],
+    analysis: dict[ServantID, list[PatchAnalysis]],
+) -> dict[ServantID, list[Patch[Any]]]:
+    # keeps only patches that are still applied
+    pruned: dict[ServantID, list[Patch[Any]]] = {}
+    for servant_id, servant_patches in patches.items():
+        kept = [
+            patch
+            for patch, result in zip(servant_patches, analysis[servant_id])
+            if result["state"] == "applied"
+        ]
+        if kept:
+            pruned[servant_id] = kept
+    return pruned
+
+
+def _patch_state(data: Any, patch: Patch[Any]) -> PatchState:
+    # an applied patch sets after in data
+    if not patch["path"]:
+        return "stale"
+    try:
+        parent = functools.reduce(operator.getitem, patch["path"][:-1], data)
+        value = parent[patch["path"][-1]]
+    except (IndexError, KeyError, TypeError):
+        return "stale"
+    if value == patch["before"]:
+        parent[patch["path"][-1]] = copy.deepcopy(patch["after"])
+        return "applied"
+    if value == patch["after"]:
+        return "already_fixed"
+    return "stale"
+
+
+def load_patches(
+    path: pathlib.Path,
+    *,
+    logger: Optional[logging.Logger] = None,
+) -> Optional[dict[ServantID, list[Patch[Any]]]]:
     logger = logger or logging.getLogger(__name__)
-    for patch in patches:
-        apply_patch(data, patch, logger=logger)
+    logger.info('load patch from "%s"', path)
+    data = load_json(path)
+    if data is None:
+        logger.error('failed to load patch from "%s"', path)
+        return None
+    return {int(servant_id): patches for servant_id, patches in data.items()}
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import logging
+from typing import Optional, TypedDict
+
+import numpy as np
+import numpy.typing as npt
+
+from .item import ItemNameConverter
+from .types import (
+    Item,
+    ItemID,
+    ItemsByID,
+    Resource,
+    ResourceByID,
+    Servant,
+    ServantID,
+)
+
+# level columns of a roster:
+#   0: ascension (0-4), 1-3: skills (1-10), 4-8: append skills (0-10)
+# append skill level 0 means locked, unlocking it is not counted
+LEVEL_COLUMNS = 9
+_KINDS = np.array([0, 1, 1, 1, 2, 2, 2, 2, 2])
+_MIN_LEVELS = np.array([0, 1, 1, 1, 0, 0, 0, 0, 0])
+_MAX_LEVELS = np.array([4, 10, 10, 10, 10, 10, 10, 10, 10])
+# first level of each kind
+_BASE_LEVELS = [0, 1, 1]
+_MAX_LEVEL = 10
+
+type IntArray = npt.NDArray[np.int64]
+type Int32Array = npt.NDArray[np.int32]
+
+
+class Levels(TypedDict):
+    ascension: int
+    skills: list[int]
+    append_skills: list[int]
+
+
+class RosterEntry(TypedDict):
+    servant_id: ServantID
+    current: Levels
+    target: Levels
+
+
+class Requirement(TypedDict):
+    qp: int
+    items: list[ItemsByID]
+
+
+class ServantAggregate(TypedDict):
+    ascension: ResourceByID
+    skills: ResourceByID
+    append_skills: ResourceByID
+    total: ResourceByID
+
+
+class MaterialAggregates(TypedDict):
+    # keyed by servant ID and item ID
+    servants: dict[str, ServantAggregate]
+    items: dict[str, int]
+    qp: int
+
+
+class MaterialPlanner:
+    def __init__(
+        self,
+        servants: list[Servant],
+        items: list[Item],
+        *,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._logger = logger or logging.getLogger(__name__)
+        self._item_ids: IntArray = np.array([item["id"] for item in items])
+        self._servant_ids: IntArray = np.array([servant["id"] for servant in servants])
+        self._servant_index = {servant["id"]: i for i, servant in enumerate(servants)}
+        # cumulative requirement from the first level:
+        #   [servant, kind, level, item], [servant, kind, level]
+        shape = (len(servants), 3, _MAX_LEVEL + 1)
+        # int32 halves the memory traffic of the gathers in evaluate
+        self._items: Int32Array = np.zeros((*shape, len(items)), dtype=np.int32)
+        self._qp: IntArray = np.zeros(shape, dtype=np.int64)
+        self._compile(servants, items)
+
+    @property
+    def item_ids(self) -> IntArray:
+        return self._item_ids
+
+    @property
+    def servant_ids(self) -> IntArray:
+        return self._servant_ids
+
+    def servant_indices(self, servant_ids: npt.ArrayLike) -> IntArray:
+        return np.vectorize(self._servant_index.__getitem__, otypes=[np.int64])(
+            servant_ids
+        )
+
+    def evaluate(
+        self,
+        servants: npt.ArrayLike,
+        current: npt.ArrayLike,
+        target: npt.ArrayLike,
+    ) -> tuple[IntArray, IntArray]:
+        # servants: servant indices [..., N]
+        # current, target: levels [..., N, LEVEL_COLUMNS]
+        # returns the item counts [..., item] and QP [...] summed over N
+        servant_array = np.asarray(servants, dtype=np.int64)
+        current_array = np.asarray(current, dtype=np.int64)
+        target_array = np.maximum(np.asarray(target, dtype=np.int64), current_array)
+        for levels in (current_array, target_array):
+            if levels.shape != (*servant_array.shape, LEVEL_COLUMNS):
+                raise ValueError(f"unexpected shape of levels: {levels.shape}")
+            if np.any(levels < _MIN_LEVELS) or np.any(levels > _MAX_LEVELS):
+                raise ValueError("levels are out of range")
+        items = np.zeros((*servant_array.shape[:-1], len(self._item_ids)), np.int64)
+        qp = np.zeros(servant_array.shape[:-1], np.int64)
+        for column in range(LEVEL_COLUMNS):
+            kind = _KINDS[column]
+            begin = current_array[..., column]
+            end = target_array[..., column]
+            items += (
+                self._items[servant_array, kind, end]
+                - self._items[servant_array, kind, begin]
+            ).sum(axis=-2, dtype=np.int64)
+            qp += (
+                self._qp[servant_array, kind, end]
+                - self._qp[servant_array, kind, begin]
+            ).sum(axis=-1)
+        return items, qp
+
+    def plan(self, roster: list[RosterEntry]) -> Requirement:
+        shape = (len(roster), LEVEL_COLUMNS)
+        items, qp = self.evaluate(
+            self.servant_indices([entry["servant_id"] for entry in roster]),
+            np.reshape([_to_columns(entry["current"]) for entry in roster], shape),
+            np.reshape([_to_columns(entry["target"]) for entry in roster], shape),
+        )
+        return Requirement(
+            qp=int(qp),
+            items=[
+                ItemsByID(id=int(self._item_ids[i]), piece=int(items[i]))
+                for i in np.flatnonzero(items)
+            ],
+        )
+
+    def aggregate(self) -> MaterialAggregates:
+        # requirement from the first level to the max level of every servant,
+        # evaluated for all servants at once per kind
+        servants = np.arange(len(self._servant_ids))[:, np.newaxis]
+        shape = (len(self._servant_ids), 1, LEVEL_COLUMNS)
+        current = np.broadcast_to(_MIN_LEVELS, shape)
+        kinds = {
+            name: self.evaluate(
+                servants,
+                current,
+                np.broadcast_to(
+                    np.where(_KINDS == kind, _MAX_LEVELS, _MIN_LEVELS), shape
+                ),
+            )
+            for kind, name in enumerate(["ascension", "skills", "append_skills"])
+        }
+        items, qp = self.evaluate(
+            servants,
+            current,
+            np.broadcast_to(_MAX_LEVELS, shape),
+        )
+        return MaterialAggregates(
+            servants={
+                str(servant_id): ServantAggregate(
+                    ascension=self._to_resource(*kinds["ascension"], i),
+                    skills=self._to_resource(*kinds["skills"], i),
+                    append_skills=self._to_resource(*kinds["append_skills"], i),
+                    total=self._to_resource(items, qp, i),
+                )
+                for i, servant_id in enumerate(self._servant_ids.tolist())
+            },
+            items={
+                str(self._item_ids[i]): int(piece)
+                for i, piece in enumerate(items.sum(axis=0))
+                if piece
+            },
+            qp=int(qp.sum()),
+        )
+
+    def _to_resource(self, items: IntArray, qp: IntArray, servant: int) -> ResourceByID:
+        return ResourceByID(
+            qp=int(qp[servant]),
+            items=[
+                ItemsByID(id=int(self._item_ids[i]), piece=int(items[servant, i]))
+                for i in np.flatnonzero(items[servant])
+            ],
+        )
+
+    def _compile(self, servants: list[Servant], items: list[Item]) -> None:
+        item_index = {item["id"]: i for i, item in enumerate(items)}
+        converter = ItemNameConverter(
+            {item["name"]: item["id"] for item in items},
+            logger=self._logger,
+        )
+        for i, servant in enumerate(servants):
+            resources = [
+                servant["ascension_resources"],
+                servant["skill_resources"],
+                servant["append_skill_resources"],
+            ]
+            for kind, resource_list in enumerate(resources):
+                self._compile_resources(
+                    i,
+                    kind,
+                    resource_list,
+                    converter,
+                    item_index,
+                )
+        # level -> cumulative requirement from the first level
+        np.cumsum(self._items, axis=2, out=self._items)
+        np.cumsum(self._qp, axis=2, out=self._qp)
+
+    def _compile_resources(
+        self,
+        servant: int,
+        kind: int,
+        resources: list[Resource],
+        converter: ItemNameConverter,
+        item_index: dict[ItemID, int],
+    ) -> None:
+        # step from level (base + j) to (base + j + 1) is stored at base + j + 1
+        base = _BASE_LEVELS[kind]
+        for j, resource in enumerate(resources[: _MAX_LEVEL - base]):
+            level = base + j + 1
+            self._qp[servant, kind, level] = resource["qp"]
+            value = converter.resource(resource)
+            if value is None:
+                continue
+            for items in value["items"]:
+                index = item_index[items["id"]]
+                self._items[servant, kind, level, index] += items["piece"]
+
+
+def _to_columns(levels: Levels) -> list[int]:
+    return [levels["ascension"], *levels["skills"], *levels["append_skills"]]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import contextlib
+import copy
+import json
+import logging
+import pathlib
+from typing import Iterator, Optional, TypedDict
+
+from .servant import ServantLogger, ServantMessage
+
+
+class CachedRecord(TypedDict):
+    level: int
+    # without the servant prefix
+    message: str
+    # extra fields of ServantLogger
+    servant_id: Optional[int]
+    servant_name: Optional[str]
+
+
+class RecordCollector(logging.Handler):
+    # keeps records to pass them across processes or to log them later
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # format arguments here, they may not be picklable,
+        # the copy leaves the record as is for the other handlers
+        record = copy.copy(record)
+        if isinstance(record.msg, ServantMessage):
+            record.msg = ServantMessage(record.msg.prefix, _raw_message(record))
+        else:
+            record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.records.append(record)
+
+
+@contextlib.contextmanager
+def collect_records(
+    logger: logging.Logger,
+    *,
+    level: int = logging.NOTSET,
+) -> Iterator[RecordCollector]:
+    # records of the logger while the context is active,
+    # the other handlers receive them as well
+    handler = RecordCollector()
+    handler.setLevel(level)
+    logger.addHandler(handler)
+    try:
+        yield handler
+    finally:
+        logger.removeHandler(handler)
+
+
+def collecting_logger(name: str, handler: RecordCollector) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.handlers = [handler]
+    return logger
+
+
+def replay_records(
+    records: list[logging.LogRecord],
+    logger: logging.Logger,
+) -> None:
+    for record in records:
+        if logger.isEnabledFor(record.levelno):
+            record.name = logger.name
+            logger.handle(record)
+
+
+def cache_records(
+    records: list[logging.LogRecord],
+    *,
+    level: int = logging.WARNING,
+) -> list[CachedRecord]:
+    # JSON-serializable records to be replayed on a cache hit
+    return [
+        CachedRecord(
+            level=record.levelno,
+            message=_raw_message(record),
+            servant_id=getattr(record, "servant_id", None),
+            servant_name=getattr(record, "servant_name", None),
+        )
+        for record in records
+        if record.levelno >= level
+    ]
+
+
+def replay_cached_records(
+    records: list[CachedRecord],
+    logger: logging.Logger,
+) -> None:
+    # servant records go through ServantLogger again,
+    # so they keep the prefix and the extra fields
+    for record in records:
+        if record["servant_id"] is None:
+            logger.log(record["level"], "%s", record["message"])
+        else:
+            ServantLogger(
+                logger,
+                record["servant_id"],
+                record["servant_name"] or "",
+            ).log(record["level"], "%s", record["message"])
+
+
+def _raw_message(record: logging.LogRecord) -> str:
+    # the message with its arguments, without the servant prefix
+    message = record.msg
+    if isinstance(message, ServantMessage):
+        message = message.message
+    text = str(message)
+    if record.args:
+        text = text % record.args
+    return text
+
+
+class JsonLinesFormatter(logging.Formatter):
+    # one JSON object per record, the servant is a field
+    # instead of the message prefix
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": _raw_message(record),
+        }
+        for key in ("servant_id", "servant_name"):
+            if hasattr(record, key):
+                data[key] = getattr(record, key)
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+def json_lines_handler(
+    path: pathlib.Path,
+    *,
+    level: int = logging.NOTSET,
+) -> logging.FileHandler:
+    # appends to the file so that several runs can share it
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True)
+    handler = logging.FileHandler(path, mode="a", encoding="utf-8", delay=True)
+    handler.setLevel(level)
+    handler.formatter = JsonLinesFormatter()
+    return handler
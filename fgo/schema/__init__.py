@@ -1,4 +1,5 @@
 from __future__ import annotations
 
+from .compiler import SchemaError, SchemaValidator, compile_schema, schema_source
 from .enum import item, klass
 from .servant import servant
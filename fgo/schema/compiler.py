@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+from typing import Any, Callable, NamedTuple
+
+# supported subset of JSON Schema, the generated code reports the same errors
+# as jsonschema iter_errors in the same order
+_KEYWORDS = {
+    "type",
+    "enum",
+    "properties",
+    "required",
+    "additionalProperties",
+    "items",
+    "minItems",
+    "maxItems",
+    "minimum",
+    "maximum",
+    "oneOf",
+}
+
+# JSON type -> Python expression with "{}" as the value
+_TYPE_CHECKS = {
+    "null": "{} is None",
+    "boolean": "isinstance({}, bool)",
+    "integer": (
+        "(isinstance({0}, int) and not isinstance({0}, bool)"
+        " or isinstance({0}, float) and {0}.is_integer())"
+    ),
+    "number": "(isinstance({0}, (int, float)) and not isinstance({0}, bool))",
+    "string": "isinstance({}, str)",
+    "array": "isinstance({}, list)",
+    "object": "isinstance({}, dict)",
+}
+
+
+class SchemaError(NamedTuple):
+    path: tuple[str | int, ...]
+    keyword: str
+    message: str
+
+    @property
+    def json_path(self) -> str:
+        return "$" + "".join(
+            f"[{key}]" if isinstance(key, int) else f".{key}" for key in self.path
+        )
+
+
+type SchemaValidator = Callable[[Any], list[SchemaError]]
+
+
+def compile_schema(schema: dict[str, Any]) -> SchemaValidator:
+    generator = _Generator()
+    source = generator.source(schema)
+    namespace = {**generator.constants, "_error": _error}
+    exec(compile(source, "<schema>", "exec"), namespace)  # pylint: disable=exec-used
+    validate: SchemaValidator = namespace["validate"]
+    return validate
+
+
+def schema_source(schema: dict[str, Any]) -> str:
+    # generated code for debugging, constants are not included
+    return _Generator().source(schema)
+
+
+class _Generator:  # pylint: disable=too-few-public-methods
+    def __init__(self) -> None:
+        self.constants: dict[str, Any] = {}
+        self._constant_names: dict[str, str] = {}
+        self._branches: list[list[str]] = []
+
+    def source(self, schema: dict[str, Any]) -> str:
+        body = self._node(schema, "v0", [], 1)
+        lines = [
+            "def validate(v0):",
+            "    errors = []",
+            *body,
+            "    return errors",
+        ]
+        for branch in self._branches:
+            lines.extend(["", *branch])
+        return "\n".join(lines) + "\n"
+
+    def _constant(self, value: Any) -> str:
+        key = repr(value)
+        name = self._constant_names.get(key, None)
+        if name is None:
+            name = f"C{len(self._constant_names)}"
+            self._constant_names[key] = name
+            self.constants[name] = value
+        return name
+
+    def _node(
+        self,
+        schema: dict[str, Any],
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        unknown = schema.keys() - _KEYWORDS
+        if unknown:
+            raise ValueError(f"unsupported keywords: {sorted(unknown)}")
+        lines: list[str] = []
+        for keyword, value in schema.items():
+            lines.extend(getattr(self, f"_{keyword}")(schema, value, var, path, indent))
+        return lines
+
+    def _emit(
+        self,
+        indent: int,
+        path: list[str],
+        keyword: str,
+        var: str,
+        argument: str = "None",
+    ) -> str:
+        path_tuple = f"({', '.join(path)},)" if path else "()"
+        return (
+            "    " * indent
+            + f"errors.append(_error({path_tuple}, {keyword!r}, {var}, {argument}))"
+        )
+
+    def _type(
+        self,
+        _schema: dict[str, Any],
+        value: str | list[str],
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        types = value if isinstance(value, list) else [value]
+        condition = " or ".join(_TYPE_CHECKS[name].format(var) for name in types)
+        return [
+            "    " * indent + f"if not ({condition}):",
+            self._emit(indent + 1, path, "type", var, self._constant(types)),
+        ]
+
+    def _enum(
+        self,
+        _schema: dict[str, Any],
+        value: list[Any],
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        # frozenset membership matches jsonschema only for strings,
+        # jsonschema does not treat True and 1 as equal
+        if not all(isinstance(x, str) for x in value):
+            raise ValueError("enum supports only strings")
+        members = self._constant(frozenset(value))
+        condition = f"not (isinstance({var}, str) and {var} in {members})"
+        return [
+            "    " * indent + f"if {condition}:",
+            self._emit(indent + 1, path, "enum", var, self._constant(value)),
+        ]
+
+    def _properties(
+        self,
+        _schema: dict[str, Any],
+        value: dict[str, Any],
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        child = self._child(var)
+        lines = ["    " * indent + f"if {_TYPE_CHECKS['object'].format(var)}:"]
+        for name, subschema in value.items():
+            lines.extend(
+                [
+                    "    " * (indent + 1) + f"if {name!r} in {var}:",
+                    "    " * (indent + 2) + f"{child} = {var}[{name!r}]",
+                    *self._node(subschema, child, [*path, repr(name)], indent + 2),
+                ]
+            )
+        if len(lines) == 1:
+            lines.append("    " * (indent + 1) + "pass")
+        return lines
+
+    def _required(
+        self,
+        _schema: dict[str, Any],
+        value: list[str],
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        lines = ["    " * indent + f"if {_TYPE_CHECKS['object'].format(var)}:"]
+        for name in value:
+            lines.extend(
+                [
+                    "    " * (indent + 1) + f"if {name!r} not in {var}:",
+                    self._emit(indent + 2, path, "required", repr(name)),
+                ]
+            )
+        if len(lines) == 1:
+            lines.append("    " * (indent + 1) + "pass")
+        return lines
+
+    def _additionalProperties(  # pylint: disable=invalid-name
+        self,
+        schema: dict[str, Any],
+        value: bool,
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        if value is not False:
+            raise ValueError("additionalProperties supports only false")
+        names = self._constant(frozenset(schema.get("properties", {})))
+        return [
+            "    " * indent + f"if {_TYPE_CHECKS['object'].format(var)}:",
+            "    " * (indent + 1) + f"extras = {var}.keys() - {names}",
+            "    " * (indent + 1) + "if extras:",
+            self._emit(indent + 2, path, "additionalProperties", "extras"),
+        ]
+
+    def _items(
+        self,
+        _schema: dict[str, Any],
+        value: dict[str, Any],
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        child = self._child(var)
+        index = child.replace("v", "i", 1)
+        body = self._node(value, child, [*path, index], indent + 2)
+        return [
+            "    " * indent + f"if {_TYPE_CHECKS['array'].format(var)}:",
+            "    " * (indent + 1) + f"for {index}, {child} in enumerate({var}):",
+            *(body or ["    " * (indent + 2) + "pass"]),
+        ]
+
+    def _minItems(  # pylint: disable=invalid-name
+        self,
+        _schema: dict[str, Any],
+        value: int,
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        return [
+            "    " * indent
+            + f"if {_TYPE_CHECKS['array'].format(var)} and len({var}) < {value}:",
+            self._emit(indent + 1, path, "minItems", var, repr(value)),
+        ]
+
+    def _maxItems(  # pylint: disable=invalid-name
+        self,
+        _schema: dict[str, Any],
+        value: int,
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        return [
+            "    " * indent
+            + f"if {_TYPE_CHECKS['array'].format(var)} and len({var}) > {value}:",
+            self._emit(indent + 1, path, "maxItems", var, repr(value)),
+        ]
+
+    def _minimum(
+        self,
+        _schema: dict[str, Any],
+        value: int | float,
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        return [
+            "    " * indent
+            + f"if {_TYPE_CHECKS['number'].format(var)} and {var} < {value!r}:",
+            self._emit(indent + 1, path, "minimum", var, repr(value)),
+        ]
+
+    def _maximum(
+        self,
+        _schema: dict[str, Any],
+        value: int | float,
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        return [
+            "    " * indent
+            + f"if {_TYPE_CHECKS['number'].format(var)} and {var} > {value!r}:",
+            self._emit(indent + 1, path, "maximum", var, repr(value)),
+        ]
+
+    def _oneOf(  # pylint: disable=invalid-name
+        self,
+        _schema: dict[str, Any],
+        value: list[dict[str, Any]],
+        var: str,
+        path: list[str],
+        indent: int,
+    ) -> list[str]:
+        # each branch is a function that returns whether the value is valid
+        names: list[str] = []
+        for subschema in value:
+            name = f"_branch_{len(self._branches)}"
+            self._branches.append(
+                [
+                    f"def {name}(v0):",
+                    "    errors = []",
+                    *self._node(subschema, "v0", [], 1),
+                    "    return not errors",
+                ]
+            )
+            names.append(name)
+        valid = self._child(var).replace("v", "n", 1)
+        schemas = self._constant(value)
+        return [
+            "    " * indent
+            + f"{valid} = [i for i, f in enumerate(({', '.join(names)},)) if f({var})]",
+            "    " * indent + f"if len({valid}) != 1:",
+            self._emit(indent + 1, path, "oneOf", var, f"({valid}, {schemas})"),
+        ]
+
+    @staticmethod
+    def _child(var: str) -> str:
+        return f"v{int(var[1:]) + 1}"
+
+
+def _error(
+    path: tuple[str | int, ...],
+    keyword: str,
+    value: Any,
+    argument: Any,
+) -> SchemaError:
+    # the same messages as jsonschema
+    match keyword:
+        case "type":
+            reprs = ", ".join(repr(name) for name in argument)
+            message = f"{value!r} is not of type {reprs}"
+        case "enum":
+            message = f"{value!r} is not one of {argument!r}"
+        case "required":
+            message = f"{value!r} is a required property"
+        case "additionalProperties":
+            extras = sorted(value, key=str)
+            verb = "was" if len(extras) == 1 else "were"
+            joined = ", ".join(repr(extra) for extra in extras)
+            message = (
+                f"Additional properties are not allowed ({joined} {verb} unexpected)"
+            )
+        case "minItems":
+            reason = "should be non-empty" if argument == 1 else "is too short"
+            message = f"{value!r} {reason}"
+        case "maxItems":
+            reason = "is expected to be empty" if argument == 0 else "is too long"
+            message = f"{value!r} {reason}"
+        case "minimum":
+            message = f"{value!r} is less than the minimum of {argument!r}"
+        case "maximum":
+            message = f"{value!r} is greater than the maximum of {argument!r}"
+        case "oneOf":
+            valid, schemas = argument
+            if not valid:
+                message = f"{value!r} is not valid under any of the given schemas"
+            else:
+                # jsonschema lists the other valid schemas before the first one
+                reprs = ", ".join(repr(schemas[i]) for i in [*valid[1:], valid[0]])
+                message = f"{value!r} is valid under each of {reprs}"
+        case _:
+            message = f"{value!r} is not valid under {keyword}"
+    return SchemaError(path, keyword, message)
@@ -3,10 +3,10 @@ from __future__ import annotations
 import logging
 import pathlib
 import re
-from typing import Any, MutableMapping, Optional
+from typing import Any, Iterator, MutableMapping, Optional
 
 from .io import load_json
-from .types import CostumeData, Servant, ServantLink, ServantName
+from .types import CostumeData, Servant, ServantID, ServantLink, ServantName
 
 
 def load_servants(
@@ -14,29 +14,45 @@ def load_servants(
     *,
     logger: Optional[logging.Logger] = None,
 ) -> list[Servant]:
+    servants = list(iterate_servants(directory, logger=logger))
+    # sort by servant ID
+    servants.sort(key=lambda servant: servant["id"])
+    return servants
+
+
+def iterate_servants(
+    directory: pathlib.Path,
+    *,
+    logger: Optional[logging.Logger] = None,
+) -> Iterator[Servant]:
     logger = logger or logging.getLogger(__name__)
-    servants: list[Servant] = []
-    pattern = re.compile(r"^(?P<id>[0-9]{3}).json$")
-    for file in directory.iterdir():
-        if not file.is_file():
-            continue
-        match = pattern.match(file.name)
-        if match is None:
-            continue
+    for servant_id, file in servant_files(directory):
         servant = load_servant(file, logger=logger)
         if servant is None:
             continue
         # check if filename match servant ID
-        if int(match.group("id")) != servant["id"]:
+        if servant_id != servant["id"]:
             logger.error(
                 'file name mismatch servant ID: path="%s", servant_id=%d',
                 file,
                 servant["id"],
             )
-        servants.append(servant)
-    # sort by servant ID
-    servants.sort(key=lambda servant: servant["id"])
-    return servants
+        yield servant
+
+
+def servant_files(directory: pathlib.Path) -> list[tuple[ServantID, pathlib.Path]]:
+    pattern = re.compile(r"^(?P<id>[0-9]{3}).json$")
+    files: list[tuple[ServantID, pathlib.Path]] = []
+    for file in directory.iterdir():
+        if not file.is_file():
+            continue
+        match = pattern.match(file.name)
+        if match is None:
+            continue
+        files.append((int(match.group("id")), file))
+    # sort by the servant ID in the file name
+    files.sort()
+    return files
 
 
 def load_servant(
@@ -115,20 +131,47 @@ def unplayable_servant_ids() -> list[int]:
     ]
 
 
+class ServantMessage:  # pylint: disable=too-few-public-methods
+    # "[NNN: name] message", joined only when a handler formats the record
+    __slots__ = ("prefix", "message")
+
+    def __init__(self, prefix: str, message: Any) -> None:
+        self.prefix = prefix
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"{self.prefix}{self.message}"
+
+
 class ServantLogger(logging.LoggerAdapter):
+    # the servant is attached to records as the extra fields
+    # servant_id and servant_name
     def __init__(
         self,
         logger: logging.Logger,
         servant_id: int,
         servant_name: str,
     ) -> None:
-        super().__init__(logger)
-        self._id = servant_id
-        self._name = servant_name
+        super().__init__(
+            logger,
+            {"servant_id": servant_id, "servant_name": servant_name},
+        )
+        self._prefix = f"[{servant_id:03d}: {servant_name}] "
+
+    def debug(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        # parsers log per cell and per item,
+        # disabled debug calls return before LoggerAdapter.log
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.log(logging.DEBUG, msg, *args, **kwargs)
 
     def process(
         self,
         msg: Any,
         kwargs: MutableMapping[str, Any],
     ) -> tuple[Any, MutableMapping[str, Any]]:
-        return super().process(f"[{self._id:03d}: {self._name}] {msg}", kwargs)
+        # called only for enabled levels
+        extra = kwargs.get("extra", None)
+        kwargs["extra"] = (
+            self.extra if extra is None else {**(self.extra or {}), **extra}
+        )
+        return ServantMessage(self._prefix, msg), kwargs
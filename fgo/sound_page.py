@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import Optional
+
+import lxml.etree
+import lxml.html
+import requests
+
+from .sound import Sound
+from .types import Items, Resource
+
+_logger = logging.getLogger(__name__)
+
+SOUND_URL = "https://kamigame.jp/fgo/初心者攻略/サウンドプレイヤー.html"
+_SOURCES = ["Part1", "Part1_5", "Part2", "Event"]
+# compiled once, the page has hundreds of rows
+_TABLE_XPATH = lxml.etree.XPath('//table[starts-with(@class, "wt")]')
+_ROW_XPATH = lxml.etree.XPath("tbody/tr")
+_CELL_XPATH = lxml.etree.XPath("td")
+_IMAGE_XPATH = lxml.etree.XPath("span/a/img")
+_PIECE_PATTERN = re.compile(r"[0-9]+(?=個)")
+
+
+def sound_list(
+    *,
+    session: Optional[requests.Session] = None,
+    timeout: float = 10.0,
+) -> list[Sound]:
+    response = (session or requests).get(SOUND_URL, timeout=timeout)
+    return parse_sounds(response.content)
+
+
+def parse_sounds(content: bytes) -> list[Sound]:
+    result: list[Sound] = []
+    etree = lxml.html.fromstring(content)
+    for i, table in enumerate(_TABLE_XPATH(etree)):
+        source = _SOURCES[i]
+        for k, row in enumerate(_ROW_XPATH(table)):
+            sound = _parse_sound(source, k, row)
+            if sound is not None:
+                _logger.info(
+                    'sound: %s, %d, "%s"',
+                    sound["source"],
+                    sound["index"],
+                    sound["title"],
+                )
+                result.append(sound)
+    return result
+
+
+def _parse_sound(
+    source: str, index: int, row: lxml.html.HtmlElement
+) -> Optional[Sound]:
+    cells = _CELL_XPATH(row)
+    if len(cells) < 2:
+        _logger.error("parse failed: %s, %d", source, index)
+        return None
+    return Sound(
+        source=source,
+        index=index,
+        title=cells[1].text_content().strip(),
+        resource=_parse_resource(cells[2]),
+    )
+
+
+def _parse_resource(cell: lxml.html.HtmlElement) -> Resource:
+    items: list[Items] = []
+    img = _IMAGE_XPATH(cell)
+    if img:
+        item = img[0].get("alt").strip()
+        piece_match = _PIECE_PATTERN.match(cell.text_content())
+        if piece_match is None:
+            _logger.error("piece match failed %s", cell.text_content())
+        piece = int(piece_match.group()) if piece_match is not None else -1
+        _logger.debug("resource: %s x %d", item, piece)
+        items.append(Items(name=item, piece=piece))
+    else:
+        _logger.debug("resource: none")
+    return Resource(qp=0, items=items)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import functools
+import logging
+import pathlib
+from typing import Any, Iterator, Optional
+
+from . import english
+from .item import load_items
+from .patch import Patch, load_patches
+from .servant import (
+    load_costumes,
+    load_servant,
+    load_servant_links,
+    load_servant_names,
+    servant_files,
+)
+from .sound import Sound, load_sounds
+from .text import load_item_dictionary, load_servant_dictionary
+from .types import (
+    CostumeData,
+    Dictionary,
+    Item,
+    ItemDictionary,
+    Servant,
+    ServantDictionary,
+    ServantID,
+    ServantLink,
+    ServantName,
+)
+
+
+class DataStore:
+    # every dataset is loaded on the first access and kept for later access,
+    # failed loads are kept as None (or an empty list) as well
+    def __init__(
+        self,
+        directory: pathlib.Path = pathlib.Path("data"),
+        *,
+        keep_servants: bool = True,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.directory = directory
+        # servant files are loaded one by one and kept unless keep_servants is
+        # False, which lets a single consumer stream them
+        self._keep_servants = keep_servants
+        self._servants: dict[pathlib.Path, Optional[Servant]] = {}
+        self._logger = logger or logging.getLogger(__name__)
+
+    @property
+    def servant_directory(self) -> pathlib.Path:
+        return self.directory.joinpath("servant")
+
+    @property
+    def english_servant_directory(self) -> pathlib.Path:
+        return self.directory.joinpath("english/servant")
+
+    @functools.cached_property
+    def items(self) -> Optional[list[Item]]:
+        return load_items(
+            self.directory.joinpath("items.json"),
+            logger=self._logger,
+        )
+
+    @functools.cached_property
+    def servants(self) -> list[Servant]:
+        servants = list(self.iterate_servants())
+        servants.sort(key=lambda servant: servant["id"])
+        return servants
+
+    def iterate_servants(self) -> Iterator[Servant]:
+        if "servants" in self.__dict__:
+            yield from self.servants
+            return
+        for servant_id, path in servant_files(self.servant_directory):
+            servant = self.servant(path)
+            if servant is None:
+                continue
+            # check if filename match servant ID
+            if servant_id != servant["id"]:
+                self._logger.error(
+                    'file name mismatch servant ID: path="%s", servant_id=%d',
+                    path,
+                    servant["id"],
+                )
+            yield servant
+
+    def servant(self, path: pathlib.Path) -> Optional[Servant]:
+        if path in self._servants:
+            return self._servants[path]
+        servant = load_servant(path, logger=self._logger)
+        if self._keep_servants:
+            self._servants[path] = servant
+        return servant
+
+    @functools.cached_property
+    def servant_links(self) -> Optional[list[ServantLink]]:
+        return load_servant_links(
+            self.servant_directory.joinpath("link.json"),
+            logger=self._logger,
+        )
+
+    @functools.cached_property
+    def servant_names(self) -> Optional[list[ServantName]]:
+        return load_servant_names(
+            self.servant_directory.joinpath("name.json"),
+            logger=self._logger,
+        )
+
+    @functools.cached_property
+    def costumes(self) -> Optional[list[CostumeData]]:
+        return load_costumes(
+            self.servant_directory.joinpath("costumes.json"),
+            logger=self._logger,
+        )
+
+    @functools.cached_property
+    def patches(self) -> Optional[dict[ServantID, list[Patch[Any]]]]:
+        return load_patches(
+            self.servant_directory.joinpath("patch.json"),
+            logger=self._logger,
+        )
+
+    @functools.cached_property
+    def sounds(self) -> Optional[list[Sound]]:
+        return load_sounds(
+            self.directory.joinpath("sound.json"),
+            logger=self._logger,
+        )
+
+    @functools.cached_property
+    def item_dictionary(self) -> Optional[ItemDictionary]:
+        return load_item_dictionary(
+            self.directory.joinpath("english/item.json"),
+            logger=self._logger,
+        )
+
+    @functools.cached_property
+    def servant_dictionary(self) -> Optional[ServantDictionary]:
+        return load_servant_dictionary(
+            self.directory.joinpath("english/servant.json"),
+            logger=self._logger,
+        )
+
+    @property
+    def dictionary(self) -> Dictionary:
+        return Dictionary(
+            item=self.item_dictionary or {},
+            servant=self.servant_dictionary or {},
+        )
+
+    @functools.cached_property
+    def english_servants(self) -> list[english.Servant]:
+        return english.load_servants(
+            self.english_servant_directory,
+            logger=self._logger,
+        )
+
+    @functools.cached_property
+    def english_servant_links(self) -> Optional[list[english.ServantLink]]:
+        return english.load_servant_links(
+            self.english_servant_directory.joinpath("link.json"),
+            logger=self._logger,
+        )
+
+    @functools.cached_property
+    def english_costumes(self) -> Optional[list[english.CostumeData]]:
+        return english.load_costumes(
+            self.english_servant_directory.joinpath("costume.json"),
+            logger=self._logger,
+        )
+
+    @functools.cached_property
+    def english_patches(self) -> Optional[dict[ServantID, list[Patch[Any]]]]:
+        return load_patches(
+            self.english_servant_directory.joinpath("patch.json"),
+            logger=self._logger,
+        )
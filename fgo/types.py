@@ -5,6 +5,7 @@ from typing import NotRequired, Optional, TypedDict
 type ItemID = int  # pylint: disable=invalid-name
 type ServantID = int  # pylint: disable=invalid-name
 type CostumeID = int  # pylint: disable=invalid-name
+type CraftEssenceID = int  # pylint: disable=invalid-name
 
 
 class Item(TypedDict):
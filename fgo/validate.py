@@ -1,13 +1,57 @@
 from __future__ import annotations
 
+import concurrent.futures
+import functools
 import logging
-from typing import Literal, Optional
-
-import jsonschema
+import pathlib
+from typing import TYPE_CHECKING, Callable, Iterator, Literal, Optional, TypedDict
 
+from .digest import file_digest, json_digest
+from .io import load_json, save_json
+from .merged import servant_resources
+from .record import (
+    CachedRecord,
+    RecordCollector,
+    cache_records,
+    collecting_logger,
+    replay_cached_records,
+    replay_records,
+)
+from .schema import SchemaValidator, compile_schema
 from .schema import servant as servant_schema
-from .servant import ServantLogger
-from .types import AppendSkills, Costume, Servant, Skill, Skills
+from .servant import ServantLogger, load_servant, servant_files
+from .sound import Sound
+from .types import (
+    AppendSkills,
+    Costume,
+    CostumeID,
+    Item,
+    Servant,
+    ServantDictionary,
+    ServantID,
+    ServantLink,
+    Skill,
+    Skills,
+)
+
+if TYPE_CHECKING:
+    import jsonschema.protocols
+
+# bump when validate_servant changes its checks or the entry format changes
+VALIDATION_CACHE_VERSION = 2
+
+
+class ValidationCacheEntry(TypedDict):
+    digest: str
+    valid: bool
+    # warnings and errors
+    messages: list[CachedRecord]
+
+
+class ValidationCache(TypedDict):
+    version: int
+    schema: str
+    servants: dict[str, ValidationCacheEntry]
 
 
 def validate_servant(
@@ -17,10 +61,14 @@ def validate_servant(
     logger.info("start validation")
     result = True
     # validate with JSONSchema
-    try:
-        jsonschema.validate(instance=servant, schema=servant_schema())
-    except jsonschema.exceptions.ValidationError as error:
-        logger.error("JSONSchema validaton error %s", error)
+    errors = compiled_servant_validator()(servant)
+    for error in errors:
+        logger.error(
+            "JSONSchema validaton error at %s: %s",
+            error.json_path,
+            error.message,
+        )
+    if errors:
         return False
     # check skills
     if not validate_skills(servant["skills"], logger):
@@ -34,26 +82,260 @@ def validate_servant(
     return result
 
 
+@functools.cache
+def compiled_servant_validator() -> SchemaValidator:
+    # generated code of the servant schema,
+    # reports the same errors as servant_validator
+    return compile_schema(servant_schema())
+
+
+@functools.cache
+def servant_validator() -> jsonschema.protocols.Validator:
+    # build the schema and check it only once per process,
+    # jsonschema is imported here since the compiled validator does not need it
+    import jsonschema.validators  # pylint: disable=import-outside-toplevel
+
+    schema = servant_schema()
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
 def validate_servants(
     servants: list[Servant],
     *,
     logger: Optional[logging.Logger] = None,
     halt_on_error: bool = False,
+    processes: int = 1,
+) -> bool:
+    logger = logger or logging.getLogger(__name__)
+    result = True
+    for valid, records in _validate_servants(servants, processes):
+        replay_records(records, logger)
+        if not valid:
+            result = False
+            if halt_on_error:
+                break
+    return result
+
+
+def validate_servant_files(
+    # pylint: disable=too-many-arguments, too-many-locals
+    directory: pathlib.Path,
+    *,
+    logger: Optional[logging.Logger] = None,
+    cache_path: Optional[pathlib.Path] = None,
+    halt_on_error: bool = False,
+    processes: int = 1,
+    loader: Optional[Callable[[pathlib.Path], Optional[Servant]]] = None,
+) -> bool:
+    # validates only files changed since the cached results,
+    # failures of unchanged files are reported again from the cache
+    logger = logger or logging.getLogger(__name__)
+    loader = loader or functools.partial(load_servant, logger=logger)
+    schema_digest = json_digest(servant_schema())
+    cache = _load_validation_cache(cache_path, schema_digest, logger)
+    updated = ValidationCache(
+        version=VALIDATION_CACHE_VERSION,
+        schema=schema_digest,
+        servants={},
+    )
+    result = True
+    changed: list[tuple[str, str, Servant]] = []
+    for servant_id, path in servant_files(directory):
+        key = f"{servant_id:03d}"
+        digest = file_digest(path)
+        entry = cache["servants"].get(key, None)
+        if entry is not None and entry["digest"] == digest:
+            updated["servants"][key] = entry
+            continue
+        servant = loader(path)
+        if servant is None:
+            result = False
+            continue
+        changed.append((key, digest, servant))
+    # cached results
+    for key, entry in updated["servants"].items():
+        logger.debug("servant %s is not changed", key)
+        replay_cached_records(entry["messages"], logger)
+        if not entry["valid"]:
+            result = False
+    # changed files
+    if result or not halt_on_error:
+        results = _validate_servants(
+            [servant for _, _, servant in changed],
+            processes,
+        )
+        for (key, digest, _), (valid, records) in zip(changed, results):
+            replay_records(records, logger)
+            updated["servants"][key] = ValidationCacheEntry(
+                digest=digest,
+                valid=valid,
+                messages=cache_records(records),
+            )
+            if not valid:
+                result = False
+                if halt_on_error:
+                    break
+    # save cache
+    if cache_path is not None and updated != cache:
+        logger.info('save validation cache to "%s"', cache_path)
+        save_json(cache_path, updated)
+    return result
+
+
+def validate_dataset(
+    # pylint: disable=too-many-arguments
+    servants: list[Servant],
+    items: list[Item],
+    links: list[ServantLink],
+    dictionary: ServantDictionary,
+    *,
+    sounds: Optional[list[Sound]] = None,
+    logger: Optional[logging.Logger] = None,
 ) -> bool:
+    # invariants across servants, checked with hash indexes in one pass each
     logger = logger or logging.getLogger(__name__)
+    results = [
+        _validate_costume_ids(servants, logger),
+        _validate_item_names(servants, sounds or [], items, logger),
+        _validate_links(servants, links, dictionary, logger),
+    ]
+    return all(results)
+
+
+def _validate_costume_ids(
+    servants: list[Servant],
+    logger: logging.Logger,
+) -> bool:
     result = True
+    owners: dict[CostumeID, ServantID] = {}
     for servant in servants:
-        if not validate_servant(
-            servant,
-            ServantLogger(logger, servant["id"], servant["name"]),
-        ):
-            # validate servant
+        for costume in servant["costumes"]:
+            owner = owners.setdefault(costume["id"], servant["id"])
+            if owner != servant["id"]:
+                result = False
+                ServantLogger(logger, servant["id"], servant["name"]).error(
+                    "costume %d is also used by servant %03d",
+                    costume["id"],
+                    owner,
+                )
+    return result
+
+
+def _validate_item_names(
+    servants: list[Servant],
+    sounds: list[Sound],
+    items: list[Item],
+    logger: logging.Logger,
+) -> bool:
+    result = True
+    item_names = {item["name"] for item in items}
+    for servant in servants:
+        for kind, level, resource in servant_resources(servant):
+            for items_ in resource["items"]:
+                if items_["name"] not in item_names:
+                    result = False
+                    ServantLogger(logger, servant["id"], servant["name"]).error(
+                        'unknown item "%s" in %s %d',
+                        items_["name"],
+                        kind,
+                        level,
+                    )
+    for sound in sounds:
+        for items_ in sound["resource"]["items"]:
+            if items_["name"] not in item_names:
+                result = False
+                logger.error(
+                    'unknown item "%s" in sound %s %d',
+                    items_["name"],
+                    sound["source"],
+                    sound["index"],
+                )
+    return result
+
+
+def _validate_links(
+    servants: list[Servant],
+    links: list[ServantLink],
+    dictionary: ServantDictionary,
+    logger: logging.Logger,
+) -> bool:
+    result = True
+    servant_ids = {servant["id"] for servant in servants}
+    link_ids = {link["id"] for link in links}
+    for link in links:
+        if link["id"] not in servant_ids:
+            result = False
+            logger.error("servant %03d has no data file", link["id"])
+        if link["id"] not in dictionary:
             result = False
-        if halt_on_error:
-            break
+            logger.error("servant %03d has no dictionary entry", link["id"])
+    for servant_id in sorted(servant_ids - link_ids):
+        result = False
+        logger.error("servant %03d is not in links", servant_id)
     return result
 
 
+def _load_validation_cache(
+    path: Optional[pathlib.Path],
+    schema_digest: str,
+    logger: logging.Logger,
+) -> ValidationCache:
+    empty = ValidationCache(
+        version=VALIDATION_CACHE_VERSION,
+        schema=schema_digest,
+        servants={},
+    )
+    if path is None:
+        return empty
+    logger.info('load validation cache from "%s"', path)
+    cache: Optional[ValidationCache] = load_json(path)
+    if cache is None:
+        return empty
+    if cache.get("version", None) != VALIDATION_CACHE_VERSION:
+        logger.info("validation cache version is changed")
+        return empty
+    if cache["schema"] != schema_digest:
+        logger.info("servant schema is changed")
+        return empty
+    return cache
+
+
+def _validate_servants(
+    servants: list[Servant],
+    processes: int,
+) -> Iterator[tuple[bool, list[logging.LogRecord]]]:
+    if processes == 1:
+        yield from map(_validate_servant_with_records, servants)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        try:
+            yield from executor.map(
+                _validate_servant_with_records,
+                servants,
+                chunksize=16,
+            )
+        finally:
+            # do not wait the rest after halt_on_error
+            executor.shutdown(cancel_futures=True)
+
+
+def _validate_servant_with_records(
+    servant: Servant,
+) -> tuple[bool, list[logging.LogRecord]]:
+    handler = RecordCollector()
+    result = validate_servant(
+        servant,
+        ServantLogger(
+            collecting_logger(f"{__name__}.worker", handler),
+            servant["id"],
+            servant["name"],
+        ),
+    )
+    return result, handler.records
+
+
 def validate_skills(
     skills: Skills,
     logger: ServantLogger,
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import logging
+import pathlib
+
+import fgo
+
+
+def main() -> None:
+    # logger
+    logger = create_logger()
+    # option
+    option = Option(**vars(argument_parser().parse_args()))
+    if option.verbose:
+        logger.setLevel(logging.DEBUG)
+    logger.debug("option: %s", option)
+    # index
+    index = fgo.build_item_index(
+        pathlib.Path("data/items.json"),
+        pathlib.Path("data/servant"),
+        pathlib.Path("data/sound.json"),
+        cache_path=(
+            pathlib.Path("data/cache/item_index.json") if not option.no_cache else None
+        ),
+        logger=logger,
+    )
+    if index is None:
+        return
+    # query
+    for target in option.items:
+        query(index, target, logger)
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("item_index")
+    logger.setLevel(logging.WARNING)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    no_cache: bool
+    items: list[str]
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Show where items are used",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="rebuild the index without reading or writing the cache",
+    )
+    parser.add_argument(
+        dest="items",
+        nargs="+",
+        help="item name or item ID",
+        metavar="ITEM",
+    )
+    return parser
+
+
+def query(
+    index: fgo.ItemIndex,
+    target: str,
+    logger: logging.Logger,
+) -> None:
+    item = index.item(target)
+    if item is None:
+        logger.error('item "%s" is not found', target)
+        return
+    print(f"{item['id']} {item['name']}: total {index.total(item['id'])}")
+    for usage in index.usages(item["id"]):
+        if usage["servant_id"] is not None:
+            owner = f"servant {usage['servant_id']:03d}"
+        else:
+            owner = f"sound {usage['source']}"
+        print(f"  {owner} {usage['kind']} {usage['level']}: {usage['piece']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import argparse
 import dataclasses
+import importlib.util
 import logging
 import pathlib
-from typing import Literal, Optional, TypedDict
+import sys
+from typing import Any, Iterable, Iterator, Literal, Optional, TypedDict
 
 import fgo
 
@@ -15,35 +17,80 @@ def main() -> None:
     # logger
     logger = create_logger()
     # option
-    option = Option(**vars(argument_parser().parse_args()))
+    parser = argument_parser()
+    option = Option(**vars(parser.parse_args()))
+    if option.sharded and (option.encoding != "json" or option.compressions):
+        parser.error("--sharded supports only uncompressed JSON")
+    if option.aggregates and importlib.util.find_spec("numpy") is None:
+        parser.error("--aggregates requires numpy (poetry install --extras planner)")
     if option.verbose:
         logger.setLevel(logging.DEBUG)
     logger.debug("option: %s", option)
-    # items
-    items = (
-        fgo.load_items(
-            pathlib.Path("data/items.json"),
-            logger=logger,
-        )
-        or []
-    )
-    # servants
-    servants = fgo.load_servants(
-        pathlib.Path("data/servant/"),
-        logger=logger,
-    )
-    # sounds
-    sounds = load_sounds(
-        pathlib.Path("data/sound.json"),
-        logger=logger,
-    )
-    # dictionary
-    dictionary = load_dictionary(logger)
     # merge
-    merged_data = merge(items, servants, sounds, dictionary, logger)
-    path = pathlib.Path("data/merged_data.json")
-    logger.info('save merged data to "%s"', path)
-    fgo.save_json(path, merged_data)
+    store = fgo.DataStore(keep_servants=option.aggregates, logger=logger)
+    if not run(option, store, logger):
+        sys.exit(1)
+
+
+def run(
+    option: Option,
+    store: fgo.DataStore,
+    logger: logging.Logger,
+) -> bool:
+    # failed if any error is logged, e.g. an input that is not loaded
+    # or an unknown item name
+    with fgo.collect_records(logger, level=logging.ERROR) as errors:
+        # items
+        items = store.items or []
+        # servants
+        servants: Iterable[fgo.Servant] = (
+            # the planner needs all servants
+            store.servants
+            if option.aggregates
+            else store.iterate_servants()
+        )
+        # sounds
+        sounds = store.sounds or []
+        # dictionary
+        dictionary = store.dictionary
+        # cache
+        cache = (
+            ServantCache(pathlib.Path("data/cache/merge"), logger)
+            if not option.no_cache
+            else None
+        )
+        # merge
+        merged_data = merge_stream(
+            items, servants, sounds, dictionary, logger, cache=cache
+        )
+        if option.v2:
+            merged_data = normalize_stream(merged_data)
+        if option.sharded:
+            directory = pathlib.Path("data/merged")
+            logger.info('save sharded merged data to "%s"', directory)
+            save_sharded(directory, merged_data, logger)
+        else:
+            # v2 is not readable as v1, so it never replaces the v1 file
+            save_merged_data(
+                pathlib.Path(
+                    "data/merged_data_v2" if option.v2 else "data/merged_data"
+                ),
+                merged_data,
+                option.encoding,
+                option.compressions,
+                logger,
+            )
+        # aggregates
+        if option.aggregates:
+            # fgo.planner imports numpy, only needed here
+            # pylint: disable-next=import-outside-toplevel
+            from fgo.planner import MaterialPlanner
+
+            path = pathlib.Path("data/merged_aggregates.json")
+            logger.info('save material aggregates to "%s"', path)
+            planner = MaterialPlanner(store.servants, items, logger=logger)
+            fgo.save_json(path, planner.aggregate())
+    return not errors.records
 
 
 def create_logger() -> logging.Logger:
@@ -60,6 +107,12 @@ def create_logger() -> logging.Logger:
 @dataclasses.dataclass(frozen=True)
 class Option:
     verbose: bool
+    no_cache: bool
+    sharded: bool
+    v2: bool
+    encoding: str
+    compressions: list[str]
+    aggregates: bool
 
 
 def argument_parser() -> argparse.ArgumentParser:
@@ -73,34 +126,74 @@ def argument_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="set log level to debug",
     )
-    return parser
-
-
-def load_sounds(
-    path: pathlib.Path,
-    logger: logging.Logger,
-) -> list[fgo.Sound]:
-    logger.info('load sounds from "%s"', path)
-    sounds = fgo.load_json(path)
-    if sounds is None:
-        logger.error('failed to load sournds from "%s"', path)
-        return []
-    return sounds
-
-
-def load_dictionary(logger: logging.Logger) -> fgo.Dictionary:
-    item = fgo.load_item_dictionary(
-        pathlib.Path("data/english/item.json"),
-        logger=logger,
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="reconvert all servants without reading or writing the cache",
     )
-    servant = fgo.load_servant_dictionary(
-        pathlib.Path("data/english/servant.json"),
-        logger=logger,
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "--sharded",
+        dest="sharded",
+        action="store_true",
+        help="save per-servant files and an index to data/merged/",
     )
-    return fgo.Dictionary(
-        item=item or {},
-        servant=servant or {},
+    output.add_argument(
+        "--v2",
+        dest="v2",
+        action="store_true",
+        help=(
+            "save merged data v2 that shares identical resources"
+            " to data/merged_data_v2.json instead"
+        ),
+    )
+    parser.add_argument(
+        "--encoding",
+        dest="encoding",
+        type=encoding_name,
+        choices=fgo.encoding_names(),
+        default="json",
+        help="encoding of merged data (default: %(default)s)",
     )
+    parser.add_argument(
+        "--compress",
+        dest="compressions",
+        action="append",
+        type=compression_name,
+        choices=fgo.compression_names(),
+        default=[],
+        help="also save a precompressed copy (can be repeated)",
+    )
+    parser.add_argument(
+        "--aggregates",
+        dest="aggregates",
+        action="store_true",
+        help="also save material totals to data/merged_aggregates.json"
+        " (requires numpy)",
+    )
+    return parser
+
+
+# optional modules are checked while parsing, not after the merge
+def encoding_name(value: str) -> str:
+    if value in fgo.encoding_names():
+        require_module(value, fgo.missing_encoding_module(value))
+    return value
+
+
+def compression_name(value: str) -> str:
+    if value in fgo.compression_names():
+        require_module(value, fgo.missing_compression_module(value))
+    return value
+
+
+def require_module(name: str, missing_module: Optional[str]) -> None:
+    if missing_module is not None:
+        raise argparse.ArgumentTypeError(
+            f'{name} requires the "{missing_module}" module'
+            " (poetry install --extras formats)"
+        )
 
 
 class Item(TypedDict):
@@ -164,19 +257,89 @@ class MergedData(TypedDict):
     sounds: list[Sound]
 
 
+class Shard(TypedDict):
+    path: str
+    size: int
+    sha256: str
+
+
+class ServantShard(Shard):
+    id: int
+
+
+class ShardIndex(TypedDict):
+    items: Shard
+    servants: list[ServantShard]
+    sounds: Shard
+
+
+class ServantCacheValue(TypedDict):
+    key: str
+    servant: Servant
+    # warnings and errors of convert_servant, logged again on a cache hit
+    messages: list[fgo.CachedRecord]
+
+
+# bump when convert_servant changes its output or the cache format changes
+CACHE_VERSION = 2
+
+
+class ServantCache:
+    def __init__(
+        self,
+        directory: pathlib.Path,
+        logger: logging.Logger,
+    ) -> None:
+        self._directory = directory
+        self._logger = logger
+
+    def load(
+        self,
+        servant_id: fgo.ServantID,
+        key: str,
+    ) -> Optional[ServantCacheValue]:
+        value: Optional[ServantCacheValue] = fgo.load_json(self._path(servant_id))
+        if value is None or value["key"] != key:
+            return None
+        return value
+
+    def save(
+        self,
+        servant_id: fgo.ServantID,
+        key: str,
+        servant: Servant,
+        messages: list[fgo.CachedRecord],
+    ) -> None:
+        path = self._path(servant_id)
+        self._logger.debug('save servant %03d cache to "%s"', servant_id, path)
+        fgo.save_json(
+            path,
+            ServantCacheValue(key=key, servant=servant, messages=messages),
+        )
+
+    def prune(self, servant_ids: set[fgo.ServantID]) -> None:
+        if not self._directory.exists():
+            return
+        for path in self._directory.glob("*.json"):
+            if path.stem.isdigit() and int(path.stem) not in servant_ids:
+                self._logger.debug('remove cache "%s"', path)
+                path.unlink()
+
+    def _path(self, servant_id: fgo.ServantID) -> pathlib.Path:
+        return self._directory.joinpath(f"{servant_id:03d}.json")
+
+
 def merge(
+    # pylint: disable=too-many-arguments
     items: list[fgo.Item],
-    servants: list[fgo.Servant],
+    servants: Iterable[fgo.Servant],
     sounds: list[fgo.Sound],
     dictionary: fgo.Dictionary,
     logger: logging.Logger,
+    *,
+    cache: Optional[ServantCache] = None,
 ) -> MergedData:
-    # item name -> item id
-    item_converter = fgo.ItemNameConverter(
-        {item["name"]: item["id"] for item in items},
-        default_id=0,
-        logger=logger,
-    )
+    item_converter = create_item_converter(items, logger)
     return MergedData(
         items=convert_items(
             items,
@@ -188,6 +351,8 @@ def merge(
             item_converter,
             dictionary,
             logger,
+            cache=cache,
+            items_digest=fgo.json_digest(items),
         ),
         sounds=convert_sounds(
             sounds,
@@ -197,12 +362,75 @@ def merge(
     )
 
 
+def merge_stream(
+    # pylint: disable=too-many-arguments
+    items: list[fgo.Item],
+    servants: Iterable[fgo.Servant],
+    sounds: list[fgo.Sound],
+    dictionary: fgo.Dictionary,
+    logger: logging.Logger,
+    *,
+    cache: Optional[ServantCache] = None,
+) -> Iterator[tuple[str, Iterator[Any]]]:
+    # yields the fields of MergedData in order,
+    # each element is converted when the consumer requests it
+    item_converter = create_item_converter(items, logger)
+    yield "items", iterate_items(items, dictionary, logger)
+    yield "servants", iterate_servants(
+        servants,
+        item_converter,
+        dictionary,
+        logger,
+        cache=cache,
+        items_digest=fgo.json_digest(items),
+    )
+    yield "sounds", iterate_sounds(sounds, item_converter, logger)
+
+
+def normalize_stream(
+    merged_data: Iterable[tuple[str, Iterator[Any]]],
+) -> Iterator[tuple[str, Any]]:
+    table = fgo.ResourceTable()
+    yield "version", fgo.MERGED_DATA_VERSION
+    for key, values in merged_data:
+        match key:
+            case "servants":
+                yield key, (fgo.normalize_servant(value, table) for value in values)
+            case "sounds":
+                yield key, (fgo.normalize_sound(value, table) for value in values)
+            case _:
+                yield key, values
+    # the table is complete after all servants and sounds are written
+    yield "resources", table.resources()
+
+
+def create_item_converter(
+    items: list[fgo.Item],
+    logger: logging.Logger,
+) -> fgo.ItemNameConverter:
+    # item name -> item id
+    return fgo.ItemNameConverter(
+        {item["name"]: item["id"] for item in items},
+        default_id=0,
+        logger=logger,
+    )
+
+
 def convert_items(
     items: list[fgo.Item],
     dictionary: fgo.Dictionary,
     logger: logging.Logger,
 ) -> list[Item]:
-    return [convert_item(item, dictionary, logger) for item in items]
+    return list(iterate_items(items, dictionary, logger))
+
+
+def iterate_items(
+    items: list[fgo.Item],
+    dictionary: fgo.Dictionary,
+    logger: logging.Logger,
+) -> Iterator[Item]:
+    for item in items:
+        yield convert_item(item, dictionary, logger)
 
 
 def convert_item(
@@ -231,12 +459,73 @@ def get_item_text(
 
 
 def convert_servants(
-    servants: list[fgo.Servant],
+    # pylint: disable=too-many-arguments
+    servants: Iterable[fgo.Servant],
     items: fgo.ItemNameConverter,
     dictionary: fgo.Dictionary,
     logger: logging.Logger,
+    *,
+    cache: Optional[ServantCache] = None,
+    items_digest: str = "",
 ) -> list[Servant]:
-    return [convert_servant(servant, items, dictionary, logger) for servant in servants]
+    return list(
+        iterate_servants(
+            servants,
+            items,
+            dictionary,
+            logger,
+            cache=cache,
+            items_digest=items_digest,
+        )
+    )
+
+
+def iterate_servants(
+    # pylint: disable=too-many-arguments
+    servants: Iterable[fgo.Servant],
+    items: fgo.ItemNameConverter,
+    dictionary: fgo.Dictionary,
+    logger: logging.Logger,
+    *,
+    cache: Optional[ServantCache] = None,
+    items_digest: str = "",
+) -> Iterator[Servant]:
+    if cache is None:
+        for servant in servants:
+            yield convert_servant(servant, items, dictionary, logger)
+        return
+    servant_ids: set[fgo.ServantID] = set()
+    for servant in servants:
+        servant_ids.add(servant["id"])
+        key = servant_cache_key(servant, items_digest, dictionary)
+        cached = cache.load(servant["id"], key)
+        if cached is not None:
+            logger.debug("servant %03d is not changed", servant["id"])
+            fgo.replay_cached_records(cached["messages"], logger)
+            yield cached["servant"]
+            continue
+        # keep warnings and errors to report them again on later runs
+        with fgo.collect_records(logger, level=logging.WARNING) as collector:
+            value = convert_servant(servant, items, dictionary, logger)
+        cache.save(servant["id"], key, value, fgo.cache_records(collector.records))
+        yield value
+    # remove servants that no longer exist
+    cache.prune(servant_ids)
+
+
+def servant_cache_key(
+    servant: fgo.Servant,
+    items_digest: str,
+    dictionary: fgo.Dictionary,
+) -> str:
+    return fgo.json_digest(
+        [
+            CACHE_VERSION,
+            fgo.json_digest(servant),
+            items_digest,
+            fgo.json_digest(dictionary["servant"].get(servant["id"], None)),
+        ]
+    )
 
 
 def convert_servant(
@@ -466,7 +755,16 @@ def convert_sounds(
     items: fgo.ItemNameConverter,
     logger: logging.Logger,
 ) -> list[Sound]:
-    return [convert_sound(sound, items, logger) for sound in sounds]
+    return list(iterate_sounds(sounds, items, logger))
+
+
+def iterate_sounds(
+    sounds: list[fgo.Sound],
+    items: fgo.ItemNameConverter,
+    logger: logging.Logger,
+) -> Iterator[Sound]:
+    for sound in sounds:
+        yield convert_sound(sound, items, logger)
 
 
 def convert_sound(
@@ -489,5 +787,98 @@ def convert_sound(
     )
 
 
+def save_merged_data(
+    path: pathlib.Path,
+    merged_data: Iterable[tuple[str, Any]],
+    encoding: str,
+    compressions: list[str],
+    logger: logging.Logger,
+) -> None:
+    encoded_path = fgo.encoded_path(path, encoding=encoding)
+    logger.info('save merged data to "%s"', encoded_path)
+    if encoding == "json":
+        fgo.save_json_stream(encoded_path, merged_data)
+        if not compressions:
+            return
+        data = encoded_path.read_bytes()
+    else:
+        data = fgo.encode(
+            {
+                key: list(value) if isinstance(value, Iterator) else value
+                for key, value in merged_data
+            },
+            encoding=encoding,
+        )
+        encoded_path.write_bytes(data)
+    for compression in compressions:
+        compressed_path = fgo.encoded_path(
+            path,
+            encoding=encoding,
+            compression=compression,
+        )
+        logger.info('save compressed merged data to "%s"', compressed_path)
+        compressed_path.write_bytes(fgo.compress(data, compression))
+
+
+def save_sharded(
+    directory: pathlib.Path,
+    merged_data: Iterable[tuple[str, Iterable[Any]]],
+    logger: logging.Logger,
+) -> None:
+    shards: dict[str, Any] = {}
+    for key, values in merged_data:
+        if key == "servants":
+            shards[key] = save_servant_shards(directory, values, logger)
+        else:
+            shards[key] = save_shard(directory, f"{key}.json", list(values), logger)
+    index = ShardIndex(
+        items=shards["items"],
+        servants=shards["servants"],
+        sounds=shards["sounds"],
+    )
+    path = directory.joinpath("index.json")
+    logger.info('save shard index to "%s"', path)
+    fgo.save_json(path, index)
+
+
+def save_servant_shards(
+    directory: pathlib.Path,
+    servants: Iterable[Servant],
+    logger: logging.Logger,
+) -> list[ServantShard]:
+    result: list[ServantShard] = []
+    for servant in servants:
+        shard = save_shard(
+            directory,
+            f"servants/{servant['id']:03d}.json",
+            servant,
+            logger,
+        )
+        result.append(ServantShard(id=servant["id"], **shard))
+    # remove shards of servants that no longer exist
+    paths = {shard["path"] for shard in result}
+    for path in directory.glob("servants/*.json"):
+        if path.relative_to(directory).as_posix() not in paths:
+            logger.info('remove shard "%s"', path)
+            path.unlink()
+    return result
+
+
+def save_shard(
+    directory: pathlib.Path,
+    name: str,
+    data: Any,
+    logger: logging.Logger,
+) -> Shard:
+    path = directory.joinpath(name)
+    logger.debug('save shard to "%s"', path)
+    fgo.save_json(path, data)
+    return Shard(
+        path=name,
+        size=path.stat().st_size,
+        sha256=fgo.file_digest(path),
+    )
+
+
 if __name__ == "__main__":
     main()
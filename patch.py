@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import argparse
+import collections
+import dataclasses
+import logging
+import pathlib
+import sys
+from typing import Any, Optional
+
+import fgo
+
+
+def main() -> None:
+    # logger
+    logger = create_logger()
+    # option
+    parser = argument_parser()
+    option = Option(**vars(parser.parse_args()))
+    if option.prune is not None and not option.analyze:
+        parser.error("--prune requires --analyze")
+    if option.verbose:
+        logger.setLevel(logging.DEBUG)
+    logger.debug("option: %s", option)
+    # servants and patches
+    store = fgo.DataStore(logger=logger)
+    if option.english:
+        directory = store.english_servant_directory
+        patches = store.english_patches
+    else:
+        directory = store.servant_directory
+        patches = store.patches
+    if patches is None:
+        return
+    if option.analyze:
+        if not analyze(option, fgo.unpatched_directory(directory), patches, logger):
+            sys.exit(1)
+        return
+    servants: list[Any] = store.english_servants if option.english else store.servants
+    # apply
+    report = fgo.apply_patch_set(
+        servants,
+        fgo.compile_patch_set(patches, logger=logger),
+        logger=logger,
+    )
+    counter = collections.Counter(
+        result["status"] for results in report.values() for result in results
+    )
+    logger.info(
+        "%s",
+        ", ".join(f"{status}: {count}" for status, count in sorted(counter.items())),
+    )
+    # report
+    if option.report is not None:
+        logger.info('save report to "%s"', option.report)
+        fgo.save_json(
+            option.report,
+            {f"{servant_id:03d}": results for servant_id, results in report.items()},
+        )
+    # save patched servants
+    if option.save:
+        for servant in servants:
+            if any(
+                result["status"] == "applied"
+                for result in report.get(servant["id"], [])
+            ):
+                path = directory.joinpath(f"{servant['id']:03d}.json")
+                logger.info('save servant to "%s"', path)
+                fgo.save_json(path, servant)
+
+
+def analyze(
+    option: Option,
+    directory: pathlib.Path,
+    patches: dict[fgo.ServantID, list[fgo.Patch[Any]]],
+    logger: logging.Logger,
+) -> bool:
+    # the saved servants are already patched,
+    # so patches are classified against the snapshots saved before patching
+    servants: list[Any] = []
+    missing_ids: list[fgo.ServantID] = []
+    for servant_id in sorted(patches):
+        servant = fgo.load_json(directory.joinpath(f"{servant_id:03d}.json"))
+        if servant is None:
+            missing_ids.append(servant_id)
+        else:
+            servants.append(servant)
+    if missing_ids:
+        logger.warning(
+            'unpatched snapshots are not found in "%s": %s'
+            " (update the servants with --force)",
+            directory,
+            ", ".join(f"{servant_id:03d}" for servant_id in missing_ids),
+        )
+        if option.prune is not None:
+            logger.error("--prune requires the snapshots of all patched servants")
+            return False
+    analysis = fgo.analyze_patch_set(
+        servants,
+        {servant["id"]: patches[servant["id"]] for servant in servants},
+    )
+    for servant_id, results in analysis.items():
+        for result in results:
+            if result["state"] != "applied":
+                logger.info("%03d %s: %s", servant_id, result["state"], result["path"])
+    counter = collections.Counter(
+        result["state"] for results in analysis.values() for result in results
+    )
+    logger.info(
+        "%s",
+        ", ".join(f"{state}: {count}" for state, count in sorted(counter.items())),
+    )
+    # report
+    if option.report is not None:
+        logger.info('save report to "%s"', option.report)
+        fgo.save_json(
+            option.report,
+            {f"{servant_id:03d}": results for servant_id, results in analysis.items()},
+        )
+    # pruned patch file
+    if option.prune is not None:
+        pruned = fgo.prune_patch_set(patches, analysis)
+        logger.info('save pruned patches to "%s"', option.prune)
+        fgo.save_json(
+            option.prune,
+            {f"{servant_id:03d}": value for servant_id, value in pruned.items()},
+        )
+    return True
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("patch")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    english: bool
+    report: Optional[pathlib.Path]
+    save: bool
+    analyze: bool
+    prune: Optional[pathlib.Path]
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Apply the patch file to all saved servants at once",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    parser.add_argument(
+        "--english",
+        dest="english",
+        action="store_true",
+        help="patch English servants instead of Japanese servants",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="report",
+        type=pathlib.Path,
+        help="save the result of each patch as JSON",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--save",
+        dest="save",
+        action="store_true",
+        help="overwrite servants that are patched",
+    )
+    parser.add_argument(
+        "--analyze",
+        dest="analyze",
+        action="store_true",
+        help=(
+            "classify patches as applied, already_fixed or stale"
+            " against servants saved before patching"
+        ),
+    )
+    parser.add_argument(
+        "--prune",
+        dest="prune",
+        type=pathlib.Path,
+        help=(
+            "save only applied patches, requires --analyze"
+            " and all patched servants saved before patching"
+        ),
+        metavar="PATH",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    main()
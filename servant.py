@@ -11,7 +11,6 @@ import time
 import unicodedata
 from typing import Literal, Optional
 
-import fake_useragent
 import lxml.html
 import requests
 
@@ -26,9 +25,11 @@ def main() -> None:
     option = Option(**vars(argument_parser().parse_args()))
     if option.verbose:
         logger.setLevel(logging.DEBUG)
+    if option.log_json is not None:
+        logger.addHandler(fgo.json_lines_handler(option.log_json))
     logger.debug("option: %s", option)
     # session
-    session = create_session()
+    session = fgo.create_session(logger=logger)
     # root directory
     directory = pathlib.Path("data/servant")
     # links
@@ -86,7 +87,7 @@ def create_logger() -> logging.Logger:
 
 
 @dataclasses.dataclass(frozen=True)
-class Option:
+class Option:  # pylint: disable=too-many-instance-attributes
     verbose: bool
     force_update: bool
     no_save: bool
@@ -94,6 +95,7 @@ class Option:
     targets: list[int]
     request_interval: float
     request_timeout: float
+    log_json: Optional[pathlib.Path]
 
 
 def argument_parser() -> argparse.ArgumentParser:
@@ -152,26 +154,16 @@ def argument_parser() -> argparse.ArgumentParser:
         help="request timeout seconds (default: %(default)s)",
         metavar="SECONDS",
     )
+    parser.add_argument(
+        "--log-json",
+        dest="log_json",
+        type=pathlib.Path,
+        help="append log records as JSON lines with the servant fields",
+        metavar="PATH",
+    )
     return parser
 
 
-def create_session(
-    *,
-    logger: Optional[logging.Logger] = None,
-) -> requests.Session:
-    logger = logger or logging.getLogger(__name__)
-    session = requests.Session()
-    # user-agent
-    user_agent = fake_useragent.UserAgent(
-        os="Windows",
-        browsers="Firefox",
-        platforms="desktop",
-    ).random
-    logger.debug('fake user-agent: "%s"', user_agent)
-    session.headers["User-Agent"] = user_agent
-    return session
-
-
 def get_servant_links(
     path: pathlib.Path,
     session: requests.Session,
@@ -282,13 +274,11 @@ def group_costumes_by_servant(
 def load_patch(
     path: pathlib.Path,
     logger: logging.Logger,
-) -> dict[fgo.ServantID, list[fgo.Patch]]:
-    logger.info('load patch from "%s"', path)
-    data = fgo.load_json(path)
-    if data is None:
-        logger.error('failed to load patch from "%s"', path)
-        return {}
-    return {int(servant_id): patch for servant_id, patch in data.items()}
+) -> dict[fgo.ServantID, fgo.CompiledPatches]:
+    return fgo.compile_patch_set(
+        fgo.load_patches(path, logger=logger) or {},
+        logger=logger,
+    )
 
 
 def update_servants(
@@ -298,7 +288,7 @@ def update_servants(
     links: list[fgo.ServantLink],
     servant_names: dict[fgo.ServantID, fgo.ServantName],
     costumes: dict[fgo.ServantID, list[fgo.Costume]],
-    patches: dict[fgo.ServantID, list[fgo.Patch]],
+    patches: dict[fgo.ServantID, fgo.CompiledPatches],
     logger: logging.Logger,
     option: Option,
 ) -> None:
@@ -323,13 +313,15 @@ def update_servants(
                 costumes.get(link["id"], []),
                 servant_logger,
             )
-            # patch
-            if not option.no_patch and link["id"] in patches:
-                fgo.apply_patches(
+            # unpatched snapshot for patch.py --analyze
+            if not option.no_save and servant is not None:
+                fgo.save_json(
+                    fgo.unpatched_directory(directory).joinpath(path.name),
                     servant,
-                    patches[link["id"]],
-                    logger=servant_logger,
                 )
+            # patch
+            if not option.no_patch and link["id"] in patches:
+                patches[link["id"]].apply(servant, logger=servant_logger)
             if not option.no_save and servant is not None:
                 logger.info(
                     'save servant %03d %s to "%s"',
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import logging
+import pathlib
+
+import fgo
+
+
+def main() -> None:
+    # logger
+    logger = create_logger()
+    # option
+    option = Option(**vars(argument_parser().parse_args()))
+    if option.verbose:
+        logger.setLevel(logging.DEBUG)
+    logger.debug("option: %s", option)
+    # request with the cached page validators
+    session = fgo.create_session(logger=logger)
+    content = fgo.cached_get(
+        session,
+        fgo.SOUND_URL,
+        pathlib.Path("data/cache/page"),
+        timeout=option.request_timeout,
+        force=option.force_update,
+        logger=logger,
+    )
+    if content is None:
+        return
+    # parse
+    sounds = fgo.parse_sounds(content)
+    logger.info("sounds: %d", len(sounds))
+    # save only when changed
+    path = pathlib.Path("data/sound.json")
+    data = fgo.encode(sounds)
+    if path.exists() and path.read_bytes() == data:
+        logger.info('"%s" is not changed', path)
+        return
+    if option.no_save:
+        logger.info('"%s" is changed', path)
+        return
+    logger.info('save sounds to "%s"', path)
+    fgo.save_json(path, sounds)
+
+
+def create_logger() -> logging.Logger:
+    logger = logging.getLogger("sound")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.formatter = logging.Formatter(
+        fmt="%(name)s:%(levelname)s:%(message)s",
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    verbose: bool
+    force_update: bool
+    no_save: bool
+    request_timeout: float
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Update Sound Data",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="set log level to debug",
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        dest="force_update",
+        action="store_true",
+        help="request the page without the cached validators",
+    )
+    parser.add_argument(
+        "--no-save",
+        dest="no_save",
+        action="store_true",
+        help="skip saving JSON files",
+    )
+    parser.add_argument(
+        "--request-timeout",
+        dest="request_timeout",
+        type=float,
+        default=10.0,
+        help="request timeout seconds (default: %(default)s)",
+        metavar="SECONDS",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import json
+import logging
+import pathlib
+from typing import Any
+
+import pytest
+
+import fgo
+import merge
+
+DATA_DIRECTORY = pathlib.Path(__file__).resolve().parents[1].joinpath("data")
+
+
+@pytest.fixture(name="merged_data", scope="session")
+def fixture_merged_data() -> dict[str, Any]:
+    # merged repository data as saved to and loaded from data/merged_data.json
+    logger = logging.getLogger(__name__)
+    store = fgo.DataStore(DATA_DIRECTORY, logger=logger)
+    data = merge.merge(
+        store.items or [],
+        store.iterate_servants(),
+        store.sounds or [],
+        store.dictionary,
+        logger,
+    )
+    return json.loads(json.dumps(data))
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+
+import cli
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        ["--merge-options", "--no-cache -o out.json", "validate", "merge"],
+        ["--merge-options=--no-cache -o out.json", "validate", "merge"],
+        ["validate", "merge", "--merge-options", "--no-cache -o out.json"],
+    ],
+    ids=["separated", "joined", "after commands"],
+)
+def test_options(arguments: list[str]) -> None:
+    option = cli.parse_arguments(arguments)
+    assert option.commands == ["validate", "merge"]
+    assert option.arguments("merge") == ["--no-cache", "-o", "out.json"]
+    assert not option.arguments("validate")
+
+
+def test_options_with_quotes() -> None:
+    option = cli.parse_arguments(["--compare-options", "--strict", "compare"])
+    assert option.arguments("compare") == ["--strict"]
+    option = cli.parse_arguments(["--merge-options", "-o 'out data.json'", "merge"])
+    assert option.arguments("merge") == ["-o", "out data.json"]
+
+
+def test_missing_options_value() -> None:
+    with pytest.raises(SystemExit):
+        cli.parse_arguments(["merge", "--merge-options"])
+
+
+def test_unknown_command() -> None:
+    with pytest.raises(SystemExit):
+        cli.parse_arguments(["--merge-options", "-h", "unknown"])
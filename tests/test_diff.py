@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import copy
+import pathlib
+from typing import Any
+
+import fgo
+
+SERVANT_DIRECTORY = pathlib.Path(__file__).resolve().parents[1].joinpath("data/servant")
+
+
+def servant_key(servant: Any) -> str:
+    return f"{servant['id']:03d}"
+
+
+def apply_changelog(records: list[Any], changelog: fgo.Changelog) -> list[Any]:
+    result = {
+        servant_key(record): copy.deepcopy(record)
+        for record in records
+        if servant_key(record) not in changelog["removed"]
+    }
+    for key, patches in changelog["changed"].items():
+        for patch in patches:
+            fgo.apply_patch(result[key], patch)
+    result.update(copy.deepcopy(changelog["added"]))
+    return [result[key] for key in sorted(result)]
+
+
+def test_diff_records_applies_back() -> None:
+    before: list[Any] = [
+        fgo.load_json(SERVANT_DIRECTORY.joinpath(f"{servant_id:03d}.json"))
+        for servant_id in (1, 2, 3, 4)
+    ]
+    after = copy.deepcopy(before[1:])
+    # changed values, a list of another length, changed keys
+    after[0]["name"] = "changed"
+    after[0]["skills"][0][0]["name"] = "changed"
+    after[1]["costumes"] = [*after[1]["costumes"], {"id": 0}]
+    after[2]["new_key"] = True
+    # added record
+    added = copy.deepcopy(before[0])
+    added["id"] = 999
+    after.append(added)
+    changelog = fgo.diff_records(before, after, servant_key)
+    assert sorted(changelog["changed"]) == ["002", "003"]
+    assert sorted(changelog["added"]) == ["004", "999"]
+    assert sorted(changelog["removed"]) == ["001", "004"]
+    assert all(
+        patch["path"] for patches in changelog["changed"].values() for patch in patches
+    )
+    assert apply_changelog(before, changelog) == after
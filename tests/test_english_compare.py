@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import copy
+import logging
+import pathlib
+from typing import Any, Callable
+
+import pytest
+
+import english_compare
+import fgo
+import fgo.english
+
+DATA_DIRECTORY = pathlib.Path(__file__).resolve().parents[1].joinpath("data")
+
+type ItemNames = dict[str, fgo.ItemID]
+
+
+class Data:
+    # pylint: disable=too-few-public-methods
+    def __init__(self) -> None:
+        store = fgo.DataStore(DATA_DIRECTORY, logger=logging.getLogger(__name__))
+        self.en_servants: dict[fgo.ServantID, fgo.english.Servant] = {
+            servant["id"]: servant for servant in store.english_servants
+        }
+        self.jp_servants: dict[fgo.ServantID, fgo.Servant] = {
+            servant["id"]: servant for servant in store.servants
+        }
+        self.en_items: ItemNames = {
+            value: key for key, value in (store.item_dictionary or {}).items()
+        }
+        self.jp_items: ItemNames = {
+            item["name"]: item["id"] for item in store.items or []
+        }
+
+
+@pytest.fixture(name="data", scope="module")
+def fixture_data() -> Data:
+    return Data()
+
+
+def compare(
+    en_servant: fgo.english.Servant,
+    jp_servant: fgo.Servant,
+    data: Data,
+) -> list[logging.LogRecord]:
+    handler = fgo.RecordCollector()
+    logger = fgo.ServantLogger(
+        fgo.collecting_logger(f"{__name__}.compare", handler),
+        jp_servant["id"],
+        jp_servant["name"],
+    )
+    english_compare.compare_servant(
+        en_servant,
+        fgo.ItemNameConverter(data.en_items, logger=logger),
+        jp_servant,
+        fgo.ItemNameConverter(data.jp_items, logger=logger),
+        logger,
+    )
+    return handler.records
+
+
+def fingerprints_match(
+    en_servant: fgo.english.Servant,
+    jp_servant: fgo.Servant,
+    data: Data,
+) -> bool:
+    fingerprint = english_compare.en_servant_fingerprint(en_servant, data.en_items)
+    return fingerprint is not None and fingerprint == (
+        english_compare.jp_servant_fingerprint(jp_servant, data.jp_items)
+    )
+
+
+def matched_pair(data: Data) -> tuple[fgo.english.Servant, fgo.Servant]:
+    # a pair without differences, whose ascension resources have several items
+    return next(
+        (servant, data.jp_servants[servant_id])
+        for servant_id, servant in data.en_servants.items()
+        if servant_id in data.jp_servants
+        and len(servant["ascension_resources"][3]["items"]) > 1
+        and fingerprints_match(servant, data.jp_servants[servant_id], data)
+    )
+
+
+def test_matching_fingerprints_log_nothing(data: Data) -> None:
+    matched = 0
+    for servant_id, jp_servant in data.jp_servants.items():
+        en_servant = data.en_servants.get(servant_id, None)
+        if en_servant is not None and fingerprints_match(en_servant, jp_servant, data):
+            matched += 1
+            assert not compare(en_servant, jp_servant, data), servant_id
+    assert matched > 0
+
+
+def set_value(path: list[Any], value: Any) -> Callable[[Any], None]:
+    def mutate(servant: Any) -> None:
+        parent = servant
+        for key in path[:-1]:
+            parent = parent[key]
+        parent[path[-1]] = value
+
+    return mutate
+
+
+def reverse(path: list[Any]) -> Callable[[Any], None]:
+    def mutate(servant: Any) -> None:
+        parent = servant
+        for key in path:
+            parent = parent[key]
+        parent.reverse()
+
+    return mutate
+
+
+def append_copy(path: list[Any]) -> Callable[[Any], None]:
+    def mutate(servant: Any) -> None:
+        parent = servant
+        for key in path:
+            parent = parent[key]
+        parent.append(copy.deepcopy(parent[-1]))
+
+    return mutate
+
+
+# changes of an English servant that compare_servant reports
+MUTATIONS: dict[str, Callable[[Any], None]] = {
+    "id": set_value(["id"], 0),
+    "false name": set_value(["false_name"], "false name"),
+    "klass": set_value(["klass"], "unknown"),
+    "rarity": set_value(["rarity"], 6),
+    "skill rank": set_value(["active_skills", 0, 0, "rank"], "EX++"),
+    "skill level": append_copy(["active_skills", 0]),
+    "append skill rank": set_value(["append_skills", 0, 0, "rank"], "EX++"),
+    "ascension qp": set_value(["ascension_resources", 0, "qp"], 1),
+    "skill resource piece": set_value(
+        ["active_skill_resources", 0, "items", 0, "piece"],
+        999,
+    ),
+    "append resource item": set_value(
+        ["append_skill_resources", 0, "items", 0, "name"],
+        "unknown item",
+    ),
+    "item order": reverse(["ascension_resources", 3, "items"]),
+    "resource level": append_copy(["ascension_resources"]),
+}
+
+
+@pytest.mark.parametrize("mutation", MUTATIONS.values(), ids=MUTATIONS.keys())
+def test_mutations_change_fingerprints(
+    mutation: Callable[[Any], None],
+    data: Data,
+) -> None:
+    en_servant, jp_servant = matched_pair(data)
+    mutated = copy.deepcopy(en_servant)
+    mutation(mutated)
+    assert compare(mutated, jp_servant, data)
+    assert not fingerprints_match(mutated, jp_servant, data)
+
+
+def test_report_messages_have_no_prefix(data: Data) -> None:
+    matched, jp_servant = matched_pair(data)
+    servant_id = jp_servant["id"]
+    en_servant = copy.deepcopy(matched)
+    en_servant["rarity"] = 6
+    mismatches = english_compare.compare_servants(
+        {servant_id: en_servant},
+        data.en_items,
+        {servant_id: jp_servant},
+        data.jp_items,
+        logging.getLogger(__name__),
+    )
+    assert mismatches == [
+        english_compare.Mismatch(
+            id=servant_id,
+            name=jp_servant["name"],
+            messages=[
+                english_compare.Message(
+                    level="ERROR",
+                    message=f"rarity is different: en=6, jp={jp_servant['rarity']}",
+                )
+            ],
+        )
+    ]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import collections
+import csv
+import pathlib
+from typing import Any, Optional
+
+import pytest
+
+import export_materials
+import fgo
+
+
+@pytest.fixture(name="rows", scope="module")
+def fixture_rows(merged_data: dict[str, Any]) -> list[export_materials.MaterialRow]:
+    return export_materials.material_rows(merged_data["servants"])
+
+
+def test_rows_rebuild_resources(
+    merged_data: dict[str, Any],
+    rows: list[export_materials.MaterialRow],
+) -> None:
+    expected = {
+        (servant["id"], kind, level): resource
+        for servant in merged_data["servants"]
+        for kind, level, resource in fgo.servant_resources(servant)
+    }
+    actual: dict[tuple[int, str, int], Any] = collections.defaultdict(
+        lambda: {"qp": 0, "items": []}
+    )
+    for row in rows:
+        resource = actual[row.servant_id, row.kind, row.level]
+        if row.item_id is None:
+            # one QP row per resource, without pieces
+            assert resource["qp"] == 0 and row.piece == 0 and row.qp > 0
+            resource["qp"] = row.qp
+        else:
+            assert row.qp == 0
+            resource["items"].append({"id": row.item_id, "piece": row.piece})
+    # resources without QP and items have no rows
+    assert actual == {
+        key: value for key, value in expected.items() if value["qp"] or value["items"]
+    }
+
+
+def parse_row(row: dict[str, str]) -> export_materials.MaterialRow:
+    def optional_int(value: str) -> Optional[int]:
+        return int(value) if value else None
+
+    return export_materials.MaterialRow(
+        servant_id=int(row["servant_id"]),
+        kind=row["kind"],
+        level=int(row["level"]),
+        item_id=optional_int(row["item_id"]),
+        piece=int(row["piece"]),
+        qp=int(row["qp"]),
+    )
+
+
+@pytest.mark.parametrize("empty", [False, True], ids=["rows", "empty"])
+def test_csv(
+    empty: bool,
+    rows: list[export_materials.MaterialRow],
+    tmp_path: pathlib.Path,
+) -> None:
+    rows = [] if empty else rows
+    path = tmp_path.joinpath("materials.csv")
+    export_materials.save_csv(path, rows)
+    with path.open(encoding="utf-8", newline="") as file:
+        reader = csv.DictReader(file)
+        assert tuple(reader.fieldnames or []) == export_materials.MaterialRow._fields
+        assert [parse_row(row) for row in reader] == rows
+
+
+@pytest.mark.parametrize("empty", [False, True], ids=["rows", "empty"])
+def test_parquet(
+    empty: bool,
+    rows: list[export_materials.MaterialRow],
+    tmp_path: pathlib.Path,
+) -> None:
+    pa = pytest.importorskip("pyarrow")
+    parquet = pytest.importorskip("pyarrow.parquet")
+    rows = [] if empty else rows
+    path = tmp_path.joinpath("materials.parquet")
+    export_materials.save_parquet(path, rows)
+    table = parquet.read_table(path)
+    assert table.schema.names == list(export_materials.MaterialRow._fields)
+    assert pa.types.is_dictionary(table.schema.field("kind").type)
+    assert table.schema.field("qp").type == pa.int64()
+    assert [export_materials.MaterialRow(**row) for row in table.to_pylist()] == rows
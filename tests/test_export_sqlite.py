@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import logging
+import pathlib
+import sqlite3
+from typing import Any, Iterator
+
+import pytest
+
+import export_sqlite
+import fgo
+
+
+@pytest.fixture(name="database", scope="module")
+def fixture_database(
+    merged_data: dict[str, Any],
+    tmp_path_factory: pytest.TempPathFactory,
+) -> pathlib.Path:
+    path = tmp_path_factory.mktemp("sqlite").joinpath("merged_data.sqlite3")
+    export_sqlite.export(path, merged_data, logging.getLogger(__name__))
+    return path
+
+
+@contextlib.contextmanager
+def connect(path: pathlib.Path) -> Iterator[sqlite3.Connection]:
+    connection = sqlite3.connect(path)
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+def count(connection: sqlite3.Connection, table: str) -> int:
+    return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_row_counts(merged_data: dict[str, Any], database: pathlib.Path) -> None:
+    servants = merged_data["servants"]
+    with connect(database) as connection:
+        assert count(connection, "items") == len(merged_data["items"])
+        assert count(connection, "servants") == len(servants)
+        assert count(connection, "skills") == sum(
+            len(skills)
+            for servant in servants
+            for kind in ("skills", "append_skills")
+            for skills in servant[kind].values()
+        )
+        assert count(connection, "costumes") == sum(
+            len(servant["costumes"]) for servant in servants
+        )
+
+
+def test_resources(merged_data: dict[str, Any], database: pathlib.Path) -> None:
+    # resources rebuilt from the tables are the merged resources
+    expected = {
+        (servant["id"], kind, level): resource
+        for servant in merged_data["servants"]
+        for kind, level, resource in fgo.servant_resources(servant)
+    }
+    actual: dict[tuple[int, str, int], Any] = {}
+    with connect(database) as connection:
+        for servant_id, kind, level, qp in connection.execute(
+            "SELECT * FROM resources"
+        ):
+            actual[servant_id, kind, level] = {"qp": qp, "items": []}
+        for servant_id, kind, level, item_id, piece in connection.execute(
+            "SELECT * FROM resource_items ORDER BY rowid"
+        ):
+            actual[servant_id, kind, level]["items"].append(
+                {"id": item_id, "piece": piece}
+            )
+    assert actual == expected
+
+
+def test_foreign_keys(database: pathlib.Path) -> None:
+    with connect(database) as connection:
+        assert not connection.execute("PRAGMA foreign_key_check").fetchall()
+
+
+def search(connection: sqlite3.Connection, text: str) -> set[tuple[str, int]]:
+    return set(
+        connection.execute(
+            "SELECT target, target_id FROM names WHERE names MATCH ?",
+            (f'"{text}"',),
+        ).fetchall()
+    )
+
+
+def test_full_text_search(merged_data: dict[str, Any], database: pathlib.Path) -> None:
+    servant = next(x for x in merged_data["servants"] if x["costumes"])
+    costume = servant["costumes"][0]
+    skill = servant["skills"]["skill_1"][0]
+    item = merged_data["items"][0]
+    with connect(database) as connection:
+        # substrings of Japanese and English names
+        assert ("servant", servant["id"]) in search(
+            connection, servant["name"]["jp"][:3]
+        )
+        assert ("servant", servant["id"]) in search(
+            connection, servant["name"]["en"][-4:]
+        )
+        assert ("skill", servant["id"]) in search(connection, skill["name"]["en"])
+        assert ("costume", costume["id"]) in search(connection, costume["name"]["jp"])
+        assert ("item", item["id"]) in search(connection, item["name"]["en"])
+        # skill names are registered once per servant
+        rows = connection.execute(
+            "SELECT target_id, jp, en FROM names WHERE target = 'skill'"
+        ).fetchall()
+        assert max(collections.Counter(rows).values()) == 1
+
+
+def test_replace_database(
+    merged_data: dict[str, Any],
+    tmp_path: pathlib.Path,
+) -> None:
+    path = tmp_path.joinpath("merged_data.sqlite3")
+    path.write_text("not a database")
+    data = {**merged_data, "servants": merged_data["servants"][:1]}
+    export_sqlite.export(path, data, logging.getLogger(__name__))
+    with connect(path) as connection:
+        assert count(connection, "servants") == 1
+    assert [x.name for x in tmp_path.iterdir()] == ["merged_data.sqlite3"]
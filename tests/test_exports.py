@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import ast
+import collections
+import importlib
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+import fgo
+
+STUB_PATH = pathlib.Path(fgo.__file__).with_suffix(".pyi")
+
+
+def stub_imports() -> dict[str, list[str]]:
+    # {submodule: names} re-exported by __init__.pyi
+    imports: dict[str, list[str]] = collections.defaultdict(list)
+    for node in ast.parse(STUB_PATH.read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.ImportFrom) and node.level == 1:
+            for alias in node.names:
+                # "import X as X" is a re-export in a stub
+                assert alias.asname == alias.name
+                imports[node.module or ""].append(alias.name)
+    return imports
+
+
+def test_exports_match_stub() -> None:
+    # pylint: disable-next=protected-access
+    exports = fgo._EXPORTS
+    imports = stub_imports()
+    assert sorted(imports) == sorted(exports)
+    for module, names in exports.items():
+        assert sorted(imports[module]) == sorted(names), module
+
+
+@pytest.mark.parametrize(
+    "statements",
+    [
+        ["fgo.diff"],
+        ["fgo.diff_records", "fgo.diff"],
+        ["fgo.Changelog", "fgo.diff"],
+    ],
+    ids=["function", "after the submodule", "after a type"],
+)
+def test_lazy_diff(statements: list[str]) -> None:
+    # a fresh interpreter, since this process may have imported fgo.diff
+    code = "; ".join(
+        [
+            "import sys, fgo",
+            'assert "fgo.diff" not in sys.modules',
+            *statements,
+            'assert "fgo.diff" in sys.modules',
+            "assert fgo.diff is sys.modules['fgo.diff'].diff",
+        ]
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.parametrize("name", fgo.__all__)
+def test_exports_exist(name: str) -> None:
+    # pylint: disable-next=protected-access
+    module = importlib.import_module(f"fgo.{fgo._SUBMODULES[name]}")
+    assert hasattr(module, name)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import logging
+import pathlib
+from typing import Any, Optional
+
+import pytest
+
+import fgo
+import merge
+
+DATA_DIRECTORY = pathlib.Path(__file__).resolve().parents[1].joinpath("data")
+
+
+@pytest.fixture(name="json_output", scope="module")
+def fixture_json_output(
+    merged_data: dict[str, Any],
+    tmp_path_factory: pytest.TempPathFactory,
+) -> bytes:
+    path = tmp_path_factory.mktemp("json").joinpath("merged_data")
+    merge.save_merged_data(
+        path, list(merged_data.items()), "json", [], logging.getLogger(__name__)
+    )
+    return path.with_suffix(".json").read_bytes()
+
+
+def require_modules(encoding: str, compressions: list[str]) -> None:
+    missing: list[Optional[str]] = [
+        fgo.missing_encoding_module(encoding),
+        *(fgo.missing_compression_module(x) for x in compressions),
+    ]
+    for module in missing:
+        if module is not None:
+            pytest.skip(f"{module} is not installed")
+
+
+@pytest.mark.parametrize("encoding", fgo.encoding_names())
+def test_merged_data_round_trip(
+    encoding: str,
+    merged_data: dict[str, Any],
+    json_output: bytes,
+    tmp_path: pathlib.Path,
+) -> None:
+    compressions = fgo.compression_names()
+    require_modules(encoding, compressions)
+    path = tmp_path.joinpath("merged_data")
+    merge.save_merged_data(
+        path,
+        list(merged_data.items()),
+        encoding,
+        compressions,
+        logging.getLogger(__name__),
+    )
+    expected = json.loads(json_output)
+    for compression in [None, *compressions]:
+        encoded_path = fgo.encoded_path(
+            path,
+            encoding=encoding,
+            compression=compression,
+        )
+        data = fgo.load_encoded(
+            encoded_path,
+            encoding=encoding,
+            compression=compression,
+        )
+        assert data == expected, encoded_path.name
+
+
+def test_json_encoding_matches_save_json(tmp_path: pathlib.Path) -> None:
+    data = {"name": "アルトリア", "values": [1, 2.5, None, True], "nested": {}}
+    path = tmp_path.joinpath("data.json")
+    fgo.save_json(path, data)
+    assert fgo.encode(data) == path.read_bytes()
+
+
+def stream_bytes(path: pathlib.Path, data: list[tuple[str, Any]]) -> bytes:
+    fgo.save_json_stream(path, data)
+    return path.read_bytes()
+
+
+def json_bytes(path: pathlib.Path, data: Any) -> bytes:
+    fgo.save_json(path, data)
+    return path.read_bytes()
+
+
+def test_stream_servants_matches_save_json(tmp_path: pathlib.Path) -> None:
+    servants = [
+        fgo.load_json(path)
+        for _, path in fgo.servant_files(DATA_DIRECTORY.joinpath("servant"))
+    ]
+    assert stream_bytes(
+        tmp_path.joinpath("stream.json"),
+        [("servants", iter(servants))],
+    ) == json_bytes(tmp_path.joinpath("data.json"), {"servants": servants})
+
+
+def test_stream_merged_data_matches_save_json(
+    merged_data: dict[str, Any],
+    tmp_path: pathlib.Path,
+) -> None:
+    logger = logging.getLogger(__name__)
+    store = fgo.DataStore(DATA_DIRECTORY, logger=logger)
+    stream = merge.merge_stream(
+        store.items or [],
+        store.iterate_servants(),
+        store.sounds or [],
+        store.dictionary,
+        logger,
+    )
+    assert stream_bytes(tmp_path.joinpath("stream.json"), list(stream)) == json_bytes(
+        tmp_path.joinpath("data.json"),
+        merged_data,
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"empty": []},
+        {"values": [1, "二", None, {}, [], {"nested": [True, 2.5]}]},
+        {"scalar": 1, "object": {"key": []}, "text": "テキスト", "values": [0]},
+    ],
+    ids=["empty object", "empty array", "array", "mixed"],
+)
+def test_stream_matches_save_json(data: dict[str, Any], tmp_path: pathlib.Path) -> None:
+    # list values are streamed as iterators, others are written at once
+    stream = [
+        (key, iter(value) if isinstance(value, list) else value)
+        for key, value in data.items()
+    ]
+    assert stream_bytes(tmp_path.joinpath("stream.json"), stream) == json_bytes(
+        tmp_path.joinpath("data.json"),
+        data,
+    )
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import json
+import logging
+import pathlib
+import shutil
+from typing import Any
+
+import pytest
+
+import fgo
+import fgo.index
+
+DATA_DIRECTORY = pathlib.Path(__file__).resolve().parents[1].joinpath("data")
+SERVANT_IDS = [1, 2, 3]
+# セイバーピース
+SABER_PIECE = 3001
+
+
+class Loader:
+    # fgo.index.load_servant that records loaded servant IDs
+    # pylint: disable=too-few-public-methods
+    def __init__(self) -> None:
+        self.loaded: list[fgo.ServantID] = []
+        self._load = fgo.index.load_servant
+
+    def __call__(self, path: pathlib.Path, **kwargs: Any) -> Any:
+        servant = self._load(path, **kwargs)
+        if servant is not None:
+            self.loaded.append(servant["id"])
+        return servant
+
+
+@pytest.fixture(name="loader")
+def fixture_loader(monkeypatch: pytest.MonkeyPatch) -> Loader:
+    loader = Loader()
+    monkeypatch.setattr(fgo.index, "load_servant", loader)
+    return loader
+
+
+@pytest.fixture(name="directory")
+def fixture_directory(tmp_path: pathlib.Path) -> pathlib.Path:
+    shutil.copy(DATA_DIRECTORY.joinpath("items.json"), tmp_path)
+    shutil.copy(DATA_DIRECTORY.joinpath("sound.json"), tmp_path)
+    tmp_path.joinpath("servant").mkdir()
+    for servant_id in SERVANT_IDS:
+        shutil.copy(
+            DATA_DIRECTORY.joinpath("servant", f"{servant_id:03d}.json"),
+            tmp_path.joinpath("servant"),
+        )
+    return tmp_path
+
+
+def build(
+    directory: pathlib.Path,
+    *,
+    cache: bool = True,
+) -> fgo.ItemIndex:
+    index = fgo.build_item_index(
+        directory.joinpath("items.json"),
+        directory.joinpath("servant"),
+        directory.joinpath("sound.json"),
+        cache_path=directory.joinpath("cache.json") if cache else None,
+        logger=logging.getLogger(__name__),
+    )
+    assert index is not None
+    return index
+
+
+def all_usages(directory: pathlib.Path, index: fgo.ItemIndex) -> list[Any]:
+    items = fgo.load_items(directory.joinpath("items.json")) or []
+    return sorted(
+        (
+            usage["item_id"],
+            usage["kind"],
+            usage["servant_id"] or 0,
+            usage["source"] or "",
+            usage["level"],
+            usage["piece"],
+        )
+        for item in items
+        for usage in index.usages(item["id"])
+    )
+
+
+def update_servant(
+    directory: pathlib.Path,
+    servant_id: fgo.ServantID,
+    piece: int,
+) -> None:
+    path = directory.joinpath("servant", f"{servant_id:03d}.json")
+    servant = json.loads(path.read_text(encoding="utf-8"))
+    servant["ascension_resources"][0]["items"][0]["piece"] = piece
+    path.write_text(json.dumps(servant, ensure_ascii=False), encoding="utf-8")
+
+
+def test_usages(directory: pathlib.Path) -> None:
+    index = build(directory, cache=False)
+    # ascension 1 of servant 002 (アルトリア・ペンドラゴン)
+    assert fgo.ItemUsage(
+        item_id=SABER_PIECE,
+        kind="ascension",
+        servant_id=2,
+        source=None,
+        level=1,
+        piece=5,
+    ) in index.usages(SABER_PIECE)
+    # 001 uses no items, and sounds have no servant
+    assert {usage["servant_id"] for usage in index.usages(SABER_PIECE)} == {None, 2, 3}
+    assert index.total(SABER_PIECE) == sum(
+        usage["piece"] for usage in index.usages(SABER_PIECE)
+    )
+    assert any(usage[1] == "sound" for usage in all_usages(directory, index))
+
+
+def test_lookup(directory: pathlib.Path) -> None:
+    index = build(directory, cache=False)
+    item = index.item(SABER_PIECE)
+    assert item is not None
+    assert index.item_id(item["name"]) == SABER_PIECE
+    assert index.item_id(str(SABER_PIECE)) == SABER_PIECE
+    assert index.usages(item["name"]) == index.usages(SABER_PIECE)
+    assert index.item_id(0) is None
+    assert index.item_id("unknown") is None
+    assert not index.usages("unknown")
+    assert index.total("unknown") == 0
+
+
+def test_hit(directory: pathlib.Path, loader: Loader) -> None:
+    first = build(directory)
+    assert loader.loaded == SERVANT_IDS
+    cache = directory.joinpath("cache.json")
+    modified = cache.stat().st_mtime_ns
+    loader.loaded.clear()
+    second = build(directory)
+    assert not loader.loaded
+    # unchanged cache is not rewritten
+    assert cache.stat().st_mtime_ns == modified
+    assert all_usages(directory, second) == all_usages(directory, first)
+
+
+def test_changed_servant(directory: pathlib.Path, loader: Loader) -> None:
+    build(directory)
+    update_servant(directory, 2, 99)
+    loader.loaded.clear()
+    index = build(directory)
+    assert loader.loaded == [2]
+    assert all_usages(directory, index) == all_usages(
+        directory, build(directory, cache=False)
+    )
+    assert any(
+        usage["servant_id"] == 2 and usage["level"] == 1 and usage["piece"] == 99
+        for usage in index.usages(SABER_PIECE)
+    )
+
+
+def test_removed_servant(directory: pathlib.Path, loader: Loader) -> None:
+    build(directory)
+    directory.joinpath("servant", "002.json").unlink()
+    loader.loaded.clear()
+    index = build(directory)
+    assert not loader.loaded
+    assert all(usage[2] != 2 for usage in all_usages(directory, index))
+    cache = json.loads(directory.joinpath("cache.json").read_text(encoding="utf-8"))
+    assert sorted(cache["servants"]) == ["001", "003"]
+
+
+def test_changed_sounds(directory: pathlib.Path, loader: Loader) -> None:
+    build(directory)
+    path = directory.joinpath("sound.json")
+    sounds = json.loads(path.read_text(encoding="utf-8"))
+    path.write_text(json.dumps(sounds[:1], ensure_ascii=False), encoding="utf-8")
+    loader.loaded.clear()
+    index = build(directory)
+    assert not loader.loaded
+    assert all(usage[1] != "sound" for usage in all_usages(directory, index))
+    assert all_usages(directory, index) == all_usages(
+        directory, build(directory, cache=False)
+    )
+
+
+def test_changed_items(directory: pathlib.Path, loader: Loader) -> None:
+    build(directory)
+    path = directory.joinpath("items.json")
+    path.write_text(path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    loader.loaded.clear()
+    build(directory)
+    assert loader.loaded == SERVANT_IDS
+
+
+def test_version(
+    directory: pathlib.Path,
+    loader: Loader,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    build(directory)
+    monkeypatch.setattr(
+        fgo.index, "INDEX_CACHE_VERSION", fgo.index.INDEX_CACHE_VERSION + 1
+    )
+    loader.loaded.clear()
+    build(directory)
+    assert loader.loaded == SERVANT_IDS
+    loader.loaded.clear()
+    build(directory)
+    assert not loader.loaded
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import copy
+import logging
+import pathlib
+from typing import Any
+
+import pytest
+
+import fgo
+import merge
+
+DATA_DIRECTORY = pathlib.Path(__file__).resolve().parents[1].joinpath("data")
+SERVANT_IDS = [1, 2, 3]
+
+
+class Data:
+    # pylint: disable=too-few-public-methods
+    def __init__(self) -> None:
+        store = fgo.DataStore(DATA_DIRECTORY, logger=logging.getLogger(__name__))
+        self.items = store.items or []
+        self.dictionary = store.dictionary
+        self.servants = [
+            servant for servant in store.servants if servant["id"] in SERVANT_IDS
+        ]
+
+
+@pytest.fixture(name="data", scope="module")
+def fixture_data() -> Data:
+    return Data()
+
+
+class Converter:
+    # merge.convert_servant that records converted servant IDs
+    # pylint: disable=too-few-public-methods
+    def __init__(self) -> None:
+        self.converted: list[fgo.ServantID] = []
+        self._convert = merge.convert_servant
+
+    def __call__(self, servant: fgo.Servant, *args: Any) -> Any:
+        self.converted.append(servant["id"])
+        return self._convert(servant, *args)
+
+
+@pytest.fixture(name="converter")
+def fixture_converter(monkeypatch: pytest.MonkeyPatch) -> Converter:
+    converter = Converter()
+    monkeypatch.setattr(merge, "convert_servant", converter)
+    return converter
+
+
+def convert(
+    data: Data,
+    directory: pathlib.Path,
+    *,
+    servants: list[fgo.Servant] | None = None,
+    items: list[fgo.Item] | None = None,
+) -> list[Any]:
+    logger = logging.getLogger(__name__)
+    items = items if items is not None else data.items
+    return list(
+        merge.iterate_servants(
+            servants if servants is not None else data.servants,
+            merge.create_item_converter(items, logger),
+            data.dictionary,
+            logger,
+            cache=merge.ServantCache(directory, logger),
+            items_digest=fgo.json_digest(items),
+        )
+    )
+
+
+def test_hit(data: Data, converter: Converter, tmp_path: pathlib.Path) -> None:
+    first = convert(data, tmp_path)
+    assert converter.converted == SERVANT_IDS
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "001.json",
+        "002.json",
+        "003.json",
+    ]
+    converter.converted.clear()
+    assert convert(data, tmp_path) == first
+    assert not converter.converted
+
+
+def test_changed_servant(
+    data: Data,
+    converter: Converter,
+    tmp_path: pathlib.Path,
+) -> None:
+    convert(data, tmp_path)
+    converter.converted.clear()
+    servants = copy.deepcopy(data.servants)
+    servants[1]["name"] = "changed"
+    result = convert(data, tmp_path, servants=servants)
+    assert converter.converted == [2]
+    assert result[1]["name"]["jp"] == "changed"
+
+
+def test_version_bump(
+    data: Data,
+    converter: Converter,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: pathlib.Path,
+) -> None:
+    convert(data, tmp_path)
+    converter.converted.clear()
+    monkeypatch.setattr(merge, "CACHE_VERSION", merge.CACHE_VERSION + 1)
+    convert(data, tmp_path)
+    assert converter.converted == SERVANT_IDS
+
+
+def test_changed_items(
+    data: Data,
+    converter: Converter,
+    tmp_path: pathlib.Path,
+) -> None:
+    convert(data, tmp_path)
+    converter.converted.clear()
+    items = copy.deepcopy(data.items)
+    items[0]["rarity"] = "Gold"
+    convert(data, tmp_path, items=items)
+    assert converter.converted == SERVANT_IDS
+
+
+def test_removed_servant(
+    data: Data,
+    converter: Converter,
+    tmp_path: pathlib.Path,
+) -> None:
+    convert(data, tmp_path)
+    convert(data, tmp_path, servants=data.servants[:2])
+    assert converter.converted == SERVANT_IDS
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "001.json",
+        "002.json",
+    ]
+
+
+def test_cached_warnings(
+    data: Data,
+    tmp_path: pathlib.Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    # an unknown item is reported again on a cache hit
+    servants = copy.deepcopy(data.servants)
+    servants[1]["ascension_resources"][0]["items"][0]["name"] = "unknown item"
+    records = []
+    for _ in range(2):
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger=__name__):
+            convert(data, tmp_path, servants=servants)
+        records.append(
+            [
+                (
+                    record.levelno,
+                    record.getMessage(),
+                    getattr(record, "servant_id", None),
+                )
+                for record in caplog.records
+            ]
+        )
+    assert records[0]
+    assert records[1] == records[0]
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import pytest
+
+import fgo
+import merge
+
+
+def test_expand_normalized(merged_data: dict[str, Any]) -> None:
+    normalized = fgo.normalize_merged_data(merged_data)
+    assert normalized["version"] == fgo.MERGED_DATA_VERSION
+    assert len(normalized["resources"]) > 0
+    assert fgo.expand_merged_data(normalized) == merged_data
+
+
+def test_expand_normalized_stream(merged_data: dict[str, Any]) -> None:
+    stream: Iterator[tuple[str, Iterator[Any]]] = (
+        (key, iter(values)) for key, values in merged_data.items()
+    )
+    normalized = {
+        key: list(value) if isinstance(value, Iterator) else value
+        for key, value in merge.normalize_stream(stream)
+    }
+    assert normalized == fgo.normalize_merged_data(merged_data)
+    assert fgo.expand_merged_data(normalized) == merged_data
+
+
+def test_expand_v1(merged_data: dict[str, Any]) -> None:
+    assert fgo.expand_merged_data(merged_data) is merged_data
+
+
+def test_expand_unknown_version() -> None:
+    with pytest.raises(ValueError, match="unknown merged data version: 3"):
+        fgo.expand_merged_data({"version": 3})
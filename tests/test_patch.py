@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import copy
+import pathlib
+from typing import Any
+
+import pytest
+
+import fgo
+
+DATA: dict[str, Any] = {
+    "name": "before",
+    "skills": [{"name": "a", "rank": "A"}, {"name": "b", "rank": "B"}],
+}
+
+
+def patch(path: list[Any], before: Any, after: Any) -> fgo.Patch[Any]:
+    return fgo.Patch(path=path, before=before, after=after)
+
+
+def sequential(data: Any, patches: list[fgo.Patch[Any]]) -> Any:
+    # one by one with apply_patch, as patch files were applied originally
+    # patches are copied since apply_patch sets after without copying it
+    result = copy.deepcopy(data)
+    for value in copy.deepcopy(patches):
+        fgo.apply_patch(result, value)
+    return result
+
+
+@pytest.mark.parametrize(
+    ("patches", "statuses"),
+    [
+        # independent paths
+        (
+            [
+                patch(path=["name"], before="before", after="after"),
+                patch(path=["skills", 1, "rank"], before="B", after="B+"),
+            ],
+            ["applied", "applied"],
+        ),
+        # a replacement refined by a later patch
+        (
+            [
+                patch(
+                    path=["skills", 0],
+                    before={"name": "a", "rank": "A"},
+                    after={"name": "c", "rank": "C"},
+                ),
+                patch(path=["skills", 0, "rank"], before="C", after="C+"),
+            ],
+            ["applied", "applied"],
+        ),
+        # a patch before the replacement of its ancestor
+        (
+            [
+                patch(path=["skills", 0, "rank"], before="A", after="A+"),
+                patch(
+                    path=["skills", 0],
+                    before={"name": "a", "rank": "A+"},
+                    after={"name": "c", "rank": "C"},
+                ),
+            ],
+            ["applied", "applied"],
+        ),
+        # a refinement whose path is removed by the replacement
+        (
+            [
+                patch(path=["skills"], before=DATA["skills"], after=[]),
+                patch(path=["skills", 0, "rank"], before="A", after="A+"),
+            ],
+            ["applied", "not_found"],
+        ),
+        # a chain on the same path
+        (
+            [
+                patch(path=["name"], before="before", after="b"),
+                patch(path=["name"], before="b", after="c"),
+            ],
+            ["applied", "applied"],
+        ),
+        # a chain on a replaced value and its refinement
+        (
+            [
+                patch(path=["skills", 1, "rank"], before="B", after="B+"),
+                patch(
+                    path=["skills", 1],
+                    before={"name": "b", "rank": "B+"},
+                    after={"name": "d", "rank": "D"},
+                ),
+                patch(path=["skills", 1, "rank"], before="D", after="D+"),
+                patch(
+                    path=["skills", 1],
+                    before={"name": "d", "rank": "D+"},
+                    after={"name": "e", "rank": "E"},
+                ),
+            ],
+            ["applied", "applied", "applied", "applied"],
+        ),
+    ],
+    ids=[
+        "independent",
+        "refined",
+        "refined first",
+        "refined missing",
+        "chained",
+        "chained refinement",
+    ],
+)
+def test_same_result_as_sequential_patches(
+    patches: list[fgo.Patch[Any]],
+    statuses: list[fgo.PatchStatus],
+) -> None:
+    data = copy.deepcopy(DATA)
+    results = fgo.apply_patches(data, patches)
+    assert data == sequential(DATA, patches)
+    assert [result["status"] for result in results] == statuses
+
+
+def test_conflict() -> None:
+    data = copy.deepcopy(DATA)
+    results = fgo.apply_patches(
+        data,
+        [
+            patch(path=["name"], before="before", after="x"),
+            patch(path=["name"], before="before", after="y"),
+        ],
+    )
+    assert sorted(result["status"] for result in results) == ["applied", "conflict"]
+    assert data["name"] == "x"
+
+
+@pytest.mark.parametrize(
+    ("directory", "expected"),
+    [
+        ("data/servant", "data/cache/unpatched/servant"),
+        ("data/english/servant", "data/cache/unpatched/english/servant"),
+    ],
+)
+def test_unpatched_directory(directory: str, expected: str) -> None:
+    assert fgo.unpatched_directory(pathlib.Path(directory)) == pathlib.Path(expected)
+
+
+CHAIN = [
+    patch(path=["name"], before="before", after="b"),
+    patch(path=["name"], before="b", after="c"),
+]
+REFINEMENT = [
+    patch(
+        path=["skills", 0],
+        before={"name": "a", "rank": "A"},
+        after={"name": "c", "rank": "C"},
+    ),
+    patch(path=["skills", 0, "rank"], before="C", after="C+"),
+]
+
+
+@pytest.mark.parametrize(
+    ("data", "patches", "states"),
+    [
+        (DATA, CHAIN, ["applied", "applied"]),
+        ({**DATA, "name": "b"}, CHAIN, ["already_fixed", "applied"]),
+        ({**DATA, "name": "c"}, CHAIN, ["stale", "already_fixed"]),
+        (DATA, REFINEMENT, ["applied", "applied"]),
+        (
+            {**DATA, "skills": [{"name": "c", "rank": "C"}]},
+            REFINEMENT,
+            ["already_fixed", "applied"],
+        ),
+        (
+            {**DATA, "skills": [{"name": "c", "rank": "C+"}]},
+            REFINEMENT,
+            ["stale", "already_fixed"],
+        ),
+        (
+            DATA,
+            [patch(path=["skills", 2, "rank"], before="C", after="C+")],
+            ["stale"],
+        ),
+    ],
+    ids=[
+        "chained",
+        "chained half fixed",
+        "chained fixed",
+        "refined",
+        "refined half fixed",
+        "refined fixed",
+        "missing",
+    ],
+)
+def test_analyze_in_order(
+    data: Any,
+    patches: list[fgo.Patch[Any]],
+    states: list[fgo.PatchState],
+) -> None:
+    unpatched = copy.deepcopy(data)
+    analysis = fgo.analyze_patches(data, patches)
+    assert [result["state"] for result in analysis] == states
+    # the unpatched data is not changed
+    assert data == unpatched
+    # pruned patches give the same result as all patches
+    pruned = fgo.prune_patch_set({1: patches}, {1: analysis}).get(1, [])
+    assert sequential(data, pruned) == sequential(data, patches)
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import collections
+import copy
+import logging
+import pathlib
+import random
+from typing import Any
+
+import pytest
+
+import fgo
+
+pytest.importorskip("numpy")
+
+# pylint: disable-next=wrong-import-position
+from fgo.planner import Levels, MaterialPlanner, RosterEntry
+
+DATA_DIRECTORY = pathlib.Path(__file__).resolve().parents[1].joinpath("data")
+
+MIN_LEVELS = Levels(ascension=0, skills=[1, 1, 1], append_skills=[0, 0, 0, 0, 0])
+MAX_LEVELS = Levels(
+    ascension=4,
+    skills=[10, 10, 10],
+    append_skills=[10, 10, 10, 10, 10],
+)
+
+type Total = tuple[int, dict[int, int]]
+
+
+@pytest.fixture(name="store", scope="module")
+def fixture_store() -> fgo.DataStore:
+    return fgo.DataStore(DATA_DIRECTORY, logger=logging.getLogger(__name__))
+
+
+@pytest.fixture(name="planner", scope="module")
+def fixture_planner(store: fgo.DataStore) -> MaterialPlanner:
+    return MaterialPlanner(store.servants, store.items or [])
+
+
+@pytest.fixture(name="servants", scope="module")
+def fixture_servants(store: fgo.DataStore) -> dict[int, fgo.Servant]:
+    return {servant["id"]: servant for servant in store.servants}
+
+
+@pytest.fixture(name="item_ids", scope="module")
+def fixture_item_ids(store: fgo.DataStore) -> dict[str, int]:
+    return {item["name"]: item["id"] for item in store.items or []}
+
+
+def direct_total(
+    servant: fgo.Servant,
+    current: Levels,
+    target: Levels,
+    item_ids: dict[str, int],
+) -> Total:
+    # sum of every level step, without the cumulative tensor:
+    #   ascension_resources[i] is ascension i -> i + 1,
+    #   (append_)skill_resources[i] is level i + 1 -> i + 2,
+    #   unlocking an append skill (0 -> 1) costs nothing here
+    steps: list[fgo.Resource] = []
+    steps.extend(
+        servant["ascension_resources"][current["ascension"] : target["ascension"]]
+    )
+    for resources, begin_levels, end_levels in [
+        (servant["skill_resources"], current["skills"], target["skills"]),
+        (
+            servant["append_skill_resources"],
+            current["append_skills"],
+            target["append_skills"],
+        ),
+    ]:
+        for begin, end in zip(begin_levels, end_levels):
+            steps.extend(resources[max(begin, 1) - 1 : max(end, 1) - 1])
+    qp = 0
+    items: dict[int, int] = collections.defaultdict(int)
+    for step in steps:
+        qp += step["qp"]
+        for value in step["items"]:
+            items[item_ids[value["name"]]] += value["piece"]
+    return qp, {item_id: piece for item_id, piece in items.items() if piece}
+
+
+def plan_total(planner: MaterialPlanner, roster: list[RosterEntry]) -> Total:
+    requirement = planner.plan(roster)
+    return requirement["qp"], {
+        items["id"]: items["piece"] for items in requirement["items"]
+    }
+
+
+def add_totals(totals: list[Total]) -> Total:
+    items: dict[int, int] = collections.defaultdict(int)
+    for _, values in totals:
+        for item_id, piece in values.items():
+            items[item_id] += piece
+    return sum(qp for qp, _ in totals), dict(items)
+
+
+def random_levels(generator: random.Random) -> tuple[Levels, Levels]:
+    # (current, target) with current <= target
+    def pair(low: int, high: int) -> tuple[int, int]:
+        begin, end = sorted(generator.randint(low, high) for _ in range(2))
+        return begin, end
+
+    ascension = pair(0, 4)
+    skills = [pair(1, 10) for _ in range(3)]
+    append_skills = [pair(0, 10) for _ in range(5)]
+    return (
+        Levels(
+            ascension=ascension[0],
+            skills=[begin for begin, _ in skills],
+            append_skills=[begin for begin, _ in append_skills],
+        ),
+        Levels(
+            ascension=ascension[1],
+            skills=[end for _, end in skills],
+            append_skills=[end for _, end in append_skills],
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    ("current", "target"),
+    [
+        (MIN_LEVELS, MIN_LEVELS),
+        (MAX_LEVELS, MAX_LEVELS),
+        (MIN_LEVELS, MAX_LEVELS),
+        # ascension only
+        (MIN_LEVELS, Levels(ascension=4, skills=[1, 1, 1], append_skills=[0] * 5)),
+        # skills from level 1 to max
+        (MIN_LEVELS, Levels(ascension=0, skills=[10, 10, 10], append_skills=[0] * 5)),
+        # unlocking an append skill is free
+        (MIN_LEVELS, Levels(ascension=0, skills=[1, 1, 1], append_skills=[1] * 5)),
+        # append skills from locked to max
+        (MIN_LEVELS, Levels(ascension=0, skills=[1, 1, 1], append_skills=[10] * 5)),
+        # the last step of each kind
+        (
+            Levels(ascension=3, skills=[9, 9, 9], append_skills=[9] * 5),
+            MAX_LEVELS,
+        ),
+        # a target below the current level requires nothing
+        (MAX_LEVELS, MIN_LEVELS),
+    ],
+    ids=[
+        "min to min",
+        "max to max",
+        "min to max",
+        "ascension",
+        "skills",
+        "append unlock",
+        "append skills",
+        "last steps",
+        "downgrade",
+    ],
+)
+def test_plan_ranges(
+    current: Levels,
+    target: Levels,
+    planner: MaterialPlanner,
+    servants: dict[int, fgo.Servant],
+    item_ids: dict[str, int],
+) -> None:
+    for servant_id, servant in servants.items():
+        roster = [RosterEntry(servant_id=servant_id, current=current, target=target)]
+        expected = direct_total(
+            servant,
+            current,
+            # levels are clipped to the current levels
+            Levels(
+                ascension=max(current["ascension"], target["ascension"]),
+                skills=list(map(max, current["skills"], target["skills"])),
+                append_skills=list(
+                    map(max, current["append_skills"], target["append_skills"])
+                ),
+            ),
+            item_ids,
+        )
+        assert plan_total(planner, roster) == expected, servant_id
+
+
+def test_plan_random_rosters(
+    planner: MaterialPlanner,
+    servants: dict[int, fgo.Servant],
+    item_ids: dict[str, int],
+) -> None:
+    generator = random.Random(0)
+    for _ in range(50):
+        roster: list[RosterEntry] = []
+        for servant_id in generator.sample(sorted(servants), 8):
+            current, target = random_levels(generator)
+            roster.append(
+                RosterEntry(servant_id=servant_id, current=current, target=target)
+            )
+        expected = add_totals(
+            [
+                direct_total(
+                    servants[entry["servant_id"]],
+                    entry["current"],
+                    entry["target"],
+                    item_ids,
+                )
+                for entry in roster
+            ]
+        )
+        assert plan_total(planner, roster) == expected
+
+
+def test_aggregate(
+    planner: MaterialPlanner,
+    servants: dict[int, fgo.Servant],
+    item_ids: dict[str, int],
+) -> None:
+    aggregates = planner.aggregate()
+    totals: list[Total] = []
+    for servant_id, servant in servants.items():
+        value = aggregates["servants"][str(servant_id)]
+        total = direct_total(servant, MIN_LEVELS, MAX_LEVELS, item_ids)
+        totals.append(total)
+        assert value["total"]["qp"] == total[0]
+        assert {x["id"]: x["piece"] for x in value["total"]["items"]} == total[1]
+        kinds = add_totals(
+            [
+                (value[kind]["qp"], {x["id"]: x["piece"] for x in value[kind]["items"]})
+                for kind in ("ascension", "skills", "append_skills")
+            ]
+        )
+        assert kinds == total, servant_id
+    qp, items = add_totals(totals)
+    assert aggregates["qp"] == qp
+    assert aggregates["items"] == {str(key): value for key, value in items.items()}
+
+
+def test_costumes_are_not_levels(
+    store: fgo.DataStore,
+    servants: dict[int, fgo.Servant],
+) -> None:
+    # costume resources are not part of the planned levels
+    servant = next(servant for servant in servants.values() if servant["costumes"])
+    without_costumes: Any = copy.deepcopy(servant)
+    without_costumes["costumes"] = []
+    items = store.items or []
+    assert (
+        MaterialPlanner([servant], items).aggregate()
+        == MaterialPlanner([without_costumes], items).aggregate()
+    )
+
+
+def test_levels_out_of_range(planner: MaterialPlanner) -> None:
+    roster = [
+        RosterEntry(
+            servant_id=int(planner.servant_ids[0]),
+            current=Levels(ascension=0, skills=[0, 1, 1], append_skills=[0] * 5),
+            target=MAX_LEVELS,
+        )
+    ]
+    with pytest.raises(ValueError, match="out of range"):
+        planner.plan(roster)
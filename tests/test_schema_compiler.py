@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import copy
+import pathlib
+from typing import Any, Iterator
+
+import pytest
+
+import fgo
+
+SERVANT_DIRECTORY = pathlib.Path(__file__).resolve().parents[1].joinpath("data/servant")
+# servants whose every node is mutated:
+#   costumes and skills with several ranks, a false name, ascension names
+MUTATION_SERVANT_IDS = [1, 156, 244]
+# replacements for type, enum, minimum and maximum errors
+INVALID_VALUES: list[Any] = [None, "__invalid__", -1, 1.5, True, {}]
+
+type Path = tuple[str | int, ...]
+
+
+def servant_paths() -> list[pathlib.Path]:
+    return [path for _, path in fgo.servant_files(SERVANT_DIRECTORY)]
+
+
+def expected_errors(instance: Any) -> list[tuple[str, str]]:
+    return [
+        (error.json_path, error.message)
+        for error in fgo.servant_validator().iter_errors(instance)
+    ]
+
+
+def compiled_errors(instance: Any) -> list[tuple[str, str]]:
+    return [
+        (error.json_path, error.message)
+        for error in fgo.compiled_servant_validator()(instance)
+    ]
+
+
+def nodes(value: Any, path: Path = ()) -> Iterator[tuple[Path, Any]]:
+    # all values with their paths, the root first
+    yield path, value
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from nodes(child, (*path, key))
+    elif isinstance(value, list):
+        for index, child in enumerate(value):
+            yield from nodes(child, (*path, index))
+
+
+def mutations(servant: dict[str, Any]) -> Iterator[tuple[str, Any]]:
+    # (description, mutated copy of the servant)
+    for path, value in nodes(servant):
+        if path:
+            for invalid in INVALID_VALUES:
+                yield f"{path} = {invalid!r}", replaced(servant, path, invalid)
+            # required, minItems
+            yield f"del {path}", removed(servant, path)
+        if isinstance(value, dict):
+            # additionalProperties
+            yield f"{path} + extra key", replaced(
+                servant,
+                path,
+                {**value, "__extra__": 0},
+            )
+        if isinstance(value, list) and value:
+            # maxItems
+            yield f"{path} + item", replaced(servant, path, [*value, value[0]])
+
+
+def lookup(value: Any, path: Path) -> Any:
+    for key in path:
+        value = value[key]
+    return value
+
+
+def replaced(servant: dict[str, Any], path: Path, value: Any) -> Any:
+    if not path:
+        return copy.deepcopy(value)
+    result = copy.deepcopy(servant)
+    lookup(result, path[:-1])[path[-1]] = copy.deepcopy(value)
+    return result
+
+
+def removed(servant: dict[str, Any], path: Path) -> Any:
+    result = copy.deepcopy(servant)
+    del lookup(result, path[:-1])[path[-1]]
+    return result
+
+
+@pytest.mark.parametrize("path", servant_paths(), ids=lambda path: path.stem)
+def test_servant_files(path: pathlib.Path) -> None:
+    servant = fgo.load_json(path)
+    assert compiled_errors(servant) == expected_errors(servant)
+
+
+@pytest.mark.parametrize("servant_id", MUTATION_SERVANT_IDS)
+def test_mutations(servant_id: int) -> None:
+    servant = fgo.load_json(SERVANT_DIRECTORY.joinpath(f"{servant_id:03d}.json"))
+    assert servant is not None
+    invalid_count = 0
+    for description, instance in mutations(servant):
+        expected = expected_errors(instance)
+        assert compiled_errors(instance) == expected, description
+        invalid_count += bool(expected)
+    assert invalid_count > 0
+
+
+@pytest.mark.parametrize(
+    "instance",
+    [None, [], "servant", 1, {}],
+    ids=["null", "array", "string", "integer", "empty object"],
+)
+def test_root(instance: Any) -> None:
+    assert compiled_errors(instance) == expected_errors(instance)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import pathlib
+from typing import Any
+
+import fgo
+import merge
+
+
+def save_sharded(directory: pathlib.Path, merged_data: dict[str, Any]) -> Any:
+    merge.save_sharded(
+        directory,
+        [(key, iter(values)) for key, values in merged_data.items()],
+        logging.getLogger(__name__),
+    )
+    return fgo.load_json(directory.joinpath("index.json"))
+
+
+def load_shard(directory: pathlib.Path, shard: merge.Shard) -> Any:
+    path = directory.joinpath(shard["path"])
+    data = path.read_bytes()
+    assert shard["size"] == len(data), shard["path"]
+    assert shard["sha256"] == hashlib.sha256(data).hexdigest(), shard["path"]
+    return json.loads(data)
+
+
+def test_shards_rebuild_merged_data(
+    merged_data: dict[str, Any],
+    tmp_path: pathlib.Path,
+) -> None:
+    index = save_sharded(tmp_path, merged_data)
+    assert [shard["id"] for shard in index["servants"]] == [
+        servant["id"] for servant in merged_data["servants"]
+    ]
+    assert {
+        "items": load_shard(tmp_path, index["items"]),
+        "servants": [load_shard(tmp_path, shard) for shard in index["servants"]],
+        "sounds": load_shard(tmp_path, index["sounds"]),
+    } == merged_data
+    # every file is listed in the index
+    paths = {
+        path.relative_to(tmp_path).as_posix()
+        for path in tmp_path.rglob("*.json")
+        if path.name != "index.json"
+    }
+    assert paths == {
+        index["items"]["path"],
+        index["sounds"]["path"],
+        *(shard["path"] for shard in index["servants"]),
+    }
+
+
+def test_removed_servant_shard(
+    merged_data: dict[str, Any],
+    tmp_path: pathlib.Path,
+) -> None:
+    save_sharded(tmp_path, merged_data)
+    removed = merged_data["servants"][-1]["id"]
+    index = save_sharded(
+        tmp_path,
+        {**merged_data, "servants": merged_data["servants"][:-1]},
+    )
+    assert removed not in [shard["id"] for shard in index["servants"]]
+    assert not tmp_path.joinpath(f"servants/{removed:03d}.json").exists()
+
+
+def test_changed_servant_shard(
+    merged_data: dict[str, Any],
+    tmp_path: pathlib.Path,
+) -> None:
+    before = save_sharded(tmp_path, merged_data)
+    servants = json.loads(json.dumps(merged_data["servants"]))
+    servants[0]["rarity"] = servants[0]["rarity"] + 1
+    after = save_sharded(tmp_path, {**merged_data, "servants": servants})
+    changed = [
+        shard["id"]
+        for shard, other in zip(before["servants"], after["servants"])
+        if shard["sha256"] != other["sha256"]
+    ]
+    assert changed == [servants[0]["id"]]
+    assert after["items"] == before["items"]
+    assert after["sounds"] == before["sounds"]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import copy
+import logging
+import pathlib
+import shutil
+from typing import Any, Callable
+
+import pytest
+
+import fgo
+
+DATA_DIRECTORY = pathlib.Path(__file__).resolve().parents[1].joinpath("data")
+SERVANT_DIRECTORY = DATA_DIRECTORY.joinpath("servant")
+
+
+class Dataset:
+    # pylint: disable=too-few-public-methods
+    def __init__(self) -> None:
+        store = fgo.DataStore(DATA_DIRECTORY, logger=logging.getLogger(__name__))
+        self.servants = store.servants
+        self.items = store.items or []
+        self.links = store.servant_links or []
+        self.dictionary = store.servant_dictionary or {}
+        self.sounds = store.sounds or []
+
+    def validate(self) -> bool:
+        return fgo.validate_dataset(
+            self.servants,
+            self.items,
+            self.links,
+            self.dictionary,
+            sounds=self.sounds,
+            logger=logging.getLogger(__name__),
+        )
+
+
+def servant_records(
+    caplog: pytest.LogCaptureFixture,
+) -> list[tuple[int, str, object, object]]:
+    return [
+        (
+            record.levelno,
+            record.getMessage(),
+            getattr(record, "servant_id", None),
+            getattr(record, "servant_name", None),
+        )
+        for record in caplog.records
+        if record.levelno >= logging.WARNING
+    ]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_cached_messages_keep_servant_fields(
+    processes: int,
+    tmp_path: pathlib.Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    directory = tmp_path.joinpath("servant")
+    directory.mkdir()
+    for servant_id in (1, 2):
+        name = f"{servant_id:03d}.json"
+        shutil.copy(SERVANT_DIRECTORY.joinpath(name), directory.joinpath(name))
+    # a servant with a JSONSchema error
+    servant = fgo.load_json(directory.joinpath("002.json"))
+    assert servant is not None
+    servant["rarity"] = -1
+    fgo.save_json(directory.joinpath("002.json"), servant)
+    logger = logging.getLogger(__name__)
+    cache_path = tmp_path.joinpath("cache.json")
+    results: list[bool] = []
+    records = []
+    for _ in range(2):
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger=__name__):
+            results.append(
+                fgo.validate_servant_files(
+                    directory,
+                    logger=logger,
+                    cache_path=cache_path,
+                    processes=processes,
+                )
+            )
+        records.append(servant_records(caplog))
+    assert results == [False, False]
+    assert records[0]
+    assert all(record[2] == 2 for record in records[0])
+    # the second run is replayed from the cache
+    assert records[1] == records[0]
+
+
+@pytest.fixture(name="dataset", scope="module")
+def fixture_dataset() -> Dataset:
+    return Dataset()
+
+
+def test_dataset(dataset: Dataset, caplog: pytest.LogCaptureFixture) -> None:
+    with caplog.at_level(logging.WARNING, logger=__name__):
+        assert dataset.validate()
+    assert not caplog.records
+
+
+def duplicate_costume(dataset: Dataset) -> None:
+    dataset.servants[2]["costumes"].append(
+        copy.deepcopy(dataset.servants[1]["costumes"][0])
+    )
+
+
+def unknown_servant_item(dataset: Dataset) -> None:
+    dataset.servants[1]["skill_resources"][0]["items"][0]["name"] = "unknown"
+
+
+def unknown_sound_item(dataset: Dataset) -> None:
+    sound = next(sound for sound in dataset.sounds if sound["resource"]["items"])
+    sound["resource"]["items"][0]["name"] = "unknown"
+
+
+def servant_without_file(dataset: Dataset) -> None:
+    del dataset.servants[1]
+
+
+def servant_without_dictionary(dataset: Dataset) -> None:
+    del dataset.dictionary[2]
+
+
+def servant_without_link(dataset: Dataset) -> None:
+    del dataset.links[1]
+
+
+@pytest.mark.parametrize(
+    "mutate, message",
+    [
+        (duplicate_costume, "costume 41 is also used by servant 002"),
+        (unknown_servant_item, 'unknown item "unknown" in skill 1'),
+        (unknown_sound_item, 'unknown item "unknown" in sound'),
+        (servant_without_file, "servant 002 has no data file"),
+        (servant_without_dictionary, "servant 002 has no dictionary entry"),
+        (servant_without_link, "servant 002 is not in links"),
+    ],
+)
+def test_dataset_error(
+    dataset: Dataset,
+    mutate: Callable[[Dataset], Any],
+    message: str,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    broken = copy.deepcopy(dataset)
+    mutate(broken)
+    with caplog.at_level(logging.WARNING, logger=__name__):
+        assert not broken.validate()
+    assert [record.levelno for record in caplog.records] == [logging.ERROR]
+    assert message in caplog.records[0].getMessage()
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import argparse
+import dataclasses
 import logging
 import pathlib
 import sys
@@ -18,13 +20,86 @@ def main() -> None:
         fmt="%(asctime)s %(name)s:%(levelname)s:%(message)s"
     )
     logger.addHandler(handler)
+    # option
+    option = Option(**vars(argument_parser().parse_args()))
+    # validate
+    if not run(option, fgo.DataStore(logger=logger), logger):
+        sys.exit(1)
+
+
+def run(
+    option: Option,
+    store: fgo.DataStore,
+    logger: logging.Logger,
+) -> bool:
     # validate servants
-    servants = fgo.load_servants(
-        pathlib.Path("./data/servant"),
+    result = fgo.validate_servant_files(
+        store.servant_directory,
         logger=logger,
+        cache_path=(
+            pathlib.Path("./data/cache/validate.json") if not option.no_cache else None
+        ),
+        processes=option.processes,
+        loader=store.servant,
     )
-    if not fgo.validate_servants(servants, logger=logger):
-        sys.exit(1)
+    # validate dataset
+    if option.dataset and not validate_dataset(store, logger):
+        result = False
+    return result
+
+
+def validate_dataset(
+    store: fgo.DataStore,
+    logger: logging.Logger,
+) -> bool:
+    items = store.items
+    links = store.servant_links
+    dictionary = store.servant_dictionary
+    if items is None or links is None or dictionary is None:
+        return False
+    return fgo.validate_dataset(
+        store.servants,
+        items,
+        links,
+        dictionary,
+        sounds=store.sounds,
+        logger=logger,
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class Option:
+    dataset: bool
+    no_cache: bool
+    processes: int
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Validate servant data",
+    )
+    parser.add_argument(
+        "--dataset",
+        dest="dataset",
+        action="store_true",
+        help="also check invariants across servants, items and links",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="validate all servants without reading or writing the cache",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="processes",
+        type=int,
+        default=1,
+        help="number of worker processes (default: %(default)s)",
+        metavar="N",
+    )
+    return parser
 
 
 if __name__ == "__main__":